@@ -0,0 +1,114 @@
+"""არასავალდებულო NumPy ანალიტიკა: კატალოგი და მოსმენების ჟურნალი struct-of-arrays სახით.
+
+შედეგები ემთხვევა სუფთა Python-ის გზას (get_most_played_songs, _artist_counts,
+_user_listening_time, ანგარიშის ჟანრული სტატისტიკა), მაგრამ ითვლება bincount-ით,
+partition-ით და ვექტორული შემცირებებით.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from songs import Song, RockSong, ClassicalSong
+
+
+class NumpyAnalytics:
+    """სისტემის ერთჯერადი ასლი მასივებში, შემდეგ მოსმენები მასზე არ აისახება"""
+
+    def __init__(self, system):
+        if np is None:
+            raise ImportError("NumPy ანალიტიკისთვის საჭიროა numpy პაკეტი")
+        songs = system._song_by_index
+        count = len(songs)
+        self._songs = songs
+        self._users = system._user_by_index
+
+        """ჟურნალის სვეტების ასლი: array-ის buffer-ის დაკავება მის ზრდას დაბლოკავდა"""
+        log = system.events
+        self.song_index = np.frombuffer(log.song_index, dtype=np.uint32).astype(np.intp)
+        self.user_index = np.frombuffer(log.user_index, dtype=np.uint32).astype(np.intp)
+
+        self.durations = np.frombuffer(system._durations, dtype=np.int64).copy()
+        self.rank = np.frombuffer(system._song_rank, dtype=np.int64).copy()
+        self.in_catalog = np.fromiter((s is not None for s in songs), dtype=bool, count=count)
+        self.play_count = np.fromiter((s.play_count if s is not None else 0 for s in songs),
+                                      dtype=np.int64, count=count)
+        self.rating_count = np.fromiter((s.rating_count if s is not None else 0 for s in songs),
+                                        dtype=np.int64, count=count)
+        self.total_rating = np.fromiter((s.total_rating if s is not None else 0.0 for s in songs),
+                                        dtype=np.float64, count=count)
+
+        self.artists = []
+        artist_codes = {}
+        self.artist_idx = np.full(count, -1, dtype=np.intp)
+        self.genre_masks = {name: np.zeros(count, dtype=bool) for name in Song._genres}
+        self.intensity = np.zeros(count, dtype=np.int64)
+        self.eras = []
+        era_codes = {}
+        self.era_idx = np.full(count, -1, dtype=np.intp)
+        for idx, song in enumerate(songs):
+            if song is None:
+                continue
+            code = artist_codes.get(song.artist)
+            if code is None:
+                code = artist_codes[song.artist] = len(self.artists)
+                self.artists.append(song.artist)
+            self.artist_idx[idx] = code
+            for genre in type(song).genre_classes():
+                self.genre_masks[genre.__name__][idx] = True
+            if isinstance(song, RockSong):
+                self.intensity[idx] = song.intensity_level
+            if isinstance(song, ClassicalSong):
+                era = era_codes.get(song.era)
+                if era is None:
+                    era = era_codes[song.era] = len(self.eras)
+                    self.eras.append(song.era)
+                self.era_idx[idx] = era
+
+    def per_artist_plays(self) -> dict:
+        """{არტისტი: მოსმენები} ჟურნალიდან, კატალოგის გარეთ მყოფი სიმღერების გარეშე"""
+        artist_of_event = self.artist_idx[self.song_index]
+        known = artist_of_event[artist_of_event >= 0]
+        counts = np.bincount(known, minlength=len(self.artists))
+        return {self.artists[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    def per_user_seconds(self) -> dict:
+        """{user_id: მოსმენილი წამები}"""
+        seconds = np.bincount(self.user_index, weights=self.durations[self.song_index],
+                              minlength=len(self._users)).astype(np.int64)
+        return {user.user_id: int(seconds[idx]) for idx, user in enumerate(self._users)
+                if user is not None}
+
+    def top_songs(self, limit: int = 10) -> list:
+        """get_most_played_songs-ის ტოლი: play_count კლებით, თანაბრობისას დამატების რიგით"""
+        candidates = np.flatnonzero(self.in_catalog)
+        if limit <= 0 or len(candidates) == 0:
+            return []
+        plays = self.play_count[candidates]
+        if limit < len(candidates):
+            threshold = np.partition(plays, len(plays) - limit)[len(plays) - limit]
+            candidates = candidates[plays >= threshold]
+        order = np.lexsort((self.rank[candidates], -self.play_count[candidates]))
+        return [self._songs[idx] for idx in candidates[order[:limit]]]
+
+    def genre_totals(self) -> dict:
+        """{ჟანრი: {"songs", "plays", "avg_rating"}}, საშუალო როგორც ანგარიშში"""
+        averages = np.divide(self.total_rating, self.rating_count,
+                             out=np.zeros_like(self.total_rating), where=self.rating_count > 0)
+        totals = {}
+        for name, mask in self.genre_masks.items():
+            songs = int(mask.sum())
+            totals[name] = {
+                "songs": songs,
+                "plays": int(self.play_count[mask].sum()),
+                "avg_rating": float(averages[mask].sum() / songs) if songs else 0,
+            }
+        return totals
+
+    def avg_intensity(self) -> float:
+        mask = self.genre_masks["RockSong"]
+        return float(self.intensity[mask].mean()) if mask.any() else 0
+
+    def era_histogram(self) -> dict:
+        counts = np.bincount(self.era_idx[self.era_idx >= 0], minlength=len(self.eras))
+        return {self.eras[code]: int(counts[code]) for code in range(len(self.eras))}
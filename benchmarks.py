@@ -0,0 +1,1437 @@
+"""წარმადობის ბენჩმარკები: python benchmarks.py [სახელი ...]"""
+import argparse
+import contextlib
+import inspect
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from songs import Song, PopSong, RockSong, ClassicalSong
+from user import User
+from streaming_system import StreamingSystem
+from report import collect_report_stats
+from ingest import MALFORMED, read_csv_events, read_jsonl_events
+from event_log import EventLog
+
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def _timed(func, *args, repeat: int = 1):
+    """საუკეთესო დრო წამებში და ბოლო შედეგი"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def _full_sort_most_played(system: StreamingSystem, limit: int) -> list:
+    songs = list(system.songs.values())
+    songs.sort(key=lambda song: song.play_count, reverse=True)
+    return songs[:limit]
+
+
+def _full_sort_top_rated(system: StreamingSystem, limit: int) -> list:
+    songs = [song for song in system.songs.values() if song.rating_count > 0]
+    songs.sort(key=system._top_rated.score, reverse=True)
+    return songs[:limit]
+
+
+@benchmark("leaderboards")
+def bench_leaderboards(sizes=(100_000, 1_000_000)) -> None:
+    rng = random.Random(42)
+    for size in sizes:
+        system = StreamingSystem("bench")
+        songs = [Song(f"Song {i}", f"Artist {i % 1000}", 180) for i in range(size)]
+        for song in songs:
+            system.add_song(song)
+
+        events = size
+        start = time.perf_counter()
+        for _ in range(events):
+            song = songs[int(rng.paretovariate(1.2)) % size]
+            song.play()
+            if rng.random() < 0.2:
+                song.add_rating(rng.choice((1.0, 2.5, 3.0, 4.5, 5.0)))
+        ingest = time.perf_counter() - start
+
+        sort_played, expected_played = _timed(_full_sort_most_played, system, 10, repeat=3)
+        board_played, got_played = _timed(system.get_most_played_songs, 10, repeat=3)
+        sort_rated, expected_rated = _timed(_full_sort_top_rated, system, 10, repeat=3)
+        board_rated, got_rated = _timed(system.get_top_rated_songs, 10, repeat=3)
+        assert got_played == expected_played and got_rated == expected_rated
+
+        print(f"{size:,} სიმღერა, {events:,} მოვლენა "
+              f"(განახლება: {ingest / events * 1e6:.2f} µs/მოვლენა)")
+        print(f"  most played TOP10: სრული დალაგება {sort_played * 1e3:.2f} ms | "
+              f"leaderboard {board_played * 1e6:.1f} µs")
+        print(f"  top rated TOP10:   სრული დალაგება {sort_rated * 1e3:.2f} ms | "
+              f"leaderboard {board_rated * 1e6:.1f} µs")
+
+
+def _legacy_report_passes(system: StreamingSystem) -> dict:
+    """ძველი generate_report-ის გავლები, ერთმანეთისგან დამოუკიდებლად"""
+    genres = {"PopSong": PopSong, "RockSong": RockSong, "ClassicalSong": ClassicalSong}
+    by_genre = {name: [s for s in system.songs.values() if isinstance(s, cls)]
+                for name, cls in genres.items()}
+    premium = [u for u in system.users.values() if u.is_premium]
+    free = [u for u in system.users.values() if not u.is_premium]
+    revenue = sum(u.monthly_fee for u in system.users.values() if u.is_premium)
+    artist_counts = {}
+    for user in system.users.values():
+        for song_id in user._history_song_ids():
+            if song_id in system.songs:
+                artist = system.songs[song_id].artist
+                artist_counts[artist] = artist_counts.get(artist, 0) + 1
+    hours = sorted(((u, u.get_total_listening_time(system.songs) // 3600)
+                    for u in system.users.values()), key=lambda x: x[1], reverse=True)
+    totals = {}
+    for name, songs in by_genre.items():
+        totals[name] = (sum(s.play_count for s in songs),
+                        sum(s.get_average_rating() for s in songs))
+    rock = by_genre["RockSong"]
+    sum(s.intensity_level for s in rock)
+    sum(1 for s in rock if s.has_guitar_solo)
+    sum(1 for s in by_genre["PopSong"] if s.is_chart_topper)
+    return {"premium": len(premium), "free": len(free), "revenue": revenue,
+            "top_listeners": hours[:5], "totals": totals,
+            "top_rated": _full_sort_top_rated(system, 10),
+            "most_played": _full_sort_most_played(system, 10)}
+
+
+def _build_dataset(songs: int, users: int, events: int, seed: int = 42) -> StreamingSystem:
+    rng = random.Random(seed)
+    system = StreamingSystem("bench")
+    catalog = []
+    for i in range(songs):
+        kind = i % 3
+        artist = f"Artist {i % 500}"
+        if kind == 0:
+            song = PopSong(f"Pop {i}", artist, 150 + i % 120, i % 7 == 0)
+        elif kind == 1:
+            song = RockSong(f"Rock {i}", artist, 180 + i % 200, 1 + i % 10, i % 2 == 0)
+        else:
+            song = ClassicalSong(f"Classical {i}", artist, 240 + i % 600, artist,
+                                 ("Baroque", "Classical", "Romantic")[i % 3], ["Piano"])
+        system.add_song(song)
+        catalog.append(song)
+    members = []
+    for i in range(users):
+        user = User(f"user{i}", f"user{i}@mail.com", i % 3 == 0, 9.99 if i % 3 == 0 else 0.0)
+        system.add_user(user)
+        members.append(user)
+    for _ in range(events):
+        song = catalog[int(rng.paretovariate(1.1)) % songs]
+        rng.choice(members).listen_to_song(song, "2025-01-01")
+        if rng.random() < 0.05:
+            song.add_rating(rng.choice((1.0, 2.5, 3.0, 4.5, 5.0)))
+    return system
+
+
+@benchmark("report")
+def bench_report(events: int = 1_000_000) -> None:
+    system = _build_dataset(songs=30_000, users=20_000, events=events)
+    legacy_time, legacy = _timed(_legacy_report_passes, system, repeat=3)
+    fused_time, stats = _timed(collect_report_stats, system, repeat=3)
+    assert legacy["revenue"] == stats.revenue
+    assert legacy["top_listeners"] == stats.top_listeners
+    assert legacy["most_played"] == stats.most_played
+    assert legacy["top_rated"] == stats.top_rated
+    for name, (plays, rating_sum) in legacy["totals"].items():
+        assert stats.genres[name].total_plays == plays
+        assert stats.genres[name].rating_sum == rating_sum
+    print(f"{events:,} მოვლენა: ძველი გავლები {legacy_time * 1e3:.1f} ms | "
+          f"ერთი გავლა {fused_time * 1e3:.1f} ms ({legacy_time / fused_time:.1f}x)")
+
+
+@benchmark("report_incremental")
+def bench_report_incremental(events: int = 1_000_000, changes: int = 100) -> None:
+    system = _build_dataset(songs=30_000, users=20_000, events=events)
+    users = list(system.users.values())
+    rng = random.Random(4)
+    catalog = [song for song in system.songs.values() if isinstance(song, RockSong)]
+
+    def generate(path: str, fmt: str) -> tuple:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            elapsed, _ = _timed(system.generate_report, path, fmt)
+        with open(path, encoding="utf-8") as f:
+            return elapsed, f.read()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("text", "json", "csv"):
+            path = os.path.join(tmp, f"report.{fmt}")
+            system.invalidate_report()
+            full, _ = generate(path, fmt)
+            unchanged, _ = generate(path, fmt)
+            """მხოლოდ როკ სიმღერების მოსმენები: პოპ და კლასიკური სექციები ქეშიდან"""
+            for _ in range(changes):
+                rng.choice(users).listen_to_song(rng.choice(catalog), "2025-06-01")
+            stale = len(system._report.stale())
+            incremental, output = generate(path, fmt)
+            system.invalidate_report()
+            assert generate(path, fmt)[1] == output
+            print(f"{fmt:5} სრული {full * 1e3:8.1f} ms | უცვლელი {unchanged * 1e3:6.1f} ms | "
+                  f"{changes} მოსმენის შემდეგ ({stale} ძველი სექცია) {incremental * 1e3:8.1f} ms")
+
+def _build_catalog(songs: int, users: int) -> StreamingSystem:
+    system = StreamingSystem("bench")
+    for i in range(songs):
+        system.add_song(Song(f"Song {i}", f"Artist {i % 500}", 150 + i % 200))
+    for i in range(users):
+        system.add_user(User(f"user{i}", f"user{i}@mail.com", i % 3 == 0))
+    return system
+
+
+def _random_events(system: StreamingSystem, events: int, seed: int = 7) -> list:
+    """ID-ები გლობალური მთვლელებიდანაა, ამიტომ მოვლენები ყოველ სისტემას ცალკე ეგზავნება"""
+    rng = random.Random(seed)
+    song_ids = list(system.songs)
+    user_ids = list(system.users)
+    result = []
+    for _ in range(events):
+        song_id = song_ids[int(rng.paretovariate(1.1)) % len(song_ids)]
+        rating = rng.choice((1.0, 3.5, 5.0)) if rng.random() < 0.1 else None
+        result.append((rng.choice(user_ids), song_id, "2025-01-01", rating))
+    return result
+
+
+def _titles(songs: list) -> list:
+    return [song.title for song in songs]
+
+
+@benchmark("ingest")
+def bench_ingest(events: int = 1_000_000) -> None:
+    per_call = _build_catalog(10_000, 5_000)
+    rows = _random_events(per_call, events)
+    start = time.perf_counter()
+    for user_id, song_id, date, rating in rows:
+        user = per_call.users[user_id]
+        song = per_call.songs[song_id]
+        user.listen_to_song(song, date)
+        if rating is not None:
+            user.rate_song(song, rating)
+    loop_time = time.perf_counter() - start
+    print(f"listen_to_song ციკლი: {events / loop_time:,.0f} მოვლენა/წმ")
+
+    bulk = _build_catalog(10_000, 5_000)
+    rows = _random_events(bulk, events)
+    report = bulk.ingest_events(rows)
+    print(f"ingest_events (მეხსიერებიდან): {report}")
+    assert _titles(bulk.get_most_played_songs(10)) == _titles(per_call.get_most_played_songs(10))
+    assert _titles(bulk.get_top_rated_songs(10)) == _titles(per_call.get_top_rated_songs(10))
+    assert bulk.get_most_popular_artist() == per_call.get_most_popular_artist()
+
+    with tempfile.TemporaryDirectory() as folder:
+        for label, writer, reader in (("CSV", _write_csv_events, read_csv_events),
+                                      ("JSONL", _write_jsonl_events, read_jsonl_events)):
+            target = _build_catalog(10_000, 5_000)
+            path = os.path.join(folder, f"events.{label.lower()}")
+            writer(path, _random_events(target, events))
+            print(f"ingest_events ({label}): {target.ingest_events(reader(path))}")
+
+
+def _write_csv_events(path: str, rows: list) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("user_id,song_id,date,rating\n")
+        for user_id, song_id, date, rating in rows:
+            f.write(f"{user_id},{song_id},{date},{'' if rating is None else rating}\n")
+
+
+def _write_jsonl_events(path: str, rows: list) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for user_id, song_id, date, rating in rows:
+            f.write(json.dumps({"user_id": user_id, "song_id": song_id,
+                                "date": date, "rating": rating}) + "\n")
+
+
+def _traced_bytes(build) -> tuple:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, kept
+
+
+@benchmark("event_log")
+def bench_event_log(events: int = 1_000_000, users: int = 1_000) -> None:
+    rng = random.Random(3)
+    song_ids = [f"S{i:03d}" for i in range(10_000)]
+    picks = [(rng.randrange(users), rng.randrange(len(song_ids))) for _ in range(events)]
+
+    def build_tuples():
+        histories = [[] for _ in range(users)]
+        for user_idx, song_idx in picks:
+            histories[user_idx].append((song_ids[song_idx], datetime.now().strftime("%H:%M:%S")))
+        return histories
+
+    def build_log():
+        log = EventLog()
+        for _ in range(users):
+            log.add_user()
+        now = int(time.time())
+        for user_idx, song_idx in picks:
+            log.append(user_idx, song_idx, now)
+        return log
+
+    tuple_bytes, histories = _traced_bytes(build_tuples)
+    log_bytes, log = _traced_bytes(build_log)
+
+    def scan_tuples():
+        return sum(1 for history in histories for item in history if item[0] == "S001")
+
+    def scan_log():
+        return log.song_index.count(1)
+
+    tuple_scan, tuple_hits = _timed(scan_tuples)
+    log_scan, log_hits = _timed(scan_log)
+    assert tuple_hits == log_hits
+    print(f"{events:,} მოვლენა: tuple სიები {tuple_bytes / events:.1f} ბაიტი/მოვლენა | "
+          f"EventLog {log_bytes / events:.1f} ბაიტი/მოვლენა ({tuple_bytes / log_bytes:.1f}x)")
+    print(f"  სრული სკანირება: tuple სიები {tuple_scan * 1e3:.1f} ms | EventLog {log_scan * 1e3:.1f} ms")
+
+
+@benchmark("wrapped_scaling")
+def bench_wrapped_scaling(events: int = 1_000_000, users: int = 50_000) -> None:
+    system = _build_dataset(songs=30_000, users=users, events=events)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, cores} | {n for n in (2, 4, 8, 16, 32) if n < cores})
+    baseline = None
+    with tempfile.TemporaryDirectory() as folder:
+        for workers in counts:
+            result = system.generate_wrapped_batch(folder, workers=workers)
+            baseline = baseline or result.elapsed
+            print(f"{workers} პროცესი: {result.users:,} Wrapped {result.elapsed:.2f} წმ-ში "
+                  f"({baseline / result.elapsed:.2f}x)")
+
+
+@benchmark("snapshot")
+def bench_snapshot(events: int = 2_000_000) -> None:
+    def rebuild():
+        system = _build_catalog(20_000, 10_000)
+        system.ingest_events(_random_events(system, events))
+        return system
+
+    rebuild_time, system = _timed(rebuild)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "system.snap")
+        save_time, _ = _timed(system.save_snapshot, path)
+        load_time, loaded = _timed(StreamingSystem.load_snapshot, path, repeat=3)
+        query_time, _ = _timed(loaded.get_listening_time, 0, 2 ** 40)
+        assert loaded.get_most_popular_artist() == system.get_most_popular_artist()
+        size = os.path.getsize(path)
+    print(f"{events:,} მოვლენა, ფაილი {size / 2 ** 20:.1f} MiB (ჩაწერა {save_time:.2f} წმ)")
+    print(f"  თავიდან აგება: {rebuild_time:.2f} წმ | load_snapshot: {load_time * 1e3:.1f} ms "
+          f"(პირველი სრული სკანირება {query_time * 1e3:.0f} ms)")
+
+
+class _DictSong:
+    """სიმღერა __slots__-ის გარეშე, როგორც ადრე იყო"""
+
+    def __init__(self, title, artist, duration, composer, era, instruments):
+        self.song_id = f"C{id(self) % 100000:03d}"
+        self.title = title
+        self.artist = artist
+        self.duration = duration
+        self.play_count = 0
+        self.total_rating = 0.0
+        self.rating_count = 0
+        self.composer = composer
+        self.era = era
+        self.instruments = instruments
+
+
+class _DictUser:
+    def __init__(self, username, email, is_premium, monthly_fee=0.0):
+        self.user_id = f"U{id(self) % 100000:03d}"
+        self.username = username
+        self.email = email
+        self.is_premium = is_premium
+        self.monthly_fee = monthly_fee
+        self.listening_history = []
+        self.playlists = {}
+
+
+@benchmark("models")
+def bench_models(count: int = 200_000) -> None:
+    composers = ["Ludwig van Beethoven", "Antonio Vivaldi", "Claude Debussy", "Johann Sebastian Bach"]
+    eras = ["Baroque", "Classical", "Romantic", "Impressionist"]
+    ensembles = [["Piano"], ["Violin", "Orchestra"], ["Orchestra"]]
+
+    def rows():
+        """სტრიქონები ყოველ ჯერზე ახლიდან იქმნება, როგორც ფაილიდან წაკითხვისას"""
+        for i in range(count):
+            name = "".join(composers[i % 4])
+            yield (f"Piece {i}", name, 300, "".join(name), "".join(eras[i % 4]),
+                   ["".join(instrument) for instrument in ensembles[i % 3]])
+
+    dict_songs, _ = _traced_bytes(lambda: [_DictSong(*row) for row in rows()])
+    slot_songs, _ = _traced_bytes(lambda: [ClassicalSong(*row) for row in rows()])
+    dict_users, _ = _traced_bytes(lambda: [_DictUser(f"user{i}", f"user{i}@mail.com", False)
+                                           for i in range(count)])
+    slot_users, _ = _traced_bytes(lambda: [User(f"user{i}", f"user{i}@mail.com", False)
+                                           for i in range(count)])
+    print(f"სიმღერა: __dict__ {dict_songs / count:.0f} ბაიტი | __slots__ + intern "
+          f"{slot_songs / count:.0f} ბაიტი ({dict_songs / slot_songs:.2f}x)")
+    print(f"მომხმარებელი: __dict__ {dict_users / count:.0f} ბაიტი | __slots__ "
+          f"{slot_users / count:.0f} ბაიტი ({dict_users / slot_users:.2f}x)")
+
+
+@benchmark("dense_ids")
+def bench_dense_ids(events: int = 1_000_000) -> None:
+    system = _build_catalog(20_000, 10_000)
+    system.ingest_events(_random_events(system, events))
+
+    def string_keys():
+        """ძველი გზა: ყოველ მოვლენაზე song_id-ით dict-ში ძებნა"""
+        songs = system.songs
+        return [sum(songs[song_id].duration for song_id in user._history_song_ids()
+                    if song_id in songs) for user in system.users.values()]
+
+    def dense_arrays():
+        return [system._user_listening_time(user) for user in system.users.values()]
+
+    keyed_time, keyed = _timed(string_keys)
+    dense_time, dense = _timed(dense_arrays, repeat=3)
+    assert keyed == dense
+    print(f"მოსმენის დრო ყველა მომხმარებლისთვის ({events:,} მოვლენა): "
+          f"string ID-ები {keyed_time * 1e3:.0f} ms | მკვრივი ინდექსები {dense_time * 1e3:.0f} ms")
+
+
+def _stream_events(system: StreamingSystem, events: int, seed: int = 11):
+    """_random_events-ის გენერატორი ვერსია დიდი მოცულობისთვის"""
+    rng = random.Random(seed)
+    song_ids = list(system.songs)
+    user_ids = list(system.users)
+    for _ in range(events):
+        yield (rng.choice(user_ids), song_ids[int(rng.paretovariate(1.1)) % len(song_ids)],
+               "2025-01-01", None)
+
+
+def _python_analytics(system: StreamingSystem, limit: int = 10) -> tuple:
+    stats = collect_report_stats(system)
+    seconds = {user.user_id: system._user_listening_time(user) for user in system.users.values()}
+    return stats, seconds, dict(system._artist_counts), _full_sort_most_played(system, limit)
+
+
+def _numpy_analytics(system: StreamingSystem, limit: int = 10) -> tuple:
+    backend = system.numpy_analytics()
+    return (backend, backend.per_user_seconds(), backend.per_artist_plays(),
+            backend.top_songs(limit), backend.genre_totals(), backend.era_histogram())
+
+
+def _analytics_mismatches(python_result: tuple, numpy_result: tuple) -> list:
+    """NumPy-ის გზის ველები, რომლებიც სუფთა Python-ის გზას არ ემთხვევა"""
+    stats, seconds, artists, top = python_result
+    backend, np_seconds, np_artists, np_top, genres, eras = numpy_result
+    mismatches = []
+    if np_seconds != seconds:
+        mismatches.append("per_user_seconds")
+    if np_artists != artists:
+        mismatches.append("per_artist_plays")
+    if np_top != top:
+        mismatches.append("top_songs")
+    if eras != stats.genres["ClassicalSong"].era_counts:
+        mismatches.append("era_histogram")
+    for name, genre in stats.genres.items():
+        if (genres[name]["songs"] != len(genre.songs) or genres[name]["plays"] != genre.total_plays
+                or abs(genres[name]["avg_rating"] - genre.avg_rating) > 1e-9):
+            mismatches.append(f"genre_totals[{name}]")
+    if abs(backend.avg_intensity() - stats.genres["RockSong"].avg_intensity) > 1e-9:
+        mismatches.append("avg_intensity")
+    return mismatches
+
+
+@benchmark("analytics")
+def bench_analytics(events: int = 10_000_000) -> None:
+    import analytics
+    if analytics.np is None:
+        print("numpy არ არის დაყენებული, ბენჩმარკი გამოტოვებულია")
+        return
+    system = _build_dataset(songs=50_000, users=100_000, events=0)
+    system.ingest_events(_stream_events(system, events), batch_size=100_000)
+
+    python_time, python_result = _timed(_python_analytics, system)
+    numpy_time, numpy_result = _timed(_numpy_analytics, system)
+    mismatches = _analytics_mismatches(python_result, numpy_result)
+    if mismatches:
+        raise AssertionError(f"NumPy შედეგი არ ემთხვევა Python-ს: {', '.join(mismatches)}")
+    print(f"{events:,} მოვლენა: Python {python_time:.2f} წმ | NumPy {numpy_time:.2f} წმ "
+          f"(მასივებად გადაყვანის ჩათვლით, {python_time / numpy_time:.1f}x)")
+
+
+@benchmark("analytics_parity")
+def bench_analytics_parity(events: int = 20_000, seed: int = 3) -> None:
+    """სწრაფი ტოლობის შემოწმება მცირე მონაცემებზე, სიმღერების წაშლით, ხელახლა
+    დამატებით და სხვა არტისტით ჩანაცვლებით (წამის ნაწილი, დამოუკიდებლად ეშვება)"""
+    import analytics
+    if analytics.np is None:
+        print("numpy არ არის დაყენებული, შემოწმება გამოტოვებულია")
+        return
+    rng = random.Random(seed)
+    system = _build_dataset(songs=600, users=200, events=0, seed=seed)
+
+    def verify(stage: str) -> None:
+        """TOP მთელ კატალოგზე, რომ წაშლილი სიმღერები 0 მოსმენით არ გამოგვრჩეს"""
+        limit = len(system._song_by_index)
+        mismatches = _analytics_mismatches(_python_analytics(system, limit),
+                                           _numpy_analytics(system, limit))
+        if mismatches:
+            raise AssertionError(f"{stage}: NumPy შედეგი არ ემთხვევა Python-ს: {', '.join(mismatches)}")
+
+    system.ingest_events(_stream_events(system, events, seed), batch_size=5_000)
+    verify("მოსმენები")
+
+    played = system.get_most_played_songs(20)
+    removed = played[::2] + rng.sample(list(system.songs.values()), 20)
+    for song in removed:
+        if song._system is system:
+            system.remove_song(song.song_id)
+    verify("წაშლა")
+
+    for song in removed[:5]:
+        system.add_song(song)
+    replaced = played[1]
+    substitute = Song(replaced.title, "Substitute Artist", replaced.duration)
+    substitute.song_id = replaced.song_id
+    system.add_song(substitute)
+    system.ingest_events(_stream_events(system, events // 4, seed + 1), batch_size=5_000)
+    verify("ხელახლა დამატება და ჩანაცვლება")
+    print(f"NumPy/Python ტოლობა: {len(system.events):,} მოვლენა, {len(removed)} წაშლილი სიმღერა - OK")
+
+
+@benchmark("playlists")
+def bench_playlists(users: int = 1_000, playlists: int = 20, size: int = 500) -> None:
+    rng = random.Random(13)
+    system = _build_catalog(20_000, users)
+    songs = list(system.songs.values())
+    members = list(system.users.values())
+    for user in members:
+        for p in range(playlists):
+            name = f"Mix {p}"
+            user.create_playlist(name)
+            for song in rng.sample(songs, size):
+                user.add_to_playlist(name, song)
+
+    def scan():
+        """ძველი გზა: ყოველ გამოძახებაზე ფლეილისტის გავლა და ძიება კატალოგში"""
+        return [sum(system.songs[song_id].duration for song_id in user.playlists[name]
+                    if song_id in system.songs)
+                for user in members for name in user.playlists]
+
+    def incremental():
+        return [user.get_playlist_duration(name, system.songs)
+                for user in members for name in user.playlists]
+
+    scan_time, expected = _timed(scan)
+    fast_time, result = _timed(incremental)
+    assert result == expected
+    song = songs[0]
+    song.duration += 60
+    assert incremental() == scan()
+    print(f"{users * playlists:,} ფლეილისტი x {size}: სკანირება {scan_time * 1000:.1f} ms | "
+          f"ინკრემენტული {fast_time * 1000:.2f} ms ({scan_time / fast_time:.0f}x)")
+
+
+def _search_catalog(songs: int, seed: int = 5) -> StreamingSystem:
+    """სათაურები Zipf-ით არჩეული სინთეზური სიტყვებიდან, ნაწილი დიაკრიტიკით"""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ré", "su", "na", "tö", "vi", "ba", "ле", "გი", "do",
+                 "ar", "en", "ti", "mor", "sel", "ван", "ქა", "ri"]
+    words = sorted({"".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+                    for _ in range(40_000)})
+    rng.shuffle(words)
+
+    def word() -> str:
+        return words[int(rng.paretovariate(0.8)) % len(words)]
+
+    artists = [f"{word().title()} {rng.choice(words).title()}" for _ in range(20_000)]
+    system = StreamingSystem("bench")
+    for i in range(songs):
+        title = " ".join(word() for _ in range(rng.randint(1, 4))).title()
+        if i % 10 == 0:
+            song = ClassicalSong(title, rng.choice(artists), 300, rng.choice(artists), "Romantic", ["Piano"])
+        else:
+            song = Song(title, rng.choice(artists), 200)
+        system.add_song(song)
+        song.play_count = int(rng.paretovariate(1.2))
+        system._on_song_played(song)
+    return system, words
+
+
+def _naive_search(system: StreamingSystem, query: str, limit: int) -> list:
+    needle = query.casefold()
+    found = [song for song in system.songs.values()
+             if needle in song.title.casefold() or needle in song.artist.casefold()
+             or needle in getattr(song, "composer", "").casefold()]
+    found.sort(key=lambda song: song.play_count, reverse=True)
+    return found[:limit]
+
+
+@benchmark("search")
+def bench_search(songs: int = 1_000_000, queries: int = 2_000) -> None:
+    from search import tokenize
+    rng = random.Random(9)
+
+    """ტოლობა: ინდექსი vs ტოკენების სრული სკანირება, პატარა კატალოგზე"""
+    small, words = _search_catalog(20_000)
+    for _ in range(200):
+        terms = [rng.choice(words)[:rng.randint(1, 5)] for _ in range(rng.randint(1, 2))]
+        query = " ".join(terms)
+        expected = []
+        for song in small.get_most_played_songs(len(small.songs)):
+            tokens = set(tokenize(song.title) + tokenize(song.artist) + tokenize(getattr(song, "composer", "")))
+            if all(any(token.startswith(term) for token in tokens) for term in tokenize(query)):
+                expected.append(song)
+        assert small.search_songs(query, 10) == expected[:10], query
+
+    build_time, (system, words) = _timed(_search_catalog, songs)
+    mixed = [rng.choice(words)[:rng.randint(2, 5)] if i % 2 else
+             f"{rng.choice(words)} {rng.choice(words)[:2]}" for i in range(queries)]
+    system.search_songs("warmup")
+    start = time.perf_counter()
+    latencies = []
+    for query in mixed:
+        begin = time.perf_counter()
+        system.search_songs(query, 10)
+        latencies.append(time.perf_counter() - begin)
+    index_time = time.perf_counter() - start
+    latencies.sort()
+    naive_time, _ = _timed(lambda: [_naive_search(system, query, 10) for query in mixed[:5]])
+    print(f"{songs:,} სიმღერა (აგება ინდექსით {build_time:.1f} წმ), {queries:,} მოთხოვნა")
+    print(f"  ინდექსი: საშუალო {index_time / queries * 1e3:.3f} ms, "
+          f"p50 {latencies[len(latencies) // 2] * 1e3:.3f} ms, p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.3f} ms")
+    print(f"  naive სკანირება: {naive_time / 5 * 1e3:.1f} ms მოთხოვნაზე")
+
+
+@benchmark("sketches")
+def bench_sketches(events: int = 2_000_000, songs: int = 20_000, users: int = 100_000) -> None:
+    import math
+    from sketches import SpaceSaving
+
+    """ზუსტი გზა: მსმენელების სიმრავლე სიმღერაზე"""
+    system = _build_catalog(songs, users)
+    system.ingest_events(_stream_events(system, events), batch_size=100_000)
+    song_ids = system._song_ids
+    user_ids = system._user_ids
+
+    def exact_listeners():
+        listeners = {}
+        for song_idx, user_idx in zip(system.events.song_index, system.events.user_index):
+            listeners.setdefault(song_idx, set()).add(user_idx)
+        return listeners
+
+    exact_bytes, listeners = _traced_bytes(exact_listeners)
+    exact_top = [song.song_id for song in system.get_most_played_songs(10)]
+    exact_artists = sorted(system._artist_counts.items(), key=lambda item: item[1], reverse=True)[:10]
+
+    for precision in (8, 10):
+        sketch_time, sketches = _timed(system.enable_sketches, precision)
+        errors = [abs(sketches.unique_listeners(song_ids[song_idx]) - len(users_of)) / len(users_of)
+                  for song_idx, users_of in listeners.items() if len(users_of) >= 100]
+        rmse = math.sqrt(sum(error * error for error in errors) / len(errors))
+        found = [key for key, _, _ in sketches.top_songs.top(10)]
+        artist_error = max(sketches.artist_plays.estimate(artist) - count for artist, count in exact_artists)
+        print(f"precision={precision}: სკეჩები {sketches.nbytes() / 2**20:.1f} MiB vs ზუსტი სიმრავლეები "
+              f"{exact_bytes / 2**20:.1f} MiB (ჩართვა {sketch_time:.1f} წმ)")
+        print(f"  HLL ფარდობითი ცდომილება (RMSE, {len(errors):,} სიმღერა): {rmse:.2%} "
+              f"(თეორიული {1.04 / math.sqrt(1 << precision):.2%})")
+        print(f"  TOP-10 სიმღერა Space-Saving: {len(set(found) & set(exact_top))}/10, "
+              f"Count-Min არტისტის მაქს. გადაჭარბება {artist_error:,} (ზღვარი 2N/w = {2 * events // 2048:,})")
+
+    """შარდების გაერთიანება ერთ სკეჩთან უნდა ემთხვეოდეს"""
+    halves = [SpaceSaving(256), SpaceSaving(256)]
+    for position, song_idx in enumerate(system.events.song_index):
+        halves[position % 2].add(song_idx)
+    halves[0].merge(halves[1])
+    merged_top = [song_ids[key] for key, _, _ in halves[0].top(10)]
+    print(f"  გაერთიანებული შარდები: TOP-10 დამთხვევა {len(set(merged_top) & set(exact_top))}/10, "
+          f"მომხმარებლები {len(user_ids):,}")
+
+
+def _concurrent_catalog(songs: int, users: int, threads: int):
+    """სიმღერები და მომხმარებლები იქმნება და ემატება რამდენიმე ნაკადიდან ერთდროულად"""
+    import threading
+    from concurrent_system import ConcurrentStreamingSystem
+    system = ConcurrentStreamingSystem("bench")
+
+    def create(worker: int):
+        for i in range(worker, songs, threads):
+            kind = (PopSong, RockSong, Song)[i % 3]
+            if kind is PopSong:
+                song = PopSong(f"Pop {i}", f"Artist {i % 50}", 200, False)
+            elif kind is RockSong:
+                song = RockSong(f"Rock {i}", f"Artist {i % 50}", 240, 5, True)
+            else:
+                song = Song(f"Song {i}", f"Artist {i % 50}", 180)
+            system.add_song(song)
+        for i in range(worker, users, threads):
+            system.add_user(User(f"user{i}", f"user{i}@mail.com", False))
+
+    workers = [threading.Thread(target=create, args=(w,)) for w in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return system
+
+
+def _concurrency_stress(events: int, songs: int, users: int, threads: int = 8, seed: int = 0) -> int:
+    """ჩამწერი ნაკადები (მოსმენები შემთხვევითი თარიღებით, შეფასებები) და მკითხველი, რომელიც
+    ამავდროულად კითხულობს Wrapped-ს და მოსმენის დროს; შეუსაბამობისას AssertionError.
+    აბრუნებს თანმიმდევრული წაკითხვების რაოდენობას."""
+    import threading
+
+    def check(condition: bool, message: str) -> None:
+        if not condition:
+            raise AssertionError(f"სტრეს-ტესტი (seed={seed}): {message}")
+
+    year = 2025
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        system = _concurrent_catalog(songs, users, threads)
+        check(len(system.songs) == songs and len(system.users) == users, "ID-ები განმეორდა")
+        catalog = list(system.songs.values())
+        members = list(system.users.values())
+        watched = members[:4]
+        ratings = [{} for _ in range(threads)]
+        stop = threading.Event()
+        torn = []
+        reads = [0]
+
+        def consistent(view) -> bool:
+            """ყველა მოსმენა year-შია, ამიტომ Wrapped-ის ჯამები ჟურნალს უნდა ემთხვეოდეს"""
+            if sum(song.play_count for song in view.songs.values()) != len(view.events):
+                return False
+            wrapped = view.get_wrapped(year)
+            months = wrapped["months"].values()
+            return (sum(month["listens"] for month in months) == len(view.events) and
+                    sum(month["seconds"] for month in months) == wrapped["seconds"])
+
+        def reader():
+            rng = random.Random(seed)
+            while not stop.is_set():
+                if not system.read(consistent):
+                    torn.append(len(system.events))
+                """ბლოკის გარეშე მოთხოვნებიც: ისინი დროით ინდექსს ცვლიან"""
+                system.get_listening_time(f"{year}-01-01", f"{year + 1}-01-01")
+                system.get_wrapped(year, rng.choice(watched).user_id)
+                reads[0] += 1
+
+        def writer(worker: int):
+            rng = random.Random(seed * threads + worker)
+            rated = ratings[worker]
+            for i in range(events // threads):
+                song = catalog[int(rng.paretovariate(1.1)) % songs]
+                listener = rng.choice(watched) if i % 4 == 0 else rng.choice(members)
+                listener.listen_to_song(song, f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+                if rng.random() < 0.1:
+                    rating = rng.choice((1.0, 2.0, 3.0, 4.0, 5.0))
+                    song.add_rating(rating)
+                    total, count = rated.get(song.song_id, (0.0, 0))
+                    rated[song.song_id] = (total + rating, count + 1)
+
+        watcher = threading.Thread(target=reader)
+        watcher.start()
+        workers = [threading.Thread(target=writer, args=(w,)) for w in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        stop.set()
+        watcher.join()
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+    log = system.events
+    listens = events // threads * threads
+    check(len(log) == listens, f"ჟურნალში {len(log):,} მოსმენაა, უნდა იყოს {listens:,}")
+    plays = {}
+    for song_idx in log.song_index:
+        plays[song_idx] = plays.get(song_idx, 0) + 1
+    for song in catalog:
+        check(song.play_count == plays.get(song._index, 0), f"{song.song_id}-ის play_count")
+        expected_count = sum(rated.get(song.song_id, (0.0, 0))[1] for rated in ratings)
+        expected_total = sum(rated.get(song.song_id, (0.0, 0))[0] for rated in ratings)
+        check(song.rating_count == expected_count and song.total_rating == expected_total,
+              f"{song.song_id}-ის შეფასებები")
+    artists = {}
+    for song_idx in log.song_index:
+        artist = system._song_by_index[song_idx].artist
+        artists[artist] = artists.get(artist, 0) + 1
+    check(artists == system._artist_counts, "არტისტების მთვლელები")
+
+    """დროითი ინდექსები: არაფერი უნდა დაიკარგოს პარალელური merge-ისას"""
+    check(len(log.time_index()) == listens,
+          f"დროით ინდექსში {len(log.time_index()):,} პოზიციაა, უნდა იყოს {listens:,}")
+    seconds = sum(system._durations[song_idx] for song_idx in log.song_index)
+    check(system.get_listening_time(f"{year}-01-01", f"{year + 1}-01-01") == seconds,
+          "get_listening_time არ ემთხვევა ჟურნალს")
+    check(system.get_wrapped(year)["seconds"] == seconds, "get_wrapped არ ემთხვევა ჟურნალს")
+    for user in watched:
+        positions = log.user_positions(user._system_index)
+        check(len(log.between(0, 1 << 62, user._system_index)) == len(positions),
+              f"{user.user_id}-ის დროითი ინდექსი")
+        check(system.get_wrapped(year, user.user_id)["seconds"] == system._user_listening_time(user),
+              f"{user.user_id}-ის Wrapped")
+    check(not torn, f"არათანმიმდევრული წაკითხვა: {len(torn)}")
+    return reads[0]
+
+
+@benchmark("concurrency_stress")
+def bench_concurrency_stress(events: int = 24_000, songs: int = 300, users: int = 100,
+                             rounds: int = 3) -> None:
+    """სწრაფი, განმეორებადი სტრეს-შემოწმება: ყოველი რაუნდი სხვა seed-ით"""
+    threads = 8
+    for round_seed in range(rounds):
+        reads = _concurrency_stress(events, songs, users, threads, round_seed)
+        print(f"  რაუნდი {round_seed + 1}/{rounds}: {threads} ნაკადი, {events // threads * threads:,} "
+              f"მოსმენა, {reads:,} წაკითხვა - OK")
+
+
+@benchmark("concurrency")
+def bench_concurrency(events: int = 200_000, songs: int = 2_000, users: int = 1_000) -> None:
+    """სტრეს-ტესტი (იხ. concurrency_stress) სრულ ზომაზე და გამტარუნარიანობა"""
+    import threading
+
+    threads = 8
+    reads = _concurrency_stress(events, songs, users, threads)
+    print(f"სტრეს-ტესტი: {threads} ნაკადი, {events // threads * threads:,} მოსმენა, "
+          f"{reads:,} თანმიმდევრული წაკითხვა - OK")
+
+    """გამტარუნარიანობა ნაკადების რაოდენობის მიხედვით"""
+    for count in (1, 2, 4, 8):
+        system = _concurrent_catalog(songs, users, count)
+        catalog = list(system.songs.values())
+        members = list(system.users.values())
+
+        def listen(worker: int):
+            rng = random.Random(worker)
+            for _ in range(events // count):
+                rng.choice(members).listen_to_song(catalog[int(rng.paretovariate(1.1)) % songs],
+                                                   "2025-01-01")
+
+        workers = [threading.Thread(target=listen, args=(w,)) for w in range(count)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        print(f"  {count} ნაკადი: {events // count * count / elapsed:,.0f} მოსმენა/წმ")
+
+    baseline = _build_catalog(songs, users)
+    catalog = list(baseline.songs.values())
+    members = list(baseline.users.values())
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(events):
+        rng.choice(members).listen_to_song(catalog[int(rng.paretovariate(1.1)) % songs], "2025-01-01")
+    print(f"  StreamingSystem (ბლოკების გარეშე): {events / (time.perf_counter() - start):,.0f} მოსმენა/წმ")
+
+
+async def _load(server, connections: int, events: int, window: int, path: str = None) -> tuple:
+    """დატვირთვის გენერატორი: connections კავშირი, თითოეულზე window მოთხოვნა ერთდროულად"""
+    import asyncio
+    from server import IngestClient
+    system = server.system
+    song_ids = list(system.songs)
+    user_ids = list(system.users)
+    latencies = []
+
+    async def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        client = await IngestClient.connect(server.host, server.port, path)
+        in_flight = asyncio.Semaphore(window)
+
+        async def track(future, sent: float) -> None:
+            response = await future
+            latencies.append(time.perf_counter() - sent)
+            in_flight.release()
+            assert response["ok"], response
+
+        tasks = []
+        for i in range(events // connections):
+            await in_flight.acquire()
+            if i % 100 == 99:
+                request = {"type": "query", "name": "most_played", "limit": 5}
+            elif i % 10 == 9:
+                request = {"type": "rate", "user_id": rng.choice(user_ids),
+                           "song_id": rng.choice(song_ids), "rating": rng.choice((1, 3, 5))}
+            else:
+                request = {"type": "listen", "user_id": rng.choice(user_ids), "date": "2025-01-01",
+                           "song_id": song_ids[int(rng.paretovariate(1.1)) % len(song_ids)]}
+            sent = time.perf_counter()
+            tasks.append(asyncio.create_task(track(await client.send(request), sent)))
+        await asyncio.gather(*tasks)
+        await client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(seed) for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return elapsed, latencies
+
+
+@benchmark("server")
+def bench_server(events: int = 200_000, connections: int = 8, window: int = 64) -> None:
+    import asyncio
+    import socket
+    from server import IngestServer, IngestClient
+
+    async def run(queue_size: int, connections: int, window: int, events: int, path: str = None) -> None:
+        system = _build_catalog(5_000, 2_000)
+        async with IngestServer(system, path=path, queue_size=queue_size) as server:
+            elapsed, latencies = await _load(server, connections, events, window, path)
+            client = await IngestClient.connect(server.host, server.port, path)
+            top = await client.request({"type": "query", "name": "most_played", "limit": 1})
+            await client.close()
+        per_connection = events // connections
+        listens = sum(1 for i in range(per_connection) if i % 10 != 9 and i % 100 != 99) * connections
+        assert len(system.events) == listens
+        assert top["songs"][0]["song_id"] == system.get_most_played_songs(1)[0].song_id
+        transport = "unix" if path else "tcp"
+        print(f"{transport}, {connections} კავშირი x {window} ფანჯარა, რიგი {queue_size:,}: "
+              f"{per_connection * connections / elapsed:,.0f} მოვლენა/წმ, "
+              f"p50 {latencies[len(latencies) // 2] * 1e3:.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.2f} ms, "
+              f"{server.batches:,} batch, რიგის მაქს. სიღრმე {server.max_queue_depth:,}")
+
+    asyncio.run(run(10_000, 1, 1, min(events, 5_000)))
+    asyncio.run(run(10_000, connections, window, events))
+    """პატარა რიგი: კითხვა ჩერდება და კლიენტის drain() ელოდება (backpressure)"""
+    asyncio.run(run(128, connections, window, events))
+    if hasattr(socket, "AF_UNIX"):
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(run(10_000, connections, window, events, os.path.join(tmp, "ingest.sock")))
+
+
+
+@benchmark("metrics")
+def bench_metrics(songs: int = 20_000, users: int = 2_000, listens: int = 200_000) -> None:
+    from metrics import format_text, format_json
+
+    def listen_loop(system: StreamingSystem) -> float:
+        rng = random.Random(5)
+        catalog = list(system.songs.values())
+        people = list(system.users.values())
+        start = time.perf_counter()
+        for i in range(listens):
+            people[i % len(people)].listen_to_song(catalog[int(rng.paretovariate(1.2)) % len(catalog)],
+                                                   "2025-06-01T12:00:00")
+        return time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "report.txt")
+        plain = _build_catalog(songs, users)
+        base = listen_loop(plain)
+        instrumented = _build_catalog(songs, users)
+        metrics = instrumented.enable_metrics(profile_report=os.path.join(tmp, "report.prof"))
+        measured = listen_loop(instrumented)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            instrumented.generate_report(report_path)
+        instrumented.get_most_popular_artist()
+        snapshot = instrumented.metrics()
+        assert snapshot["listen_to_song"]["calls"] == listens
+        assert snapshot["generate_report"]["calls"] == 1
+        assert snapshot["_write_pop_section"]["items"] == instrumented.get_genre_count("PopSong")
+        assert os.path.getsize(os.path.join(tmp, "report.prof")) > 0
+        json.loads(format_json(snapshot))
+        instrumented.disable_metrics()
+        disabled = listen_loop(instrumented)
+
+    print(f"{listens:,} listen_to_song: გამორთული {base / listens * 1e6:.2f} µs, "
+          f"ჩართული {measured / listens * 1e6:.2f} µs, "
+          f"ჩართვა-გამორთვის შემდეგ {disabled / listens * 1e6:.2f} µs")
+    print(format_text(snapshot), end="")
+    print(metrics.profile_text(limit=8).strip().splitlines()[0])
+
+def _naive_similar(system: StreamingSystem, song_id: str, limit: int) -> list:
+    """ყველა მსმენელის სრული ისტორიის გადათვლა, O(მსმენელები · ისტორია)"""
+    listeners = [user for user in system.users.values() if song_id in set(user._history_song_ids())]
+    counts = {}
+    for user in listeners:
+        for other in set(user._history_song_ids()):
+            if other != song_id:
+                counts[other] = counts.get(other, 0) + 1
+    return sorted(counts, key=counts.get, reverse=True)[:limit]
+
+
+@benchmark("recommendations")
+def bench_recommendations(sizes=(100_000, 1_000_000)) -> None:
+    from synthetic import SyntheticConfig, generate_system
+
+    for events in sizes:
+        system = generate_system(SyntheticConfig.for_events(events, seed=3))
+        """დრო tracemalloc-ის გარეშე, მეხსიერება მეორე აგებით"""
+        retained, _ = _traced_bytes(system.enable_recommendations)
+        build, recommender = _timed(system.enable_recommendations)
+        songs = system.get_most_played_songs(200)
+        users = list(system.users.values())[:200]
+
+        recommender._neighbors.clear()
+        cold, _ = _timed(lambda: [system.similar_songs(song.song_id) for song in songs])
+        warm, similar = _timed(lambda: [system.similar_songs(song.song_id) for song in songs], repeat=3)
+        cold_users, _ = _timed(lambda: [system.recommend_songs(user.user_id) for user in users])
+        warm_users, _ = _timed(lambda: [system.recommend_songs(user.user_id) for user in users], repeat=3)
+        for user in users:
+            heard = set(user._history_song_ids())
+            assert not any(song.song_id in heard for song in system.recommend_songs(user.user_id))
+
+        rng = random.Random(9)
+        catalog = list(system.songs.values())
+        start = time.perf_counter()
+        for i in range(20_000):
+            users[i % len(users)].listen_to_song(catalog[int(rng.paretovariate(1.1)) % len(catalog)],
+                                                 "2025-12-31")
+        incremental = (time.perf_counter() - start) / 20_000
+
+        naive, expected = _timed(_naive_similar, system, songs[0].song_id, 10)
+        overlap = len({song.song_id for song in system.similar_songs(songs[0].song_id)} & set(expected))
+        print(f"{events:,} მოვლენა, {len(system.songs):,} სიმღერა: აგება {build:.2f} წმ "
+              f"({build / events * 1e6:.2f} µs/მოვლენა), {recommender.pair_count():,} წყვილი, "
+              f"{recommender.truncations:,} შეკვეცა, {retained / 2**20:.1f} MiB")
+        print(f"  similar_songs: ცივი {cold / len(songs) * 1e6:.1f} µs, ქეშით {warm / len(songs) * 1e6:.1f} µs | "
+              f"recommend_songs: ცივი {cold_users / len(users) * 1e6:.1f} µs, "
+              f"ქეშით {warm_users / len(users) * 1e6:.1f} µs")
+        print(f"  listen_to_song რეკომენდაციებით: {incremental * 1e6:.2f} µs | "
+              f"სრული გადათვლა ერთ სიმღერაზე {naive * 1e3:.1f} ms, TOP10 დამთხვევა {overlap}/10")
+
+@benchmark("catalog")
+def bench_catalog(songs: int = 200_000, lookups: int = 200_000, users: int = 500, history: int = 200) -> None:
+    from catalog import SongCatalog
+    from synthetic import SyntheticConfig, generate_songs, zipf_weights
+
+    config = SyntheticConfig(songs=songs, seed=5)
+    dict_bytes, songs_dict = _traced_bytes(lambda: {song.song_id: song for song in generate_songs(
+        config, random.Random(config.seed))})
+    song_ids = list(songs_dict)
+    rng = random.Random(13)
+    keys = rng.choices(song_ids, cum_weights=zipf_weights(len(song_ids), config.song_skew), k=lookups)
+    dict_get, _ = _timed(lambda: [songs_dict.get(key) for key in keys], repeat=3)
+
+    def write(path: str) -> None:
+        with SongCatalog(path) as catalog:
+            catalog.add_many(songs_dict.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.db")
+        build, _ = _timed(write, path)
+        print(f"{songs:,} სიმღერა: dict {dict_bytes / 2**20:.1f} MiB, SQLite ჩაწერა {build:.2f} წმ, "
+              f"ფაილი {os.path.getsize(path) / 2**20:.1f} MiB | dict.get {dict_get / lookups * 1e6:.2f} µs")
+        for share in (0.01, 0.05, 0.20):
+            cache_size = int(songs * share)
+            with SongCatalog(path, cache_size=cache_size) as catalog:
+                """პირველი გავლა ქეშს ავსებს, გაზომვა მეორეზე"""
+                for key in keys:
+                    catalog.get(key)
+                catalog.reset_stats()
+                elapsed, _ = _timed(lambda: [catalog.get(key) for key in keys])
+                cached, _ = _traced_bytes(lambda: SongCatalog(path, cache_size=cache_size).prefetch(
+                    song_ids[:cache_size]))
+                print(f"  ქეში {share:.0%} ({cache_size:,}): hit rate {catalog.hit_rate:.1%}, "
+                      f"get {elapsed / lookups * 1e6:.2f} µs ({elapsed / dict_get:.1f}x dict), "
+                      f"ქეშის მეხსიერება {cached / 2**20:.1f} MiB")
+
+        histories = []
+        for _ in range(users):
+            user = User(f"user{len(histories)}", "user@mail.com", False)
+            for song_id in rng.choices(song_ids, k=history):
+                user.listen_to_song(songs_dict[song_id], "2025-01-01")
+            histories.append(user)
+        expected, reference = _timed(lambda: [user.get_total_listening_time(songs_dict) for user in histories])
+        with SongCatalog(path, cache_size=songs // 100) as catalog:
+            batched, totals = _timed(lambda: [user.get_total_listening_time(catalog) for user in histories])
+            batched_queries = catalog.queries
+        with SongCatalog(path, cache_size=songs // 100) as catalog:
+            def per_item():
+                return [sum(catalog[song_id].duration for song_id in user._history_song_ids())
+                        for user in histories]
+            single, _ = _timed(per_item)
+            single_queries = catalog.queries
+        assert totals == reference
+        print(f"  get_total_listening_time {users:,} × {history}: dict {expected * 1e3:.0f} ms, "
+              f"prefetch {batched * 1e3:.0f} ms ({batched_queries:,} მოთხოვნა), "
+              f"ცალ-ცალკე {single * 1e3:.0f} ms ({single_queries:,} მოთხოვნა)")
+
+
+@benchmark("ratings")
+def bench_ratings(sizes=(50_000_000,), songs: int = 100_000, chunk: int = 100_000) -> None:
+    from synthetic import zipf_weights
+
+    for ratings in sizes:
+        system = StreamingSystem("bench")
+        catalog = [Song(f"Song {i}", f"Artist {i % 1000}", 180) for i in range(songs)]
+        for song in catalog:
+            system.add_song(song)
+        users = [User(f"user{i}", "user@mail.com", False) for i in range(max(1_000, ratings // 100))]
+        for user in users:
+            system.add_user(user)
+        song_weights = zipf_weights(songs, 0.8)
+        user_ids = [user.user_id for user in users]
+        song_ids = [song.song_id for song in catalog]
+        values = (1.0, 2.0, 3.0, 3.5, 4.0, 4.5, 5.0)
+        rng = random.Random(17)
+
+        def generate(count: int):
+            while count:
+                size = min(count, chunk)
+                count -= size
+                yield from zip(rng.choices(user_ids, k=size),
+                               rng.choices(song_ids, cum_weights=song_weights, k=size),
+                               rng.choices(values, k=size))
+
+        """ერთი შეფასების გზა (rate_song) ნიმუშზე (მაქს. 10%), დანარჩენი ingest_ratings-ით"""
+        sample_rows = [(system.users[user_id], system.songs[song_id], rating)
+                       for user_id, song_id, rating in generate(min(200_000, max(1, ratings // 10)))]
+        start = time.perf_counter()
+        for user, song, rating in sample_rows:
+            user.rate_song(song, rating)
+        per_call = (time.perf_counter() - start) / len(sample_rows)
+        report = system.ingest_ratings(generate(max(0, ratings - len(sample_rows))), batch_size=chunk)
+
+        """ახალი სიმღერები თითო 5.0 შეფასებით: უბრალო საშუალოთი ისინი TOP-ში ხვდებიან"""
+        for i in range(100):
+            song = Song(f"New {i}", "Newcomer", 180)
+            system.add_song(song)
+            catalog.append(song)
+            users[i].rate_song(song, 5.0)
+        store = system._ratings
+        rated = sum(song.rating_count for song in catalog)
+        assert rated == len(store)
+        sample = min(1_000_000, len(store))
+        dict_bytes, _ = _traced_bytes(lambda: {(user_idx, song_idx): rating for user_idx, song_idx, rating
+                                               in itertools.islice(store.items(), sample)})
+        store_bytes = store.capacity * 16
+
+        sort_time, expected = _timed(_full_sort_top_rated, system, 10)
+        board_time, top = _timed(system.get_top_rated_songs, 10, repeat=5)
+        assert top == expected
+        """ხმაურის მდგრადობა: TOP10-ში რამდენ სიმღერას აქვს min_votes-ზე ნაკლები შეფასება"""
+        min_votes = system._top_rated.min_votes
+        noisy_bayes = sum(song.rating_count < min_votes for song in top)
+        rescore, _ = _timed(system.set_rating_prior, 3.0, 0)
+        noisy_mean = sum(song.rating_count < min_votes for song in system.get_top_rated_songs(10))
+        system.set_rating_prior(3.0, min_votes)
+
+        user, song = users[0], catalog[0]
+        rerate_time, _ = _timed(lambda: [user.rate_song(song, 4.0 + i % 2) for i in range(100_000)])
+
+        print(f"{ratings:,} შეფასება ({len(store):,} უნიკალური წყვილი, {len(users):,} მომხმარებელი, "
+              f"{songs:,} სიმღერა)")
+        bulk = (f"ingest_ratings {report.seconds / report.events * 1e6:.2f} µs/შეფასება (გენერაციის ჩათვლით)"
+                if report.events else "ingest_ratings: ყველა შეფასება ნიმუშშია")
+        print(f"  rate_song {per_call * 1e6:.2f} µs, ხელახალი შეფასება {rerate_time / 100_000 * 1e6:.2f} µs | "
+              f"{bulk}")
+        print(f"  RatingStore {store_bytes / 2**20:,.0f} MiB ({store_bytes / len(store):.1f} B/წყვილი) | "
+              f"dict {dict_bytes / sample:.1f} B/წყვილი (~{dict_bytes / sample * len(store) / 2**20:,.0f} MiB)")
+        print(f"  top rated TOP10: სრული დალაგება {sort_time * 1e3:.1f} ms | leaderboard {board_time * 1e6:.1f} µs | "
+              f"prior-ის შეცვლა (ხელახალი აგება) {rescore * 1e3:.0f} ms")
+        print(f"  TOP10-ში <{min_votes} შეფასებით: ბაიესური {noisy_bayes}, უბრალო საშუალო {noisy_mean}")
+        del system, users, catalog, store
+
+
+def _dirty_events(rows: list, error_rate: float, seed: int = 23) -> list:
+    """error_rate წილი მოვლენა ფუჭდება: უცნობი მომხმარებელი/სიმღერა ან არასწორი რეიტინგი"""
+    rng = random.Random(seed)
+    dirty = []
+    for user_id, song_id, date, rating in rows:
+        if rng.random() < error_rate:
+            kind = rng.randrange(4)
+            if kind == 0:
+                user_id = "ghost"
+            elif kind == 1:
+                song_id = "missing"
+            else:
+                rating = 7.5 if kind == 2 else "five"
+        dirty.append((user_id, song_id, date, rating))
+    return dirty
+
+
+"""ფაილში ჩასმული გაფუჭებული ხაზები: მკითხველმა ისინი MALFORMED-ად უნდა გადასცეს"""
+_BROKEN_LINES = {
+    "csv": ["lonely_field", "another"],
+    "jsonl": ["{not json", "[1, 2]", "\"x\"", "42"],
+}
+
+
+def _insert_broken_lines(path: str, kind: str, every: int, seed: int = 29) -> int:
+    """ყოველ ~every ხაზზე ერთი გაფუჭებული ხაზი; აბრუნებს ჩასმულების რაოდენობას"""
+    rng = random.Random(seed)
+    broken = _BROKEN_LINES[kind]
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    result = []
+    inserted = 0
+    for line in lines:
+        result.append(line)
+        if rng.randrange(every) == 0:
+            result.append(rng.choice(broken) + "\n")
+            inserted += 1
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(result)
+    return inserted
+
+
+def _replay_per_event(system: StreamingSystem, rows: list) -> None:
+    """ძველი გზა: ყოველი მოვლენა ცალკე, შეცდომა იბეჭდება"""
+    for user_id, song_id, date, rating in rows:
+        try:
+            user = system.find_user(user_id)
+            song = system.find_song(song_id)
+        except KeyError as e:
+            print(f"შეცდომა: {e}")
+            continue
+        user.listen_to_song(song, date)
+        if rating is not None:
+            user.rate_song(song, rating)
+
+
+@benchmark("validation")
+def bench_validation(events: int = 200_000, songs: int = 10_000, users: int = 5_000) -> None:
+    for error_rate in (0.01, 0.10, 0.50):
+        per_event = _build_catalog(songs, users)
+        rows = _dirty_events(_random_events(per_event, events), error_rate)
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            replay, _ = _timed(_replay_per_event, per_event, rows)
+
+        bulk = _build_catalog(songs, users)
+        rows = _dirty_events(_random_events(bulk, events), error_rate)
+        report = bulk.ingest_events(rows)
+        assert report.events == events and report.skipped + report.listens == events
+        assert _titles(bulk.get_most_played_songs(10)) == _titles(per_event.get_most_played_songs(10))
+        print(f"შეცდომები {error_rate:.0%}: ცალ-ცალკე ბეჭდვით {events / replay:,.0f} მოვლენა/წმ | "
+              f"ingest_events ვალიდაციით {report.events_per_second:,.0f} მოვლენა/წმ "
+              f"({replay / report.seconds:.1f}x)")
+        print(f"  უარყოფილი {report.errors.total:,}: {report.errors}")
+
+        """იგივე მოვლენები გაფუჭებული ხაზებიანი CSV/JSONL ფაილიდან"""
+        with tempfile.TemporaryDirectory() as folder:
+            for kind, writer, reader in (("csv", _write_csv_events, read_csv_events),
+                                         ("jsonl", _write_jsonl_events, read_jsonl_events)):
+                target = _build_catalog(songs, users)
+                path = os.path.join(folder, f"events.{kind}")
+                writer(path, _dirty_events(_random_events(target, events), error_rate))
+                broken = _insert_broken_lines(path, kind, max(2, int(1 / error_rate)))
+                replayed = target.ingest_events(reader(path))
+                malformed = replayed.errors.counts.get(MALFORMED, 0)
+                if (replayed.events != events + broken or malformed != broken
+                        or replayed.listens != report.listens):
+                    raise AssertionError(f"{kind}: {replayed.events:,} მოვლენა, {malformed:,} MALFORMED "
+                                         f"(ჩასმული {broken:,}), {replayed.listens:,} მოსმენა "
+                                         f"(უნდა იყოს {report.listens:,})")
+                print(f"  {kind.upper()} ფაილიდან {broken:,} გაფუჭებული ხაზით: {replayed.errors}")
+
+
+def _full_sort_scored(system: StreamingSystem, genre: str, score, limit: int, keep=None) -> list:
+    songs = [song for song in system.get_songs_by_genre(genre) if keep is None or keep(song)]
+    songs.sort(key=score, reverse=True)
+    return songs[:limit]
+
+
+@benchmark("genre_scores")
+def bench_genre_scores(sizes=(100_000, 1_000_000)) -> None:
+    from synthetic import SyntheticConfig, generate_system
+
+    for events in sizes:
+        system = generate_system(SyntheticConfig.for_events(events, seed=4))
+        queries = (
+            ("pop popularity", "PopSong", PopSong.calculate_popularity, None,
+             lambda: system.get_top_pop_songs(10)),
+            ("rock energy", "RockSong", RockSong.calculate_energy_score, None,
+             lambda: system.get_top_energy_rock(10)),
+            ("rock energy, intensity >= 8", "RockSong", RockSong.calculate_energy_score,
+             lambda song: song.intensity_level >= 8, lambda: system.get_top_energy_rock(10, min_intensity=8)),
+            ("classical complexity", "ClassicalSong", ClassicalSong.calculate_complexity_score, None,
+             lambda: system.get_most_complex_classical(10)),
+            ("classical complexity, era=Romantic", "ClassicalSong", ClassicalSong.calculate_complexity_score,
+             lambda song: song.era == "Romantic", lambda: system.get_most_complex_classical(10, "Romantic")),
+        )
+        print(f"{events:,} მოვლენა, {len(system.songs):,} სიმღერა")
+        for name, genre, score, keep, query in queries:
+            sort_time, expected = _timed(_full_sort_scored, system, genre, score, 10, keep, repeat=3)
+            board_time, got = _timed(query, repeat=3)
+            assert [score(song) for song in got] == [score(song) for song in expected]
+            print(f"  {name:36} სრული დალაგება {sort_time * 1e3:8.2f} ms | ინდექსი {board_time * 1e6:7.1f} µs")
+
+        songs = system.get_songs_by_genre("PopSong")
+        rng = random.Random(9)
+        picks = [songs[int(rng.paretovariate(1.1)) % len(songs)] for _ in range(100_000)]
+        elapsed, _ = _timed(lambda: [song.play() for song in picks])
+        print(f"  PopSong.play() პოპულარობის განახლებით: {elapsed / len(picks) * 1e6:.2f} µs")
+
+
+def _suite_op(func, calls: int = 1) -> dict:
+    """func() calls-ჯერ: საშუალო დრო, შემდეგ ერთი გამოძახების პიკური მეხსიერება tracemalloc-ით"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"calls": calls, "total_s": elapsed, "per_call_us": elapsed / calls * 1e6, "peak_bytes": peak}
+
+
+def _suite_size(events: int, seed: int = 42) -> dict:
+    from synthetic import (SyntheticConfig, generate_songs, generate_users, generate_playlists,
+                           generate_events)
+
+    config = SyntheticConfig.for_events(events, seed=seed)
+    rng = random.Random(config.seed)
+    system = StreamingSystem("suite")
+    songs = generate_songs(config, rng)
+    users = generate_users(config, rng)
+    ops = {}
+
+    start = time.perf_counter()
+    for song in songs:
+        system.add_song(song)
+    elapsed = time.perf_counter() - start
+    ops["add_song"] = {"calls": len(songs), "total_s": elapsed, "per_call_us": elapsed / len(songs) * 1e6}
+    start = time.perf_counter()
+    for user in users:
+        system.add_user(user)
+    elapsed = time.perf_counter() - start
+    ops["add_user"] = {"calls": len(users), "total_s": elapsed, "per_call_us": elapsed / len(users) * 1e6}
+    generate_playlists(config, songs, users, rng)
+    start = time.perf_counter()
+    report = system.ingest_events(generate_events(config, songs, users, rng))
+    elapsed = time.perf_counter() - start
+    ops["ingest_events"] = {"calls": events, "total_s": elapsed, "per_call_us": elapsed / events * 1e6}
+    assert report.listens == events and report.skipped == 0
+
+    heavy = users[0]
+    user = users[len(users) // 2]
+    song = songs[len(songs) // 2]
+    song_ids = [s.song_id for s in songs[:1_000]]
+    stamps = iter(range(10**9))
+    year = config.start.year
+    start_ts, end_ts = config.start.isoformat(), f"{year}-07-01"
+    extra = (Song(f"Extra {i}", "Extra Artist", 200) for i in range(10**9))
+    names = (f"suite {i}" for i in range(10**9))
+    songs_dict = system.songs
+    small = min(100, max(1, events // 100))
+
+    ops["listen_to_song"] = _suite_op(
+        lambda: user.listen_to_song(songs[next(stamps) % len(songs)], f"{year}-12-31"), 1_000)
+    ops["rate_song"] = _suite_op(lambda: user.rate_song(song, 4.5), 1_000)
+    ops["add_song (live)"] = _suite_op(lambda: system.add_song(next(extra)), 100)
+    ops["add_user (live)"] = _suite_op(
+        lambda: system.add_user(User(next(names), "x@example.com", False)), 100)
+    ops["create_playlist+add"] = _suite_op(
+        lambda: (user.create_playlist(name := next(names)), user.add_to_playlist(name, song)), 100)
+    ops["find_song"] = _suite_op(lambda: [system.find_song(song_id) for song_id in song_ids], 10)
+    ops["find_user"] = _suite_op(lambda: system.find_user(user.user_id), 1_000)
+    ops["search_songs"] = _suite_op(lambda: system.search_songs("love he"), 100)
+    for genre in ("PopSong", "RockSong", "ClassicalSong"):
+        ops[f"get_songs_by_genre[{genre}]"] = _suite_op(lambda: system.get_songs_by_genre(genre), small)
+        ops[f"get_genre_count[{genre}]"] = _suite_op(lambda: system.get_genre_count(genre), 1_000)
+    ops["get_top_rated_songs"] = _suite_op(lambda: system.get_top_rated_songs(10), 1_000)
+    ops["get_most_played_songs"] = _suite_op(lambda: system.get_most_played_songs(10), 1_000)
+    ops["get_top_pop_songs"] = _suite_op(lambda: system.get_top_pop_songs(10), 1_000)
+    ops["get_top_energy_rock[>=8]"] = _suite_op(lambda: system.get_top_energy_rock(10, min_intensity=8), 1_000)
+    ops["get_most_complex_classical[era]"] = _suite_op(
+        lambda: system.get_most_complex_classical(10, "Romantic"), 1_000)
+    ops["get_most_popular_artist"] = _suite_op(system.get_most_popular_artist, 1_000)
+    ops["get_total_premium_revenue"] = _suite_op(system.get_total_premium_revenue, small)
+    ops["get_top_artists"] = _suite_op(lambda: system.get_top_artists(start_ts, end_ts), small)
+    ops["get_top_songs"] = _suite_op(lambda: system.get_top_songs(start_ts, end_ts), small)
+    ops["get_listening_time"] = _suite_op(lambda: system.get_listening_time(start_ts, end_ts), small)
+    ops["get_monthly_rollup"] = _suite_op(lambda: system.get_monthly_rollup(start_ts, end_ts), small)
+    ops["get_wrapped"] = _suite_op(lambda: system.get_wrapped(year), 1)
+    ops["get_wrapped[user]"] = _suite_op(lambda: system.get_wrapped(year, heavy.user_id), small)
+    ops["user.get_total_listening_time"] = _suite_op(lambda: heavy.get_total_listening_time(songs_dict), small)
+    ops["user.get_favorite_artist"] = _suite_op(lambda: heavy.get_favorite_artist(songs_dict), small)
+    ops["user.get_listening_history"] = _suite_op(heavy.get_listening_history, 1)
+    playlist = next(iter(heavy.playlists), None)
+    if playlist is not None:
+        ops["user.get_playlist_duration"] = _suite_op(
+            lambda: heavy.get_playlist_duration(playlist, songs_dict), 1_000)
+        ops["user.get_playlist_stats"] = _suite_op(lambda: heavy.get_playlist_stats(playlist), 1_000)
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "report.txt")
+        snapshot_path = os.path.join(tmp, "suite.snap")
+        ops["generate_report"] = _suite_op(lambda: system.generate_report(report_path), 1)
+        ops["save_snapshot"] = _suite_op(lambda: system.save_snapshot(snapshot_path), 1)
+        ops["load_snapshot"] = _suite_op(lambda: StreamingSystem.load_snapshot(snapshot_path), 1)
+    ops["remove_song"] = _suite_op(lambda: system.remove_song(songs.pop().song_id), 10)
+
+    return {"events": events, "songs": config.songs, "users": config.users, "seed": seed,
+            "operations": ops}
+
+
+@benchmark("suite")
+def bench_suite(sizes=(1_000, 10_000, 100_000, 1_000_000), output: str = "benchmark_results.json") -> dict:
+    """ყველა საჯარო ოპერაცია სინთეზურ მონაცემებზე, შედეგი JSON-ად რეგრესიების შესადარებლად.
+
+    დრო იზომება tracemalloc-ის გარეშე, მეხსიერება კი ცალკე, ერთ გამოძახებაზე.
+    """
+    results = {"created": datetime.now().isoformat(timespec="seconds"),
+               "python": sys.version.split()[0], "sizes": []}
+    for events in sizes:
+        start = time.perf_counter()
+        result = _suite_size(events)
+        result["wall_s"] = time.perf_counter() - start
+        if resource is not None:
+            result["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        results["sizes"].append(result)
+        ops = result["operations"]
+        print(f"{events:,} მოვლენა ({result['songs']:,} სიმღერა, {result['users']:,} მომხმარებელი), "
+              f"{result['wall_s']:.1f} წმ")
+        for name, op in ops.items():
+            peak = op.get("peak_bytes")
+            memory = f", პიკი {peak / 1024:,.1f} KiB" if peak is not None else ""
+            print(f"  {name:32} {op['per_call_us']:>12,.2f} µs{memory}")
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"შედეგი ჩაიწერა: {output}")
+    return results
+
+def main(names: list, **options) -> None:
+    """options (მაგ. sizes, output) გადაეცემა მხოლოდ იმ ბენჩმარკებს, რომლებიც მათ იღებენ"""
+    for name in names or list(BENCHMARKS):
+        if name not in BENCHMARKS:
+            print(f"უცნობი ბენჩმარკი: {name} (ხელმისაწვდომია: {', '.join(BENCHMARKS)})")
+            continue
+        print(f"=== {name} ===")
+        func = BENCHMARKS[name]
+        accepted = inspect.signature(func).parameters
+        func(**{key: value for key, value in options.items() if key in accepted})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="წარმადობის ბენჩმარკები")
+    parser.add_argument("names", nargs="*")
+    parser.add_argument("--sizes", type=lambda text: tuple(int(size) for size in text.split(",")),
+                        help="მოვლენების რაოდენობები, მაგ. 1000,10000,10000000")
+    parser.add_argument("--output", help="JSON შედეგის ფაილი (suite)")
+    args = parser.parse_args()
+    main(args.names, **{key: value for key, value in (("sizes", args.sizes), ("output", args.output))
+                        if value is not None})
@@ -0,0 +1,283 @@
+"""SQLite-ზე შენახული სიმღერების კატალოგი RAM-ზე დიდი კატალოგებისთვის.
+
+SongCatalog არის mapping (song_id -> Song), რომელიც User-ის მეთოდებს
+songs_dict-ად გადაეცემა. მეხსიერებაში რჩება მხოლოდ ბოლოს გამოყენებული
+cache_size სიმღერა (LRU), დანარჩენი SQLite ფაილშია: საერთო ველები ცალკე
+სვეტებად, ჟანრის ველები (is_chart_topper, era, instruments, ...) JSON-ად.
+
+გაცემული Song ობიექტი ქეშშია, სანამ არ გამოიდევნება; გამოდევნისას ან
+flush()-ზე შეცვლილი ველები ბაზაში იწერება. გამოდევნილი ობიექტის შემდგომი
+ცვლილება აღარ აისახება, ამიტომ გრძელვადიანი ცვლილებისთვის save(song).
+"""
+import json
+import sqlite3
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+from operator import attrgetter
+
+from songs import Song, shared_instruments
+
+_BASE_FIELDS = ("song_id", "title", "artist", "_duration", "play_count", "total_rating", "rating_count")
+_COLUMNS = "song_id, kind, title, artist, duration, play_count, total_rating, rating_count, extra"
+"""UPSERT ინარჩუნებს rowid-ს (REPLACE წაშლიდა და ბოლოში ჩასვამდა), ანუ ჩასმის რიგსაც"""
+_UPSERT = (f"INSERT INTO songs ({_COLUMNS}) VALUES (?,?,?,?,?,?,?,?,?) ON CONFLICT(song_id) DO UPDATE SET "
+           + ", ".join(f"{name} = excluded.{name}" for name in _COLUMNS.split(", ")[1:]))
+
+
+def _extra_fields(song_type) -> tuple:
+    """ჟანრის __slots__ ველები (Song-ის საერთო ველების გარდა)"""
+    names = []
+    for cls in reversed(song_type.__mro__):
+        if cls is not Song and issubclass(cls, Song):
+            names.extend(cls.__dict__.get("__slots__", ()))
+    return tuple(names)
+
+
+class SongCatalog(Mapping):
+    def __init__(self, path: str = ":memory:", cache_size: int = 10_000, batch_size: int = 500):
+        if cache_size < 1:
+            raise ValueError("cache_size უნდა იყოს დადებითი")
+        self.path = path
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self.writes = 0
+        self._cache = OrderedDict()
+        """song_id -> ველების მნიშვნელობები ჩატვირთვისას, გამოდევნისას შესადარებლად (JSON-ის გარეშე)"""
+        self._loaded = {}
+        self._extra = {}
+        self._fields = {}
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS songs (song_id TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+            "title TEXT, artist TEXT, duration INTEGER, play_count INTEGER, total_rating REAL, "
+            "rating_count INTEGER, extra TEXT)")
+        self._count = self._db.execute("SELECT COUNT(*) FROM songs").fetchone()[0]
+
+    def __enter__(self) -> "SongCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _extra_names(self, song_type) -> tuple:
+        names = self._extra.get(song_type)
+        if names is None:
+            names = self._extra[song_type] = _extra_fields(song_type)
+        return names
+
+    def _state(self, song: Song) -> tuple:
+        fields = self._fields.get(type(song))
+        if fields is None:
+            fields = self._fields[type(song)] = attrgetter(*_BASE_FIELDS, *self._extra_names(type(song)))
+        return fields(song)
+
+    def _row(self, song: Song) -> tuple:
+        extra = {name: getattr(song, name) for name in self._extra_names(type(song))}
+        return (song.song_id, type(song).__name__, song.title, song.artist, song.duration,
+                song.play_count, song.total_rating, song.rating_count,
+                json.dumps(extra, ensure_ascii=False) if extra else None)
+
+    def _song(self, row: tuple) -> Song:
+        song_id, kind, title, artist, duration, play_count, total_rating, rating_count, extra = row
+        song_type = Song._genres.get(kind, Song)
+        song = song_type.__new__(song_type)
+        song._system = None
+        song._index = None
+        for name, value in zip(_BASE_FIELDS, (song_id, title, sys.intern(artist), duration,
+                                               play_count, total_rating, rating_count)):
+            setattr(song, name, value)
+        for name, value in (json.loads(extra) if extra else {}).items():
+            if name == "instruments":
+                value = shared_instruments(value)
+            elif isinstance(value, str):
+                value = sys.intern(value)
+            setattr(song, name, value)
+        return song
+
+    def _remember(self, song: Song) -> None:
+        cache = self._cache
+        cache[song.song_id] = song
+        self._loaded[song.song_id] = self._state(song)
+        while len(cache) > self.cache_size:
+            self._evict()
+
+    def _evict(self) -> None:
+        song_id, song = self._cache.popitem(last=False)
+        if self._state(song) != self._loaded.pop(song_id):
+            self._write([self._row(song)])
+
+    def _write(self, rows: list) -> None:
+        self._db.executemany(_UPSERT, rows)
+        self.writes += len(rows)
+
+    def add(self, song: Song) -> None:
+        self.add_many((song,))
+
+    def add_many(self, songs) -> None:
+        """ახალი ან შეცვლილი სიმღერები batch_size-ის ზომის INSERT-ებით"""
+        batch = []
+        for song in songs:
+            batch.append(self._row(song))
+            if len(batch) >= self.batch_size:
+                self._add_rows(batch)
+                batch = []
+        if batch:
+            self._add_rows(batch)
+
+    def _add_rows(self, rows: list) -> None:
+        new = len(rows) - self._existing([row[0] for row in rows])
+        for row in rows:
+            self._cache.pop(row[0], None)
+            self._loaded.pop(row[0], None)
+        self._write(rows)
+        self._count += new
+
+    def _existing(self, song_ids: list) -> int:
+        placeholders = ",".join("?" * len(song_ids))
+        self.queries += 1
+        return self._db.execute(f"SELECT COUNT(*) FROM songs WHERE song_id IN ({placeholders})",
+                                song_ids).fetchone()[0]
+
+    def __setitem__(self, song_id: str, song: Song) -> None:
+        if song_id != song.song_id:
+            raise KeyError(f"გასაღები {song_id} არ ემთხვევა სიმღერის ID-ს {song.song_id}")
+        self.add(song)
+
+    def __delitem__(self, song_id: str) -> None:
+        self._cache.pop(song_id, None)
+        self._loaded.pop(song_id, None)
+        deleted = self._db.execute("DELETE FROM songs WHERE song_id = ?", (song_id,)).rowcount
+        if not deleted:
+            raise KeyError(song_id)
+        self._count -= 1
+
+    def save(self, song: Song) -> None:
+        """ცვლილების ჩაწერა მაშინვე (მაგ. ქეშიდან უკვე გამოდევნილი ობიექტისთვის)"""
+        self._write([self._row(song)])
+        if song.song_id in self._loaded:
+            self._loaded[song.song_id] = self._state(song)
+
+    def flush(self) -> None:
+        """ქეშში შეცვლილი სიმღერების ჩაწერა და commit"""
+        changed = []
+        for song_id, song in self._cache.items():
+            state = self._state(song)
+            if state != self._loaded[song_id]:
+                changed.append(self._row(song))
+                self._loaded[song_id] = state
+        if changed:
+            self._write(changed)
+        self._db.commit()
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    def __getitem__(self, song_id: str) -> Song:
+        song = self.get(song_id)
+        if song is None:
+            raise KeyError(song_id)
+        return song
+
+    def get(self, song_id: str, default=None):
+        cache = self._cache
+        song = cache.get(song_id)
+        if song is not None:
+            self.hits += 1
+            cache.move_to_end(song_id)
+            return song
+        self.misses += 1
+        self.queries += 1
+        row = self._db.execute(f"SELECT {_COLUMNS} FROM songs WHERE song_id = ?", (song_id,)).fetchone()
+        if row is None:
+            return default
+        song = self._song(row)
+        self._remember(song)
+        return song
+
+    def __contains__(self, song_id) -> bool:
+        if song_id in self._cache:
+            return True
+        self.queries += 1
+        return self._db.execute("SELECT 1 FROM songs WHERE song_id = ?", (song_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        """ID-ები ჩასმის რიგით, გვერდებად rowid-ით, რომ ღია კურსორი ჩაწერას არ ეჯახებოდეს"""
+        last = 0
+        while True:
+            self.queries += 1
+            rows = self._db.execute("SELECT rowid, song_id FROM songs WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                                    (last, self.batch_size)).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            for _, song_id in rows:
+                yield song_id
+
+    def prefetch(self, song_ids) -> dict:
+        """{song_id: Song} ერთი IN (...) მოთხოვნით batch_size ID-ზე; ნაპოვნი სიმღერები ქეშშიც ხვდება.
+
+        შედეგი ციკლისთვისაა: თუ ID-ები ქეშზე მეტია, ადრე ჩატვირთული ობიექტები
+        ქეშიდან გამოდევნილია და მათი ცვლილება save()-ს საჭიროებს.
+        """
+        found = {}
+        missing = []
+        cache = self._cache
+        for song_id in song_ids:
+            song = cache.get(song_id)
+            if song is not None:
+                self.hits += 1
+                cache.move_to_end(song_id)
+                found[song_id] = song
+            elif song_id not in found:
+                missing.append(song_id)
+        self.misses += len(missing)
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            self.queries += 1
+            rows = self._db.execute(
+                f"SELECT {_COLUMNS} FROM songs WHERE song_id IN ({','.join('?' * len(batch))})", batch)
+            for row in rows:
+                song = self._song(row)
+                self._remember(song)
+                found[song.song_id] = song
+        return found
+
+    def values(self):
+        """ყველა სიმღერა batch-ებად; ქეშში მყოფისთვის ბრუნდება იგივე ობიექტი"""
+        batch = []
+        for song_id in self:
+            batch.append(song_id)
+            if len(batch) == self.batch_size:
+                found = self.prefetch(batch)
+                yield from (found[song_id] for song_id in batch if song_id in found)
+                batch = []
+        if batch:
+            found = self.prefetch(batch)
+            yield from (found[song_id] for song_id in batch if song_id in found)
+
+    def items(self):
+        for song in self.values():
+            yield song.song_id, song
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def cache_info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "queries": self.queries, "writes": self.writes,
+                "cached": len(self._cache), "cache_size": self.cache_size, "songs": self._count}
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.queries = self.writes = 0
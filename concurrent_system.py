@@ -0,0 +1,170 @@
+import threading
+import time
+
+from streaming_system import StreamingSystem
+
+
+class _WriteGuard:
+    """ჩამწერის სექცია: RLock + ვერსია, რომელიც ჩაწერისას კენტია (seqlock)"""
+    __slots__ = ("_system",)
+
+    def __init__(self, system):
+        self._system = system
+
+    def __enter__(self):
+        system = self._system
+        system._lock.acquire()
+        if system._depth == 0:
+            system._version += 1
+        system._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        system = self._system
+        system._depth -= 1
+        if system._depth == 0:
+            system._version += 1
+        system._lock.release()
+        return False
+
+
+class ConcurrentStreamingSystem(StreamingSystem):
+    """ნაკადებისთვის უსაფრთხო StreamingSystem.
+
+    ყველა ცვლილება (მოსმენა, შეფასება, სიმღერის/მომხმარებლის დამატება,
+    ingest-ის batch, პრემიუმი, ფლეილისტები) სრულდება ერთ ჩამწერ სექციაში, ამიტომ ჟურნალი, მთვლელები
+    და ინდექსები ერთმანეთს ყოველთვის ემთხვევა. სისტემის გარეთ მყოფი სიმღერების
+    მთვლელებს იცავს ზოლოვანი ბლოკები (songs.counter_lock), ID-ებს - ID ბლოკი.
+
+    მკითხველი (read, generate_report) ჩამწერს არ ბლოკავს: ის ითვლის ბლოკის
+    გარეშე და შედეგს იღებს, თუ ამ დროს ვერსია არ შეცვლილა. რამდენიმე
+    წარუმატებელი ცდის შემდეგ ბლოკს იღებს, რომ დატვირთვისას არ დაშიმშილდეს.
+    """
+
+    READ_RETRIES = 3
+
+    def __init__(self, platform_name: str):
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._version = 0
+        self._writer = _WriteGuard(self)
+        super().__init__(platform_name)
+        self.events.lock = self._lock
+
+    def _song_lock(self, song):
+        return self._writer
+
+    def _user_lock(self, user):
+        return self._writer
+
+    def read(self, func):
+        for _ in range(self.READ_RETRIES):
+            version = self._version
+            if version % 2 == 0:
+                try:
+                    result = func(self)
+                except (RuntimeError, KeyError, IndexError, ValueError):
+                    """მაგ. "dictionary changed size during iteration" ჩაწერის პარალელურად"""
+                    pass
+                else:
+                    if self._version == version:
+                        return result
+            time.sleep(0)
+        with self._lock:
+            return func(self)
+
+    def add_song(self, song) -> None:
+        with self._writer:
+            super().add_song(song)
+
+    def add_user(self, user) -> None:
+        with self._writer:
+            super().add_user(user)
+
+    def remove_song(self, song_id: str) -> None:
+        with self._writer:
+            super().remove_song(song_id)
+
+    def _listen(self, user, song, timestamp: int) -> None:
+        with self._writer:
+            super()._listen(user, song, timestamp)
+
+    def _apply_batch(self, batch: list, report) -> None:
+        with self._writer:
+            super()._apply_batch(batch, report)
+
+    def _apply_ratings(self, batch: list, report) -> None:
+        with self._writer:
+            super()._apply_ratings(batch, report)
+
+    def _apply_playlist_adds(self, batch: list, report) -> None:
+        with self._writer:
+            super()._apply_playlist_adds(batch, report)
+
+    def _on_playlist_add(self, playlist, song_id: str) -> None:
+        with self._writer:
+            super()._on_playlist_add(playlist, song_id)
+
+    def _on_playlist_remove(self, playlist, song_id: str) -> None:
+        with self._writer:
+            super()._on_playlist_remove(playlist, song_id)
+
+    def enable_sketches(self, *args, **kwargs):
+        with self._writer:
+            return super().enable_sketches(*args, **kwargs)
+
+    def enable_recommendations(self, *args, **kwargs):
+        with self._writer:
+            return super().enable_recommendations(*args, **kwargs)
+
+    def search_songs(self, query: str, limit: int = 10, prefix: bool = True) -> list:
+        search = super().search_songs
+        return self.read(lambda system: search(query, limit, prefix))
+
+    def similar_songs(self, song_id: str, limit: int = 10) -> list:
+        """რეკომენდაციების ქეში კითხვისასაც იცვლება, ამიტომ ბლოკის ქვეშ"""
+        with self._lock:
+            return super().similar_songs(song_id, limit)
+
+    def recommend_songs(self, user_id: str, limit: int = 10) -> list:
+        with self._lock:
+            return super().recommend_songs(user_id, limit)
+
+    def enable_metrics(self, *args, **kwargs):
+        with self._writer:
+            return super().enable_metrics(*args, **kwargs)
+
+    def disable_metrics(self) -> None:
+        with self._writer:
+            super().disable_metrics()
+
+    def set_rating_prior(self, prior: float = 3.0, min_votes: int = 5) -> None:
+        with self._writer:
+            super().set_rating_prior(prior, min_votes)
+
+    def rescore_song(self, song_id: str) -> None:
+        with self._writer:
+            super().rescore_song(song_id)
+
+    def _wrapped_buckets(self, year: int, shard_count: int) -> tuple:
+        """მხოლოდ შარდების აწყობა ბლოკის ქვეშ, worker-ები მის გარეშე მუშაობენ"""
+        with self._writer:
+            return super()._wrapped_buckets(year, shard_count)
+
+    def _refresh_report(self):
+        """სექციები ითვლება read-ით, ქეშში ჩაწერა კი ჩამწერის ბლოკის ქვეშ,
+        რადგან commit ასუფთავებს _listened-ს, რომელსაც მოსმენები ავსებს"""
+        computed = self.read(self._report.compute)
+        with self._lock:
+            self._report.commit(computed)
+            return self._report.model()
+
+    def save_snapshot(self, path: str) -> None:
+        with self._lock:
+            super().save_snapshot(path)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "ConcurrentStreamingSystem":
+        system = super().load_snapshot(path)
+        system.events.lock = system._lock
+        return system
@@ -0,0 +1,284 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from contextlib import nullcontext
+from datetime import date, datetime, time
+
+
+def to_timestamp(value) -> int:
+    """epoch წამები int/float, date, datetime ან ISO სტრიქონიდან"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime.combine(value, time()).timestamp())
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def listen_timestamp(listen_date, now: datetime = None) -> int:
+    """მოსმენის დრო: თარიღს (მაგ. "2025-01-10") ემატება მიმდინარე საათი.
+
+    სრული ISO თარიღი-დრო უცვლელად ინახება, არასწორი ან ცარიელი მნიშვნელობისას
+    გამოიყენება მიმდინარე დრო.
+    """
+    now = now or datetime.now()
+    if isinstance(listen_date, datetime):
+        return int(listen_date.timestamp())
+    if isinstance(listen_date, date):
+        return int(datetime.combine(listen_date, now.time()).timestamp())
+    try:
+        moment = datetime.fromisoformat(listen_date)
+    except (TypeError, ValueError):
+        return int(now.timestamp())
+    if len(listen_date) <= 10:
+        moment = datetime.combine(moment.date(), now.time())
+    return int(moment.timestamp())
+
+
+def writable(column) -> array:
+    """mmap-იდან წაკითხული memoryview-ს ასლი array-ში, პირველ ჩაწერამდე"""
+    if isinstance(column, array):
+        return column
+    copy = array(column.format)
+    copy.frombytes(column.cast("B"))
+    return copy
+
+
+def wrapped_window(year: int, month: int = None, day: int = None) -> tuple:
+    """[start, end) ფანჯარა წლისთვის, თვისთვის ან დღისთვის"""
+    if day is not None:
+        start = date(year, month, day)
+        end = date.fromordinal(start.toordinal() + 1)
+    elif month is not None:
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    else:
+        start = date(year, 1, 1)
+        end = date(year + 1, 1, 1)
+    return to_timestamp(start), to_timestamp(end)
+
+
+def month_windows(start: int, end: int):
+    """[start, end) შუალედის დაყოფა კალენდარულ თვეებად: ("YYYY-MM", start, end)"""
+    current = datetime.fromtimestamp(start)
+    year, month = current.year, current.month
+    while True:
+        month_start, month_end = wrapped_window(year, month)
+        if month_start >= end:
+            return
+        yield f"{year}-{month:02d}", max(month_start, start), min(month_end, end)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class TimeIndex:
+    """ჟურნალის პოზიციები (დრო, პოზიცია)-ს მიხედვით დალაგებული, bisect-ისთვის.
+
+    დროში მიმდევრობით მოსული მოვლენა უბრალოდ ემატება ბოლოში, დანარჩენი
+    გროვდება და შემდეგ მოთხოვნაზე ერთი merge-ით ერწყმის.
+    """
+
+    def __init__(self, log, positions=(), presorted=None):
+        self._log = log
+        self._sorted = presorted if presorted is not None else array("I", sorted(positions, key=self._key))
+        self._pending = []
+
+    def _key(self, position: int) -> tuple:
+        return (self._log.timestamp[position], position)
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+
+    def add(self, position: int) -> None:
+        ordered = self._sorted = writable(self._sorted)
+        timestamps = self._log.timestamp
+        if not self._pending and (not ordered or timestamps[position] >= timestamps[ordered[-1]]):
+            ordered.append(position)
+        else:
+            self._pending.append(position)
+
+    def _flush(self) -> None:
+        """კითხვისას ხდება, ამიტომ ჟურნალის ბლოკის ქვეშ, რომ პარალელური add არ დაიკარგოს"""
+        if not self._pending:
+            return
+        with self._log.lock:
+            if not self._pending:
+                return
+            pending = sorted(self._pending, key=self._key)
+            self._sorted = array("I", heapq.merge(self._sorted, pending, key=self._key))
+            self._pending = []
+
+    def span(self, start: int, end: int) -> tuple:
+        """[start, end) ფანჯრის საზღვრები დალაგებულ პოზიციებში, O(log N)"""
+        self._flush()
+        key = self._log.timestamp.__getitem__
+        return (bisect_left(self._sorted, start, key=key),
+                bisect_left(self._sorted, end, key=key))
+
+    def between(self, start: int, end: int) -> array:
+        lo, hi = self.span(start, end)
+        return self._sorted[lo:hi]
+
+    def sorted_positions(self):
+        self._flush()
+        return self._sorted
+
+
+class EventLog:
+    """მოსმენების სვეტური ჟურნალი: სიმღერის ინდექსი, მომხმარებლის ინდექსი, epoch დრო.
+
+    ყოველი მომხმარებლისთვის ინახება მისი მოვლენების პოზიციები, რომ
+    მომხმარებლის ისტორია მთელი ჟურნალის სკანირების გარეშე წაიკითხოს.
+    დროითი ინდექსი მთელ ჟურნალზე მუდმივად ახლდება, მომხმარებლის ინდექსი
+    კი პირველ მოთხოვნაზე იქმნება.
+
+    lock იცავს იმას, რასაც კითხვაც ცვლის (დროითი ინდექსის merge, მომხმარებლის
+    ინდექსის შექმნა); ConcurrentStreamingSystem მას ჩამწერის ბლოკს უყენებს.
+    """
+
+    lock = nullcontext()
+
+    def __init__(self):
+        self.song_index = array("I")
+        self.user_index = array("I")
+        self.timestamp = array("q")
+        self._by_user = []
+        self._time_index = TimeIndex(self)
+        self._user_time_index = {}
+        """სიმღერა -> პოზიციები, პირველ მოთხოვნაზე იქმნება (song_positions)"""
+        self._by_song = None
+        self._mapping = None
+
+    def __len__(self) -> int:
+        return len(self.song_index)
+
+    def add_user(self) -> int:
+        self._by_user.append(array("I"))
+        return len(self._by_user) - 1
+
+    def append(self, user_idx: int, song_idx: int, timestamp: int) -> int:
+        """ამატებს მოვლენას და აბრუნებს მის პოზიციას მომხმარებლის ისტორიაში"""
+        if self._mapping is not None:
+            self._detach_mapping()
+        positions = self._by_user[user_idx] = writable(self._by_user[user_idx])
+        position = len(self.song_index)
+        positions.append(position)
+        self.song_index.append(song_idx)
+        self.user_index.append(user_idx)
+        self.timestamp.append(timestamp)
+        self._time_index.add(position)
+        user_time_index = self._user_time_index.get(user_idx)
+        if user_time_index is not None:
+            user_time_index.add(position)
+        by_song = self._by_song
+        if by_song is not None:
+            song_positions = by_song.get(song_idx)
+            if song_positions is None:
+                song_positions = by_song[song_idx] = array("I")
+            song_positions.append(position)
+        return len(positions) - 1
+
+    @classmethod
+    def from_columns(cls, song_index, user_index, timestamp, by_user: list,
+                     time_sorted, mapping=None) -> "EventLog":
+        """ჟურნალი მზა სვეტებიდან (მაგ. mmap-ის memoryview-ები, ჩატვირთვა ზარმაცად)"""
+        log = cls()
+        log.song_index = song_index
+        log.user_index = user_index
+        log.timestamp = timestamp
+        log._by_user = by_user
+        log._time_index = TimeIndex(log, presorted=time_sorted)
+        log._mapping = mapping
+        return log
+
+    def _detach_mapping(self) -> None:
+        """პირველი ჩაწერისას სვეტები mmap-იდან array-ებში გადადის"""
+        self.song_index = writable(self.song_index)
+        self.user_index = writable(self.user_index)
+        self.timestamp = writable(self.timestamp)
+        self._mapping = None
+
+    def user_positions(self, user_idx: int) -> array:
+        return self._by_user[user_idx]
+
+    def song_positions(self, song_idx: int) -> array:
+        """სიმღერის მოვლენების პოზიციები ზრდადობით; ინდექსი ერთხელ იგება O(N)-ში
+        და შემდეგ append-ით ახლდება"""
+        by_song = self._by_song
+        if by_song is None:
+            by_song = {}
+            for position, idx in enumerate(self.song_index):
+                positions = by_song.get(idx)
+                if positions is None:
+                    positions = by_song[idx] = array("I")
+                positions.append(position)
+            self._by_song = by_song
+        return by_song.get(song_idx, array("I"))
+
+    def user_song_indexes(self, user_idx: int):
+        song_index = self.song_index
+        for position in self._by_user[user_idx]:
+            yield song_index[position]
+
+    def time_index(self, user_idx: int = None) -> TimeIndex:
+        if user_idx is None:
+            return self._time_index
+        index = self._user_time_index.get(user_idx)
+        if index is None:
+            with self.lock:
+                index = self._user_time_index.get(user_idx)
+                if index is None:
+                    index = TimeIndex(self, self._by_user[user_idx])
+                    self._user_time_index[user_idx] = index
+        return index
+
+    def between(self, start: int, end: int, user_idx: int = None) -> array:
+        """[start, end) ფანჯრის მოვლენების პოზიციები დროის მიხედვით, O(log N + k)"""
+        return self.time_index(user_idx).between(start, end)
+
+    def nbytes(self) -> int:
+        total = 0
+        for column in (self.song_index, self.user_index, self.timestamp):
+            total += column.itemsize * len(column)
+        for positions in self._by_user:
+            total += positions.itemsize * len(positions)
+        total += 4 * len(self._time_index)
+        for index in self._user_time_index.values():
+            total += 4 * len(index)
+        if self._by_song is not None:
+            total += 4 * len(self.song_index)
+        return total
+
+
+class ListeningHistoryView:
+    """მომხმარებლის ისტორია ჟურნალიდან, (song_id, "HH:MM:SS", "YYYY-MM-DD") ჩანაწერებით"""
+    __slots__ = ("_log", "_user_idx", "_song_ids")
+
+    def __init__(self, log: EventLog, user_idx: int, song_ids: list):
+        self._log = log
+        self._user_idx = user_idx
+        self._song_ids = song_ids
+
+    def __len__(self) -> int:
+        return len(self._log.user_positions(self._user_idx))
+
+    def _entry(self, position: int) -> tuple:
+        log = self._log
+        moment = datetime.fromtimestamp(log.timestamp[position])
+        return (self._song_ids[log.song_index[position]],
+                moment.strftime("%H:%M:%S"), moment.strftime("%Y-%m-%d"))
+
+    def __getitem__(self, item):
+        positions = self._log.user_positions(self._user_idx)
+        if isinstance(item, slice):
+            return [self._entry(position) for position in positions[item]]
+        return self._entry(positions[item])
+
+    def __iter__(self):
+        for position in self._log.user_positions(self._user_idx):
+            yield self._entry(position)
+
+    def song_ids(self):
+        song_ids = self._song_ids
+        for song_idx in self._log.user_song_indexes(self._user_idx):
+            yield song_ids[song_idx]
@@ -0,0 +1,40 @@
+class IdMap:
+    """გარე ID-ების ("S001", "U003") ორმხრივი რუკა მკვრივ მთელ ინდექსებზე.
+
+    სისტემის შიგნით ყველაფერი ინდექსებით მუშაობს, სტრიქონი საჭიროა მხოლოდ API-ის საზღვარზე.
+    """
+    __slots__ = ("_index", "_keys")
+
+    def __init__(self, keys=()):
+        self._index = {}
+        self._keys = []
+        for key in keys:
+            self.add(key)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, idx: int) -> str:
+        return self._keys[idx]
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def get(self, key, default=None):
+        return self._index.get(key, default)
+
+    def add(self, key) -> int:
+        """ახალი ინდექსი, key ამიერიდან მასზე მიუთითებს"""
+        idx = len(self._keys)
+        self._keys.append(key)
+        self._index[key] = idx
+        return idx
+
+    def index(self, key) -> int:
+        idx = self._index.get(key)
+        if idx is None:
+            idx = self.add(key)
+        return idx
@@ -0,0 +1,252 @@
+import csv
+import json
+from datetime import date as calendar_date, datetime
+from itertools import islice
+
+from event_log import listen_timestamp
+
+"""უარყოფის მიზეზები"""
+MALFORMED = "malformed_record"
+INVALID_DATE = "invalid_date"
+UNKNOWN_USER = "unknown_user"
+UNKNOWN_SONG = "unknown_song"
+RATING_TYPE = "rating_not_number"
+RATING_RANGE = "rating_out_of_range"
+MISSING_PLAYLIST = "missing_playlist"
+DUPLICATE_IN_PLAYLIST = "duplicate_in_playlist"
+_SKIP_REASONS = (MALFORMED, INVALID_DATE, UNKNOWN_USER, UNKNOWN_SONG, MISSING_PLAYLIST, DUPLICATE_IN_PLAYLIST)
+_RATING_REASONS = (RATING_TYPE, RATING_RANGE)
+
+
+class RejectLog:
+    """უარყოფილი ჩანაწერები მიზეზით: რაოდენობა და პირველი sample_size ჩანაწერი.
+    არაფერს ბეჭდავს, ანგარიშს გამომძახებელი თავად წყვეტს."""
+
+    def __init__(self, sample_size: int = 5):
+        self.sample_size = sample_size
+        self.counts = {}
+        self.samples = {}
+
+    def reject(self, reason: str, record) -> None:
+        count = self.counts.get(reason, 0)
+        self.counts[reason] = count + 1
+        if count < self.sample_size:
+            self.samples.setdefault(reason, []).append(record)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def count(self, *reasons) -> int:
+        return sum(self.counts.get(reason, 0) for reason in reasons)
+
+    def to_dict(self) -> dict:
+        return {"total": self.total,
+                "reasons": {reason: {"count": count, "samples": [repr(record) for record in self.samples[reason]]}
+                            for reason, count in sorted(self.counts.items(), key=lambda item: -item[1])}}
+
+    def __str__(self) -> str:
+        if not self.counts:
+            return "შეცდომები არ არის"
+        return ", ".join(f"{reason}: {count:,}"
+                         for reason, count in sorted(self.counts.items(), key=lambda item: -item[1]))
+
+
+class IngestReport:
+    """მასობრივი ჩატვირთვის შედეგი"""
+
+    def __init__(self, sample_size: int = 5):
+        self.events = 0
+        self.listens = 0
+        self.ratings = 0
+        self.playlist_adds = 0
+        self.errors = RejectLog(sample_size)
+        self.seconds = 0.0
+
+    @property
+    def skipped(self) -> int:
+        """მთლიანად გამოტოვებული ჩანაწერები"""
+        return self.errors.count(*_SKIP_REASONS)
+
+    @property
+    def invalid_ratings(self) -> int:
+        """უარყოფილი რეიტინგები (მოვლენის მოსმენა მაინც ითვლება)"""
+        return self.errors.count(*_RATING_REASONS)
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        added = f"{self.playlist_adds:,} ფლეილისტში დამატება, " if self.playlist_adds else ""
+        return (f"ჩაიტვირთა {self.events:,} მოვლენა ({self.listens:,} მოსმენა, "
+                f"{self.ratings:,} შეფასება, {added}გამოტოვებული: {self.skipped:,}, "
+                f"არასწორი რეიტინგი: {self.invalid_ratings:,}) - "
+                f"{self.events_per_second:,.0f} მოვლენა/წმ")
+
+
+def rating_error(rating):
+    """უარყოფის მიზეზი ან None, თუ რეიტინგი 1.0-დან 5.0-მდეა"""
+    try:
+        if 1.0 <= rating <= 5.0:
+            return None
+    except TypeError:
+        return RATING_TYPE
+    return RATING_RANGE
+
+
+def validate_events(batch: list, users: dict, songs: dict, errors: RejectLog,
+                    now: datetime = None) -> list:
+    """ვალიდაციის ეტაპი: (user, song, timestamp, rating) სწორი მოვლენებისთვის.
+
+    უცნობი მომხმარებლის ან სიმღერის მოვლენა უარიყოფა, ისევე როგორც თარიღი,
+    რომელიც არც სტრიქონია და არც date/datetime; თარიღი აქვე გადაიყვანება
+    listen_timestamp-ით, ასე რომ ჩაწერის ეტაპს ვეღარაფერი ჩააგდებს. არასწორი
+    რეიტინგი უარიყოფა, მაგრამ მოსმენა რჩება rating=None-ით.
+    """
+    now = now or datetime.now()
+    valid = []
+    append = valid.append
+    users_get = users.get
+    songs_get = songs.get
+    stamps = {}
+    for record in batch:
+        try:
+            user_id, song_id, date, rating = record
+            user = users_get(user_id)
+            song = songs_get(song_id)
+        except (TypeError, ValueError):
+            errors.reject(MALFORMED, record)
+            continue
+        if user is None:
+            errors.reject(UNKNOWN_USER, record)
+            continue
+        if song is None:
+            errors.reject(UNKNOWN_SONG, record)
+            continue
+        if not isinstance(date, (str, calendar_date)):
+            errors.reject(INVALID_DATE, record)
+            continue
+        timestamp = stamps.get(date)
+        if timestamp is None:
+            timestamp = stamps[date] = listen_timestamp(date, now)
+        if rating is not None:
+            reason = rating_error(rating)
+            if reason is not None:
+                errors.reject(reason, record)
+                rating = None
+        append((user, song, timestamp, rating))
+    return valid
+
+
+def validate_ratings(batch: list, users: dict, songs: dict, errors: RejectLog) -> list:
+    """(user, song, rating) სწორი შეფასებებისთვის; რეიტინგი აუცილებელია"""
+    valid = []
+    for record in batch:
+        try:
+            user_id, song_id, rating = record
+            user = users.get(user_id)
+            song = songs.get(song_id)
+        except (TypeError, ValueError):
+            errors.reject(MALFORMED, record)
+            continue
+        if user is None:
+            errors.reject(UNKNOWN_USER, record)
+        elif song is None:
+            errors.reject(UNKNOWN_SONG, record)
+        else:
+            reason = rating_error(rating)
+            if reason is None:
+                valid.append((user, song, rating))
+            else:
+                errors.reject(reason, record)
+    return valid
+
+
+def validate_playlist_adds(batch: list, users: dict, songs: dict, errors: RejectLog) -> list:
+    """(playlist, song) სწორი ჩანაწერებისთვის (user_id, playlist_name, song_id);
+    batch-ში განმეორებული სიმღერაც დუბლიკატად ითვლება"""
+    valid = []
+    seen = set()
+    for record in batch:
+        try:
+            user_id, playlist_name, song_id = record
+            user = users.get(user_id)
+            song = songs.get(song_id)
+        except (TypeError, ValueError):
+            errors.reject(MALFORMED, record)
+            continue
+        if user is None:
+            errors.reject(UNKNOWN_USER, record)
+            continue
+        try:
+            playlist = user.playlists.get(playlist_name)
+        except TypeError:
+            errors.reject(MALFORMED, record)
+            continue
+        if playlist is None:
+            errors.reject(MISSING_PLAYLIST, record)
+        elif song is None:
+            errors.reject(UNKNOWN_SONG, record)
+        elif song_id in playlist or (id(playlist), song_id) in seen:
+            errors.reject(DUPLICATE_IN_PLAYLIST, record)
+        else:
+            seen.add((id(playlist), song_id))
+            valid.append((playlist, song))
+    return valid
+
+
+def iter_batches(events, batch_size: int):
+    """მოვლენების დაყოფა batch_size ზომის სიებად"""
+    if batch_size < 1:
+        raise ValueError("batch_size უნდა იყოს დადებითი")
+    events = iter(events)
+    while True:
+        batch = list(islice(events, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _parse_rating(value):
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+"""მკითხველები არ ჩერდებიან გაფუჭებულ ხაზზე: ის ერთელემენტიან tuple-ად გადაეცემა
+validate_events-ს, რომელიც მას MALFORMED-ად აღრიცხავს"""
+
+
+def read_csv_events(path: str):
+    """CSV: user_id,song_id,date,rating (სათაური და რეიტინგი არასავალდებულოა)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if not row or row[0] == "user_id":
+                continue
+            if len(row) < 2:
+                yield (row,)
+                continue
+            rating = row[3] if len(row) > 3 else None
+            yield row[0], row[1], row[2] if len(row) > 2 else "", _parse_rating(rating)
+
+
+def read_jsonl_events(path: str):
+    """JSONL: {"user_id": ..., "song_id": ..., "date": ..., "rating": ...}"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield (line.rstrip("\n"),)
+                continue
+            if not isinstance(record, dict):
+                yield (record,)
+                continue
+            yield (record.get("user_id"), record.get("song_id"), record.get("date", ""),
+                   _parse_rating(record.get("rating")))
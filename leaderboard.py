@@ -0,0 +1,282 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from operator import attrgetter
+
+
+class GroupedLeaderboard:
+    """სიმღერები score(song)-ის კლებით, თანაბრობისას დამატების რიგით.
+
+    სიმღერები ინახება ჯგუფებად (ქულა -> დალაგებული rank-ები), ქულები კი
+    დალაგებულ სიაში. ქულის ცვლილება სიმღერას მეზობელ ჯგუფში გადაიტანს
+    (მოსმენისას ჯგუფი თითქმის ყოველთვის არსებობს), TOP-K იკითხება O(K)-ში.
+    """
+
+    def __init__(self, score):
+        self._score = score
+        self._groups = {}
+        self._counts = []
+        self._count_of = {}
+        self._songs = {}
+
+    def __len__(self) -> int:
+        return len(self._songs)
+
+    def add(self, song, rank: int) -> None:
+        self._songs[rank] = song
+        self._insert(rank, self._score(song))
+
+    def remove(self, rank: int) -> None:
+        if rank not in self._songs:
+            return
+        self._discard(rank, self._count_of.pop(rank))
+        del self._songs[rank]
+
+    def update(self, rank: int) -> None:
+        old_count = self._count_of.get(rank)
+        if old_count is None:
+            return
+        new_count = self._score(self._songs[rank])
+        if new_count == old_count:
+            return
+        self._discard(rank, old_count)
+        self._insert(rank, new_count)
+
+    def top(self, limit: int) -> list:
+        if limit < 0:
+            return self.top(len(self._songs))[:limit]
+        return list(islice(self.ranked(), limit))
+
+    def ranked(self):
+        """სიმღერები რიგით, ზარმაცად: პირველი K-ს წაკითხვა O(K)-ია"""
+        for i in range(len(self._counts) - 1, -1, -1):
+            for rank in self._groups[self._counts[i]]:
+                yield self._songs[rank]
+
+    def keys(self):
+        """(-ქულა, rank) იმავე რიგით, heapq.merge-ისთვის"""
+        for i in range(len(self._counts) - 1, -1, -1):
+            count = self._counts[i]
+            for rank in self._groups[count]:
+                yield -count, rank
+
+    def _insert(self, rank: int, count) -> None:
+        self._count_of[rank] = count
+        group = self._groups.get(count)
+        if group is None:
+            self._groups[count] = [rank]
+            insort(self._counts, count)
+        else:
+            insort(group, rank)
+
+    def _discard(self, rank: int, count) -> None:
+        group = self._groups[count]
+        del group[bisect_left(group, rank)]
+        if not group:
+            del self._groups[count]
+            del self._counts[bisect_left(self._counts, count)]
+
+
+class PlayCountLeaderboard(GroupedLeaderboard):
+    """სიმღერები მოსმენების მიხედვით; მოსმენა play_count-ს 1-ით ზრდის, ანუ სიმღერა მეზობელ ჯგუფში გადადის"""
+
+    def __init__(self):
+        super().__init__(attrgetter("play_count"))
+
+
+class SortedKeys:
+    """დალაგებული გასაღებები ბლოკებად (თითო არაუმეტეს 2 * load): ჩასმა და წაშლა
+    O(log n + load) არის, ერთ დიდ სიაში insort-ის O(n) გადაწევის ნაცვლად,
+    პირველი K კი იკითხება O(K)-ში."""
+
+    def __init__(self, load: int = 512):
+        self._load = load
+        self._blocks = []
+        self._maxes = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        for block in self._blocks:
+            yield from block
+
+    def add(self, key) -> None:
+        blocks, maxes = self._blocks, self._maxes
+        self._len += 1
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+            return
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            i -= 1
+            blocks[i].append(key)
+            maxes[i] = key
+        else:
+            insort(blocks[i], key)
+        block = blocks[i]
+        if len(block) > 2 * self._load:
+            half = block[self._load:]
+            del block[self._load:]
+            maxes[i] = block[-1]
+            blocks.insert(i + 1, half)
+            maxes.insert(i + 1, half[-1])
+
+    def remove(self, key) -> None:
+        """key უნდა არსებობდეს"""
+        blocks, maxes = self._blocks, self._maxes
+        i = bisect_left(maxes, key)
+        block = blocks[i]
+        del block[bisect_left(block, key)]
+        self._len -= 1
+        if not block:
+            del blocks[i]
+            del maxes[i]
+        else:
+            maxes[i] = block[-1]
+
+    def first(self, limit: int) -> list:
+        return list(islice(self, limit))
+
+
+class RatingLeaderboard:
+    """შეფასებული სიმღერები ბაიესური ქულით, თანაბრობისას დამატების რიგით.
+
+    ქულა = (prior * min_votes + ჯამი) / (min_votes + შეფასებები): ცოტა
+    შეფასების მქონე სიმღერა prior-თან ახლოსაა, ბევრისა - საკუთარ საშუალოსთან.
+    min_votes=0 უბრალო საშუალოა. გასაღებები (-ქულა, rank) SortedKeys-შია, TOP-K არის O(K).
+    """
+
+    def __init__(self, prior: float = 3.0, min_votes: int = 5):
+        self.prior = prior
+        self.min_votes = min_votes
+        self._keys = SortedKeys()
+        self._key_of = {}
+        self._songs = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def score(self, song) -> float:
+        return (self.prior * self.min_votes + song.total_rating) / (self.min_votes + song.rating_count)
+
+    def configure(self, prior: float, min_votes: int) -> None:
+        """ახალი prior/min_votes და ყველა გასაღების თავიდან აგება, O(n log n)"""
+        if min_votes < 0:
+            raise ValueError("min_votes არ შეიძლება იყოს უარყოფითი")
+        self.prior = prior
+        self.min_votes = min_votes
+        self._keys = SortedKeys()
+        self._key_of = {}
+        for rank in self._songs:
+            self.update(rank)
+
+    def add(self, song, rank: int) -> None:
+        self._songs[rank] = song
+        self.update(rank)
+
+    def remove(self, rank: int) -> None:
+        if rank not in self._songs:
+            return
+        key = self._key_of.pop(rank, None)
+        if key is not None:
+            self._keys.remove(key)
+        del self._songs[rank]
+
+    def update(self, rank: int) -> None:
+        song = self._songs.get(rank)
+        if song is None:
+            return
+        old_key = self._key_of.get(rank)
+        new_key = (-self.score(song), rank) if song.rating_count > 0 else None
+        if new_key == old_key:
+            return
+        if old_key is not None:
+            self._keys.remove(old_key)
+        if new_key is None:
+            self._key_of.pop(rank, None)
+            return
+        self._key_of[rank] = new_key
+        self._keys.add(new_key)
+
+    def top(self, limit: int) -> list:
+        if limit < 0:
+            limit = max(0, len(self._keys) + limit)
+        return [self._songs[rank] for _, rank in self._keys.first(limit)]
+
+
+class ScoreLeaderboard:
+    """ჟანრის ქულის TOP სია მეორადი ინდექსით.
+
+    by - ველი (მაგ. "intensity_level", "era"), რომლის ყოველ მნიშვნელობას
+    საკუთარი GroupedLeaderboard აქვს: value=x იკითხება O(K)-ში, დიაპაზონი
+    (min_value/max_value) კი აერთიანებს შესაბამის სიებს heapq.merge-ით, O(K log L).
+    """
+
+    def __init__(self, score, by: str = None):
+        self._score = score
+        self._by = by
+        self._all = GroupedLeaderboard(score)
+        self._value_of = {}
+        self._by_value = {}
+        self._values = []
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def add(self, song, rank: int) -> None:
+        self._all.add(song, rank)
+        if self._by is not None:
+            self._add_to_value(song, rank, getattr(song, self._by))
+
+    def remove(self, rank: int) -> None:
+        self._all.remove(rank)
+        value = self._value_of.pop(rank, None)
+        if value is not None:
+            self._remove_from_value(rank, value)
+
+    def update(self, rank: int) -> None:
+        self._all.update(rank)
+        value = self._value_of.get(rank)
+        if value is None:
+            return
+        song = self._all._songs[rank]
+        new_value = getattr(song, self._by)
+        if new_value == value:
+            self._by_value[value].update(rank)
+        else:
+            self._remove_from_value(rank, value)
+            self._add_to_value(song, rank, new_value)
+
+    def _add_to_value(self, song, rank: int, value) -> None:
+        board = self._by_value.get(value)
+        if board is None:
+            board = self._by_value[value] = GroupedLeaderboard(self._score)
+            insort(self._values, value)
+        board.add(song, rank)
+        self._value_of[rank] = value
+
+    def _remove_from_value(self, rank: int, value) -> None:
+        board = self._by_value[value]
+        board.remove(rank)
+        if not len(board):
+            del self._by_value[value]
+            del self._values[bisect_left(self._values, value)]
+
+    def top(self, limit: int, value=None, min_value=None, max_value=None) -> list:
+        """პირველი limit სიმღერა; value, min_value და max_value ფილტრავს by ველით"""
+        filtered = value is not None or min_value is not None or max_value is not None
+        if filtered and self._by is None:
+            raise ValueError("ამ TOP სიას მეორადი ინდექსი არ აქვს")
+        if value is not None:
+            board = self._by_value.get(value)
+            return board.top(limit) if board is not None else []
+        if not filtered:
+            return self._all.top(limit)
+        start = 0 if min_value is None else bisect_left(self._values, min_value)
+        end = len(self._values) if max_value is None else bisect_right(self._values, max_value)
+        keys = heapq.merge(*(self._by_value[v].keys() for v in self._values[start:end]))
+        songs = self._all._songs
+        return [songs[rank] for _, rank in islice(keys, limit)]
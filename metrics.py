@@ -0,0 +1,295 @@
+"""ოპერაციების მეტრიკები: გამოძახებები, დრო (ჯამი და პერცენტილები) და დამუშავებული ელემენტები.
+
+ჩართვისას (StreamingSystem.enable_metrics) სისტემის ეგზემპლარზე მეთოდები
+იცვლება გამზომი შეფუთვით, User-ის მეთოდები კი კლასზე (USER_OPERATIONS);
+გამორთულისას კლასის მეთოდები უცვლელია და ხარჯი ნულია. პერცენტილები ითვლება reservoir-ის ნიმუშით (Algorithm R),
+ასე რომ მეხსიერება ოპერაციაზე ფიქსირებულია.
+"""
+import cProfile
+import io
+import json
+import pstats
+import random
+import threading
+import time
+from array import array
+
+from user import User
+
+"""(ატრიბუტი, მეტრიკის სახელი, დამუშავებული ელემენტები (system, args, result) -> int ან None)"""
+SYSTEM_OPERATIONS = (
+    ("add_song", "add_song", lambda system, args, result: 1),
+    ("add_user", "add_user", lambda system, args, result: 1),
+    ("remove_song", "remove_song",
+     lambda system, args, result: len(system.events.song_positions(system._song_ids.get(args[0])))),
+    ("_listen", "listen_to_song", lambda system, args, result: 1),
+    ("ingest_events", "ingest_events", lambda system, args, result: result.events),
+    ("_rate", "rate_song", lambda system, args, result: 1),
+    ("ingest_ratings", "ingest_ratings", lambda system, args, result: result.events),
+    ("ingest_playlist_adds", "ingest_playlist_adds", lambda system, args, result: result.events),
+    ("find_song", "find_song", lambda system, args, result: 1),
+    ("find_user", "find_user", lambda system, args, result: 1),
+    ("search_songs", "search_songs", lambda system, args, result: len(result)),
+    ("get_songs_by_genre", "get_songs_by_genre", lambda system, args, result: len(result)),
+    ("get_genre_count", "get_genre_count", lambda system, args, result: 1),
+    ("get_top_rated_songs", "get_top_rated_songs", lambda system, args, result: len(result)),
+    ("get_top_scored_songs", "get_top_scored_songs", lambda system, args, result: len(result)),
+    ("get_most_played_songs", "get_most_played_songs", lambda system, args, result: len(result)),
+    ("get_top_artists", "get_top_artists", None),
+    ("get_top_songs", "get_top_songs", None),
+    ("get_listening_time", "get_listening_time", None),
+    ("get_monthly_rollup", "get_monthly_rollup", None),
+    ("get_wrapped", "get_wrapped", None),
+    ("get_total_premium_revenue", "get_total_premium_revenue",
+     lambda system, args, result: len(system.users)),
+    ("get_most_popular_artist", "get_most_popular_artist", lambda system, args, result: 1),
+    ("_user_listening_time", "user.get_total_listening_time",
+     lambda system, args, result: len(system.events.user_positions(args[0]._system_index))),
+    ("save_snapshot", "save_snapshot", lambda system, args, result: len(system.events)),
+    ("generate_report", "generate_report",
+     lambda system, args, result: len(system.songs) + len(system.users)),
+    ("_refresh_report", "_refresh_report", None),
+    ("_render_report", "_render_report", lambda system, args, result: len(system.songs)),
+    ("_write_song_stats_section", "_write_song_stats_section", None),
+    ("_write_user_stats_section", "_write_user_stats_section", None),
+    ("_write_finance_section", "_write_finance_section", None),
+    ("_write_top_rated_section", "_write_top_rated_section", lambda system, args, result: len(args[1].top_rated)),
+    ("_write_most_played_section", "_write_most_played_section",
+     lambda system, args, result: len(args[1].most_played)),
+    ("_write_top_listeners_section", "_write_top_listeners_section",
+     lambda system, args, result: len(args[1].top_listeners)),
+    ("_write_pop_section", "_write_pop_section", lambda system, args, result: len(args[1].songs)),
+    ("_write_rock_section", "_write_rock_section", lambda system, args, result: len(args[1].songs)),
+    ("_write_classical_section", "_write_classical_section",
+     lambda system, args, result: len(args[1].songs)),
+)
+
+"""User-ის მეთოდები (ატრიბუტი, სახელი, ელემენტები (user, args, result)). listen_to_song,
+rate_song და get_total_listening_time უკვე იზომება სისტემის მეთოდებით (_listen, _rate,
+_user_listening_time), ამიტომ აქ აღარ არის"""
+USER_OPERATIONS = (
+    ("upgrade_to_premium", "user.upgrade_to_premium", lambda user, args, result: 1),
+    ("create_playlist", "user.create_playlist", lambda user, args, result: 1),
+    ("add_to_playlist", "user.add_to_playlist", lambda user, args, result: 1),
+    ("remove_from_playlist", "user.remove_from_playlist", lambda user, args, result: 1),
+    ("get_playlist_duration", "user.get_playlist_duration",
+     lambda user, args, result: len(user.playlists[args[0]])),
+    ("get_playlist_stats", "user.get_playlist_stats", lambda user, args, result: len(user.playlists[args[0]])),
+    ("get_listening_history", "user.get_listening_history",
+     lambda user, args, result: len(user.listening_history)),
+    ("get_favorite_artist", "user.get_favorite_artist", lambda user, args, result: 1),
+)
+
+"""User-ს __slots__ აქვს და ეგზემპლარზე მეთოდს ვერ შევცვლით: შეფუთვა კლასზე დგება,
+სანამ ერთ სისტემაზე მაინც ჩართულია მეტრიკები, და მომხმარებლის სისტემის Metrics-ში წერს"""
+_user_lock = threading.Lock()
+_user_originals = {}
+_user_instrumented = 0
+
+
+def _user_timed(attr: str, name: str, func, scanned):
+    clock = time.perf_counter
+
+    def wrapper(user, *args, **kwargs):
+        system = user._system
+        metrics = system._metrics if system is not None else None
+        if metrics is None:
+            return func(user, *args, **kwargs)
+        result = None
+        start = clock()
+        try:
+            result = func(user, *args, **kwargs)
+            return result
+        finally:
+            metrics._record(name, clock() - start, scanned, user, args, result)
+
+    wrapper.__wrapped__ = func
+    wrapper.__name__ = attr
+    return wrapper
+
+
+def _instrument_users() -> None:
+    global _user_instrumented
+    with _user_lock:
+        if _user_instrumented == 0:
+            for attr, name, scanned in USER_OPERATIONS:
+                func = _user_originals[attr] = User.__dict__[attr]
+                setattr(User, attr, _user_timed(attr, name, func, scanned))
+        _user_instrumented += 1
+
+
+def _uninstrument_users() -> None:
+    global _user_instrumented
+    with _user_lock:
+        _user_instrumented -= 1
+        if _user_instrumented == 0:
+            for attr, func in _user_originals.items():
+                setattr(User, attr, func)
+            _user_originals.clear()
+
+
+class OperationStats:
+    __slots__ = ("calls", "total", "max", "items", "_samples", "_sample_size", "_rng")
+
+    def __init__(self, sample_size: int, seed: int = 0):
+        self._sample_size = sample_size
+        self._rng = random.Random(seed)
+        self.clear()
+
+    def clear(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.items = None
+        self._samples = array("d")
+
+    def record(self, elapsed: float, items) -> None:
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if items is not None:
+            self.items = (self.items or 0) + items
+        if len(self._samples) < self._sample_size:
+            self._samples.append(elapsed)
+        else:
+            slot = self._rng.randrange(self.calls)
+            if slot < self._sample_size:
+                self._samples[slot] = elapsed
+
+    def snapshot(self) -> dict:
+        samples = sorted(self._samples)
+        last = len(samples) - 1
+
+        def at(p: float) -> float:
+            return samples[min(last, int(len(samples) * p / 100))] * 1e6 if samples else 0.0
+
+        return {
+            "calls": self.calls,
+            "total_s": self.total,
+            "mean_us": self.total / self.calls * 1e6 if self.calls else 0.0,
+            "p50_us": at(50),
+            "p90_us": at(90),
+            "p99_us": at(99),
+            "max_us": self.max * 1e6,
+            "items": self.items,
+        }
+
+
+def _scanned(scanned, owner, args, result):
+    if scanned is None:
+        return None
+    try:
+        return scanned(owner, args, result)
+    except (AttributeError, IndexError, KeyError, TypeError):
+        """მაგ. შეცდომით დასრულებული გამოძახება, result არის None"""
+        return None
+
+
+class Metrics:
+    """ერთი სისტემის მეტრიკები; profile_report (True ან ფაილის გზა) generate_report-ს cProfile-ით ზომავს"""
+
+    def __init__(self, sample_size: int = 1024, profile_report=None):
+        self.sample_size = sample_size
+        self.profile_report = profile_report
+        self.report_profile = None
+        self._operations = {}
+        self._lock = threading.Lock()
+        self._installed = []
+
+    def operation(self, name: str) -> OperationStats:
+        stats = self._operations.get(name)
+        if stats is None:
+            stats = self._operations[name] = OperationStats(self.sample_size, len(self._operations))
+        return stats
+
+    def timed(self, name: str, func, owner=None, scanned=None):
+        """func-ის შეფუთვა; scanned(owner, args, result) ითვლის დამუშავებულ ელემენტებს"""
+        stats = self.operation(name)
+        lock = self._lock
+        clock = time.perf_counter
+
+        def wrapper(*args, **kwargs):
+            result = None
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                elapsed = clock() - start
+                items = _scanned(scanned, owner, args, result)
+                with lock:
+                    stats.record(elapsed, items)
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _record(self, name: str, elapsed: float, scanned, owner, args, result) -> None:
+        """User-ის შეფუთვიდან; ოპერაცია instrument-ისას უკვე შექმნილია"""
+        items = _scanned(scanned, owner, args, result)
+        with self._lock:
+            self._operations[name].record(elapsed, items)
+
+    def instrument(self, system) -> None:
+        for attr, name, scanned in SYSTEM_OPERATIONS:
+            func = getattr(system, attr)
+            if attr == "generate_report":
+                func = self._profiled(func)
+            setattr(system, attr, self.timed(name, func, system, scanned))
+            self._installed.append(attr)
+        for _, name, _ in USER_OPERATIONS:
+            self.operation(name)
+        _instrument_users()
+
+    def uninstrument(self, system) -> None:
+        for attr in self._installed:
+            system.__dict__.pop(attr, None)
+        self._installed = []
+        _uninstrument_users()
+
+    def _profiled(self, func):
+        def run(*args, **kwargs):
+            if not self.profile_report:
+                return func(*args, **kwargs)
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                self.report_profile = profiler
+                if isinstance(self.profile_report, str):
+                    profiler.dump_stats(self.profile_report)
+        return run
+
+    def profile_text(self, limit: int = 25, sort: str = "cumulative") -> str:
+        """ბოლო generate_report-ის cProfile შედეგი ტექსტად"""
+        if self.report_profile is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self.report_profile, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: stats.snapshot() for name, stats in self._operations.items()
+                    if stats.calls}
+
+    def reset(self) -> None:
+        with self._lock:
+            for stats in self._operations.values():
+                stats.clear()
+        self.report_profile = None
+
+
+def format_json(snapshot: dict) -> str:
+    return json.dumps(snapshot, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def format_text(snapshot: dict) -> str:
+    """ცხრილი ჯამური დროის კლებით"""
+    lines = [f"{'ოპერაცია':30} {'calls':>9} {'total ms':>11} {'mean µs':>10} "
+             f"{'p50 µs':>10} {'p99 µs':>10} {'max µs':>10} {'items':>12}"]
+    for name, op in sorted(snapshot.items(), key=lambda item: item[1]["total_s"], reverse=True):
+        items = f"{op['items']:,}" if op["items"] is not None else "-"
+        lines.append(f"{name:30} {op['calls']:>9,} {op['total_s'] * 1e3:>11.2f} {op['mean_us']:>10.2f} "
+                     f"{op['p50_us']:>10.2f} {op['p99_us']:>10.2f} {op['max_us']:>10.2f} {items:>12}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,89 @@
+class Playlist:
+    """ფლეილისტი song_id-ების რიგით, დუბლიკატების გარეშე.
+
+    ჯამური ხანგრძლივობა, ჟანრებისა და არტისტების განაწილება ახლდება
+    დამატება/წაშლისას, ამიტომ მათი წაკითხვა O(1)-ია. ჯამებში ითვლება
+    მხოლოდ კატალოგში მყოფი სიმღერები (ჩანაწერი None ნიშნავს კატალოგის გარეთ).
+    სისტემაში მყოფი მომხმარებლისთვის ხანგრძლივობის ცვლილებასა და სიმღერის
+    კატალოგიდან წაშლას სისტემა აცნობებს.
+    """
+    __slots__ = ("name", "_songs", "_seconds", "_genre_mix", "_artist_mix")
+
+    def __init__(self, name: str, song_ids=()):
+        self.name = name
+        self._songs = {}
+        self._seconds = 0
+        self._genre_mix = {}
+        self._artist_mix = {}
+        for song_id in song_ids:
+            self._songs.setdefault(song_id, None)
+
+    def __len__(self) -> int:
+        return len(self._songs)
+
+    def __iter__(self):
+        return iter(self._songs)
+
+    def __contains__(self, song_id) -> bool:
+        return song_id in self._songs
+
+    @property
+    def duration(self) -> int:
+        return self._seconds
+
+    @property
+    def genre_mix(self) -> dict:
+        """{ჟანრი: სიმღერები}, არ შეცვალოთ"""
+        return self._genre_mix
+
+    @property
+    def artist_mix(self) -> dict:
+        """{არტისტი: სიმღერები}, არ შეცვალოთ"""
+        return self._artist_mix
+
+    def add(self, song) -> bool:
+        if song.song_id in self._songs:
+            return False
+        self._songs[song.song_id] = None
+        self._set_song(song.song_id, song)
+        return True
+
+    def remove(self, song_id: str) -> bool:
+        if song_id not in self._songs:
+            return False
+        self._set_song(song_id, None)
+        del self._songs[song_id]
+        return True
+
+    def _set_song(self, song_id: str, song) -> None:
+        """ჩანაწერის ჩანაცვლება: ძველი სიმღერის წვლილი აკლდება, ახლის ემატება"""
+        old = self._songs[song_id]
+        if old is not None:
+            self._seconds -= old.duration
+            _decrement(self._genre_mix, type(old).__name__)
+            _decrement(self._artist_mix, old.artist)
+        self._songs[song_id] = song
+        if song is not None:
+            self._seconds += song.duration
+            genre = type(song).__name__
+            self._genre_mix[genre] = self._genre_mix.get(genre, 0) + 1
+            self._artist_mix[song.artist] = self._artist_mix.get(song.artist, 0) + 1
+
+    def _reset(self) -> None:
+        """ყველა ჩანაწერი კატალოგის გარეთ, ჯამები ნულიდან"""
+        self._songs = dict.fromkeys(self._songs)
+        self._seconds = 0
+        self._genre_mix = {}
+        self._artist_mix = {}
+
+    def _duration_changed(self, song, delta: int) -> None:
+        if self._songs.get(song.song_id) is song:
+            self._seconds += delta
+
+
+def _decrement(counts: dict, key) -> None:
+    count = counts[key] - 1
+    if count:
+        counts[key] = count
+    else:
+        del counts[key]
@@ -0,0 +1,119 @@
+"""მომხმარებლების შეფასებები (user_idx, song_idx) -> რეიტინგი.
+
+ღია მისამართიანი ჰეშ-ცხრილი (linear probing) ორ მასივში: გასაღები
+array("q")-ში (user_idx << 32 | song_idx) + 1, სადაც 0 ცარიელი უჯრაა,
+რეიტინგი კი array("d")-ში. უჯრა 16 ბაიტია, dict-ის ~100 ბაიტის ნაცვლად
+(გასაღების int ობიექტი, float და ჩანაწერი), ამიტომ 50M შეფასება ~1 GiB-ია.
+ცხრილი ორმაგდება, როცა შევსება MAX_LOAD-ს აღემატება. წაშლა არ არის:
+სიმღერის ამოღებისას შეფასებები რჩება, როგორც მოსმენები ჟურნალში.
+"""
+from array import array
+
+MAX_LOAD = 0.8
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def _empty(typecode: str, capacity: int) -> array:
+    return array(typecode, bytes(8 * capacity))
+
+
+class RatingStore:
+
+    def __init__(self, capacity: int = 1024):
+        bits = max(4, (capacity - 1).bit_length())
+        self._resize_to(bits)
+        self._size = 0
+
+    def _resize_to(self, bits: int) -> None:
+        capacity = 1 << bits
+        self._keys = _empty("q", capacity)
+        self._values = _empty("d", capacity)
+        self._mask = capacity - 1
+        self._shift = 64 - bits
+        self._limit = int(capacity * MAX_LOAD)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._mask + 1
+
+    def _slot(self, key: int) -> int:
+        """Fibonacci ჰეში: მიმდევრობითი ინდექსები ცხრილში თანაბრად იფანტება"""
+        keys = self._keys
+        mask = self._mask
+        slot = ((key * _GOLDEN) & _MASK64) >> self._shift
+        while True:
+            found = keys[slot]
+            if found == key or found == 0:
+                return slot
+            slot = (slot + 1) & mask
+
+    def get(self, user_idx: int, song_idx: int, default=None):
+        slot = self._slot((user_idx << 32 | song_idx) + 1)
+        if self._keys[slot] == 0:
+            return default
+        return self._values[slot]
+
+    def set(self, user_idx: int, song_idx: int, rating: float):
+        """რეიტინგის ჩაწერა; აბრუნებს წინა რეიტინგს ან None-ს, თუ ახალია"""
+        key = (user_idx << 32 | song_idx) + 1
+        keys = self._keys
+        mask = self._mask
+        """_slot ჩაშენებულია: ეს ყველაზე ხშირი ოპერაციაა"""
+        slot = ((key * _GOLDEN) & _MASK64) >> self._shift
+        while True:
+            found = keys[slot]
+            if found == key:
+                old = self._values[slot]
+                self._values[slot] = rating
+                return old
+            if found == 0:
+                break
+            slot = (slot + 1) & mask
+        keys[slot] = key
+        self._values[slot] = rating
+        self._size += 1
+        if self._size > self._limit:
+            self._grow()
+        return None
+
+    def _grow(self) -> None:
+        keys, values = self._keys, self._values
+        self._resize_to(65 - self._shift)
+        new_keys, new_values = self._keys, self._values
+        slot_of = self._slot
+        for i, key in enumerate(keys):
+            if key:
+                slot = slot_of(key)
+                new_keys[slot] = key
+                new_values[slot] = values[i]
+
+    def items(self):
+        """(user_idx, song_idx, rating) ცხრილის რიგით"""
+        values = self._values
+        for i, key in enumerate(self._keys):
+            if key:
+                key -= 1
+                yield key >> 32, key & 0xFFFFFFFF, values[i]
+
+    def table(self) -> tuple:
+        """(გასაღებები, რეიტინგები) snapshot-ისთვის, უჯრები ისე, როგორც ცხრილშია"""
+        return self._keys, self._values
+
+    @classmethod
+    def from_table(cls, keys, values, size: int) -> "RatingStore":
+        """table()-ის შედეგიდან (მაგ. mmap-ის memoryview); მოცულობა იგივე რჩება, ამიტომ უჯრებიც"""
+        bits = len(keys).bit_length() - 1
+        if len(keys) != 1 << bits or len(values) != len(keys):
+            raise ValueError("ცხრილის ზომა უნდა იყოს 2-ის ხარისხი")
+        store = cls.__new__(cls)
+        store._mask = len(keys) - 1
+        store._shift = 64 - bits
+        store._limit = int(len(keys) * MAX_LOAD)
+        store._keys = array("q", keys)
+        store._values = array("d", values)
+        store._size = size
+        return store
@@ -0,0 +1,127 @@
+"""„ვინც ეს მოისმინა, ისიც მოისმინა" რეკომენდაციები (item-to-item).
+
+თანამოსმენა ითვლება მომხმარებლის ბოლო window განსხვავებულ სიმღერაში:
+ახალი სიმღერა ფანჯარაში შესვლისას ერთხელ წყვილდება ფანჯრის დანარჩენ
+სიმღერებთან, ასე რომ მოვლენის ღირებულება O(window)-ია და არა O(ისტორია).
+ფლეილისტში დამატება იგივენაირად წყვილდება ფლეილისტის ბოლო window სიმღერასთან.
+
+მსგავსება კოსინუსია: co(a, b) / √(n(a)·n(b)), სადაც n სიმღერის ფანჯარაში
+შესვლების რაოდენობაა. სიმღერის მეზობლების ლექსიკონი max_neighbors-ის
+ორმაგს რომ გადააჭარბებს, მასში რჩება ყველაზე ხშირი max_neighbors, ამიტომ
+მეხსიერება O(სიმღერები · max_neighbors)-ია. წაშლილი წყვილის შემდგომი
+თანამოსმენები თავიდან ითვლება, ანუ იშვიათი წყვილის რაოდენობა მიახლოებითია.
+
+მეზობლების სიები ქეშდება და სიმღერის წყვილების შეცვლისას უქმდება.
+მომხმარებლის რეკომენდაციები უქმდება მისივე ახალ მოსმენაზე ან
+stale_after განახლების შემდეგ, რაც არ უნდა იყოს დანარჩენი ცვლილებები.
+"""
+import heapq
+from math import sqrt
+from operator import itemgetter
+
+
+class CoListenRecommender:
+
+    def __init__(self, window: int = 20, max_neighbors: int = 100, cache_size: int = 20,
+                 stale_after: int = 10_000):
+        if window < 1 or max_neighbors < 1:
+            raise ValueError("window და max_neighbors უნდა იყოს დადებითი")
+        self.window = window
+        self.max_neighbors = max_neighbors
+        self.cache_size = cache_size
+        self.stale_after = stale_after
+        self.updates = 0
+        self.truncations = 0
+        self._co = {}
+        self._counts = {}
+        self._recent = {}
+        self._neighbors = {}
+        self._user_cache = {}
+
+    def add_listen(self, user_idx: int, song_idx: int) -> None:
+        recent = self._recent.get(user_idx)
+        if recent is None:
+            recent = self._recent[user_idx] = []
+        elif song_idx in recent:
+            """განმეორებითი მოსმენა ახალ წყვილს არ ქმნის, მხოლოდ ფანჯარაში რჩება"""
+            recent.remove(song_idx)
+            recent.append(song_idx)
+            return
+        self._pair(song_idx, recent)
+        recent.append(song_idx)
+        if len(recent) > self.window:
+            del recent[0]
+        self._user_cache.pop(user_idx, None)
+
+    def add_to_playlist(self, song_idx: int, others: list) -> None:
+        """others - ფლეილისტის წინა სიმღერები (ბოლო window გამოიყენება)"""
+        self._pair(song_idx, others[-self.window:])
+
+    def _pair(self, song_idx: int, others) -> None:
+        co = self._co
+        neighbors = self._neighbors
+        limit = 2 * self.max_neighbors
+        self._counts[song_idx] = self._counts.get(song_idx, 0) + 1
+        row = co.get(song_idx)
+        if row is None:
+            row = co[song_idx] = {}
+        for other in others:
+            if other == song_idx:
+                continue
+            row[other] = row.get(other, 0) + 1
+            """other უკვე დაწყვილდა ფანჯარაში ან ფლეილისტში შესვლისას, ამიტომ მისი მწკრივი არსებობს"""
+            other_row = co[other]
+            other_row[song_idx] = other_row.get(song_idx, 0) + 1
+            if len(other_row) > limit:
+                self._truncate(other)
+            if neighbors:
+                neighbors.pop(other, None)
+        if len(row) > limit:
+            self._truncate(song_idx)
+        neighbors.pop(song_idx, None)
+        self.updates += 1
+
+    def _truncate(self, song_idx: int) -> None:
+        """ამორტიზებული O(1): ყოველი max_neighbors ახალი მეზობლის შემდეგ ერთი nlargest"""
+        row = self._co[song_idx]
+        self._co[song_idx] = dict(heapq.nlargest(self.max_neighbors, row.items(), key=itemgetter(1)))
+        self.truncations += 1
+
+    def _ranked_neighbors(self, song_idx: int, limit: int) -> list:
+        row = self._co.get(song_idx)
+        if not row:
+            return []
+        counts = self._counts
+        own = counts[song_idx]
+        return heapq.nlargest(limit, ((count / sqrt(own * counts[other]), other)
+                                      for other, count in row.items()))
+
+    def neighbors(self, song_idx: int, limit: int = 10) -> list:
+        """[(score, song_idx)] მსგავსების კლებით; cache_size-მდე ქეშიდან"""
+        if limit > self.cache_size:
+            return self._ranked_neighbors(song_idx, limit)
+        cached = self._neighbors.get(song_idx)
+        if cached is None:
+            cached = self._neighbors[song_idx] = self._ranked_neighbors(song_idx, self.cache_size)
+        return cached[:limit]
+
+    def recommend(self, user_idx: int, heard, limit: int = 10) -> list:
+        """[(score, song_idx)] ბოლო ფანჯრის სიმღერების მეზობლებიდან, heard() აბრუნებს მოსმენილებს"""
+        cached = self._user_cache.get(user_idx)
+        if cached is not None and cached[0] >= limit and self.updates - cached[1] <= self.stale_after:
+            return cached[2][:limit]
+        seeds = self._recent.get(user_idx, ())
+        scores = {}
+        for seed in seeds:
+            for score, other in self.neighbors(seed, self.cache_size):
+                scores[other] = scores.get(other, 0.0) + score
+        if scores:
+            for song_idx in heard():
+                scores.pop(song_idx, None)
+        size = max(limit, self.cache_size)
+        ranked = heapq.nlargest(size, ((score, song_idx) for song_idx, score in scores.items()))
+        self._user_cache[user_idx] = (size, self.updates, ranked)
+        return ranked[:limit]
+
+    def pair_count(self) -> int:
+        return sum(len(row) for row in self._co.values())
@@ -0,0 +1,414 @@
+import csv
+import heapq
+import io
+import json
+from array import array
+from collections import defaultdict
+from datetime import datetime
+
+from songs import Song, PopSong, RockSong, ClassicalSong
+
+
+class GenreStats:
+    """ერთი ჟანრის სტატისტიკა, ივსება ერთი გავლით"""
+
+    def __init__(self, genre: str, songs: list):
+        self.genre = genre
+        self.songs = songs
+        self.total_plays = 0
+        self.rating_sum = 0
+
+    def add(self, song: Song) -> None:
+        self.total_plays += song.play_count
+        self.rating_sum += song.get_average_rating()
+
+    @property
+    def avg_rating(self) -> float:
+        return self.rating_sum / len(self.songs) if self.songs else 0
+
+
+class PopStats(GenreStats):
+    def __init__(self, genre: str, songs: list):
+        super().__init__(genre, songs)
+        self.chart_toppers = 0
+
+    def add(self, song: PopSong) -> None:
+        super().add(song)
+        if song.is_chart_topper:
+            self.chart_toppers += 1
+
+
+class RockStats(GenreStats):
+    def __init__(self, genre: str, songs: list):
+        super().__init__(genre, songs)
+        self.intensity_sum = 0
+        self.guitar_solos = 0
+
+    def add(self, song: RockSong) -> None:
+        super().add(song)
+        self.intensity_sum += song.intensity_level
+        if song.has_guitar_solo:
+            self.guitar_solos += 1
+
+    @property
+    def avg_intensity(self) -> float:
+        return self.intensity_sum / len(self.songs) if self.songs else 0
+
+
+class ClassicalStats(GenreStats):
+    def __init__(self, genre: str, songs: list):
+        super().__init__(genre, songs)
+        self.era_counts = {}
+
+    def add(self, song: ClassicalSong) -> None:
+        super().add(song)
+        self.era_counts[song.era] = self.era_counts.get(song.era, 0) + 1
+
+
+GENRE_STATS = {
+    PopSong: PopStats,
+    RockSong: RockStats,
+    ClassicalSong: ClassicalStats,
+}
+
+
+class ReportStats:
+    """ანგარიშისთვის საჭირო ყველა მონაცემი"""
+
+    def __init__(self):
+        self.total_songs = 0
+        self.genre_counts = {}
+        self.genres = {}
+        self.total_users = 0
+        self.premium_users = 0
+        self.free_users = 0
+        self.revenue = 0
+        self.most_popular_artist = ""
+        self.top_rated = []
+        self.most_played = []
+        self.top_listeners = []
+
+
+class ReportSections:
+    """ანგარიშის სექციები, თითოეული ცალკე ქეშირებული.
+
+    ყოველ სექციას აქვს ვერსია, რომელსაც სისტემა ზრდის შესაბამისი ცვლილებისას
+    (სიმღერის/მომხმარებლის დამატება, მოსმენა, შეფასება, პრემიუმი). compute()
+    თავიდან ითვლის მხოლოდ იმ სექციებს, რომელთა ქეშის ვერსია ძველია, და
+    მდგომარეობას არ ცვლის, ამიტომ ConcurrentStreamingSystem.read()-ში
+    ხელახლა ცდა უსაფრთხოა; commit() ინახავს შედეგს იმ ვერსიით, რომელიც
+    გამოთვლის დაწყებისას იყო. რენდერერების ფრაგმენტებიც ქეშდება ვერსიით.
+    """
+
+    BASE = ("songs", "users", "finance", "top_rated", "most_played", "top_listeners")
+    USER_SECTIONS = ("users", "finance", "top_listeners")
+    """არა სექცია: ყველა მსმენელის დროის ხელახლა დათვლა (ხანგრძლივობები შეიცვალა)"""
+    ALL_LISTENERS = "listeners_full"
+
+    def __init__(self, top_songs: int = 10, top_users: int = 5):
+        self.top_songs = top_songs
+        self.top_users = top_users
+        self.versions = defaultdict(int)
+        self._cache = {}
+        self._chunks = {}
+        self._touched_by_type = {}
+        self._played_by_type = {}
+        """user_idx -> top_listeners-ის ვერსია ბოლო მოსმენისას"""
+        self._listened = {}
+
+    def names(self) -> tuple:
+        return self.BASE + tuple(Song._genres)
+
+    def mark(self, names) -> None:
+        versions = self.versions
+        for name in names:
+            versions[name] += 1
+
+    def _song_sections(self, song_type, base: tuple) -> tuple:
+        key = (song_type, base)
+        names = self._touched_by_type.get(key)
+        if names is None:
+            names = self._touched_by_type[key] = base + tuple(
+                cls.__name__ for cls in song_type.genre_classes())
+        return names
+
+    def song_played(self, song: Song) -> None:
+        """მოსმენა ცვლის TOP სიებს (JSON/CSV სტრიქონებში ორივე მთვლელია), არტისტს და ჟანრის ჯამებს"""
+        names = self._played_by_type.get(type(song))
+        if names is None:
+            names = self._played_by_type[type(song)] = self._song_sections(
+                type(song), ("most_played", "top_rated", "finance"))
+        versions = self.versions
+        for name in names:
+            versions[name] += 1
+
+    def user_listened(self, user_idx: int) -> None:
+        """მსმენელის დრო თავიდან ითვლება მხოლოდ მონიშნული მომხმარებლებისთვის"""
+        versions = self.versions
+        versions["top_listeners"] += 1
+        self._listened[user_idx] = versions["top_listeners"]
+
+    def song_rated(self, song: Song) -> None:
+        self.mark(self._song_sections(type(song), ("top_rated", "most_played")))
+
+    def song_changed(self, song: Song) -> None:
+        """დამატება, წაშლა ან ხანგრძლივობის ცვლილება"""
+        self.mark(self._song_sections(type(song), self.BASE + (self.ALL_LISTENERS,)))
+
+    def user_changed(self) -> None:
+        self.mark(self.USER_SECTIONS)
+
+    def invalidate(self) -> None:
+        """ყველა სექციის განახლება (მაგ. ველების პირდაპირი ცვლილების შემდეგ)"""
+        self.mark(self.names() + (self.ALL_LISTENERS,))
+
+    def stale(self) -> list:
+        versions = self.versions
+        cache = self._cache
+        return [name for name in self.names()
+                if name not in cache or cache[name][0] != versions.get(name, 0)]
+
+    def compute(self, system) -> dict:
+        """{სექცია: (ვერსია, მნიშვნელობა)} მხოლოდ ძველი სექციებისთვის"""
+        stale = self.stale()
+        versions = dict(self.versions)
+        computed = {}
+        if not stale:
+            return computed
+
+        def put(name, value):
+            computed[name] = (versions.get(name, 0), value)
+
+        for name in stale:
+            genre_type = Song._genres.get(name)
+            if genre_type is not None:
+                genre_stats = GENRE_STATS.get(genre_type, GenreStats)(name, system.get_songs_by_genre(name))
+                for song in genre_stats.songs:
+                    genre_stats.add(song)
+                put(name, genre_stats)
+        if "songs" in stale:
+            put("songs", (len(system.songs),
+                          {name: system.get_genre_count(name) for name in Song._genres}))
+        if "top_rated" in stale:
+            put("top_rated", system.get_top_rated_songs(self.top_songs))
+        if "most_played" in stale:
+            put("most_played", system.get_most_played_songs(self.top_songs))
+        if "users" in stale:
+            premium = free = 0
+            revenue = 0
+            for user in system.users.values():
+                if user.is_premium:
+                    premium += 1
+                    revenue += user.monthly_fee
+                else:
+                    free += 1
+            put("users", (len(system.users), premium, free, revenue))
+        if "finance" in stale:
+            """შემოსავალი მომხმარებლების სექციიდანაა, მოსმენა მხოლოდ არტისტს ცვლის"""
+            revenue = (computed.get("users") or self._cache["users"])[1][3]
+            put("finance", (revenue, system.get_most_popular_artist()))
+        if "top_listeners" in stale:
+            put("top_listeners", self._top_listeners(system, versions))
+        return computed
+
+    def _top_listeners(self, system, versions: dict) -> tuple:
+        """(TOP, საათები user_idx-ით, სრული დათვლის ვერსია): წინა შედეგის ასლზე
+        თავიდან ითვლება მხოლოდ მას შემდეგ მოსმენილი და ახალი მომხმარებლები"""
+        full = versions.get(self.ALL_LISTENERS, 0)
+        cached = self._cache.get("top_listeners")
+        users = system._user_by_index
+        if cached is None or cached[1][2] != full:
+            hours = array("q", (system._user_listening_time(user) // 3600 for user in users))
+        else:
+            since = cached[0]
+            hours = array("q", cached[1][1])
+            for user_idx, version in list(self._listened.items()):
+                if version > since and user_idx < len(hours):
+                    hours[user_idx] = system._user_listening_time(users[user_idx]) // 3600
+            hours.extend(system._user_listening_time(users[user_idx]) // 3600
+                         for user_idx in range(len(hours), len(users)))
+        top = heapq.nlargest(self.top_users, ((user, hours[user._system_index]) for user in system.users.values()),
+                             key=lambda x: x[1])
+        return top, hours, full
+
+    def commit(self, computed: dict) -> None:
+        self._cache.update(computed)
+        listeners = computed.get("top_listeners")
+        if listeners is not None:
+            self._listened = {user_idx: version for user_idx, version in self._listened.items()
+                              if version > listeners[0]}
+
+    def model(self) -> ReportStats:
+        cache = self._cache
+        stats = ReportStats()
+        stats.total_songs, stats.genre_counts = cache["songs"][1]
+        stats.total_users, stats.premium_users, stats.free_users, _ = cache["users"][1]
+        stats.revenue, stats.most_popular_artist = cache["finance"][1]
+        stats.top_rated = cache["top_rated"][1]
+        stats.most_played = cache["most_played"][1]
+        stats.top_listeners = cache["top_listeners"][1][0]
+        stats.genres = {name: cache[name][1] for name in Song._genres}
+        return stats
+
+    def refresh(self, system) -> ReportStats:
+        self.commit(self.compute(system))
+        return self.model()
+
+    def write(self, system, renderer, stream, stats: ReportStats) -> None:
+        """header, სექციების ფრაგმენტები (ქეშიდან, თუ ვერსია არ შეცვლილა) და footer ერთ ნაკადში"""
+        stream.write(renderer.begin(system, stats))
+        for i, name in enumerate(renderer.order(stats)):
+            if i:
+                stream.write(renderer.separator)
+            version = self._cache[name][0] if name in self._cache else 0
+            key = (renderer.name, name)
+            chunk = self._chunks.get(key)
+            if chunk is None or chunk[0] != version:
+                chunk = self._chunks[key] = (version, renderer.section(system, name, stats))
+            stream.write(chunk[1])
+        stream.write(renderer.end(system, stats))
+
+
+def collect_report_stats(system, top_songs: int = 10, top_users: int = 5) -> ReportStats:
+    """ყველა სექციის გამოთვლა ქეშის გარეშე: ჟანრის კალათებზე და ერთხელ მომხმარებლებზე"""
+    return ReportSections(top_songs, top_users).refresh(system)
+
+
+class ReportRenderer:
+    """ფორმატის რენდერერი: begin, სექციები order() რიგით separator-ით და end"""
+
+    name = None
+    separator = ""
+
+    def begin(self, system, stats: ReportStats) -> str:
+        return ""
+
+    def order(self, stats: ReportStats) -> tuple:
+        return ReportSections.BASE + tuple(stats.genres)
+
+    def section(self, system, name: str, stats: ReportStats) -> str:
+        raise NotImplementedError
+
+    def end(self, system, stats: ReportStats) -> str:
+        return ""
+
+
+class TextRenderer(ReportRenderer):
+    """ქართული ტექსტური ანგარიში; სექციებს წერს StreamingSystem-ის _write_*_section მეთოდები"""
+
+    name = "text"
+    WRITERS = {
+        "songs": "_write_song_stats_section",
+        "users": "_write_user_stats_section",
+        "finance": "_write_finance_section",
+        "top_rated": "_write_top_rated_section",
+        "most_played": "_write_most_played_section",
+        "top_listeners": "_write_top_listeners_section",
+        "genres_title": "_write_genres_title",
+        "PopSong": "_write_pop_section",
+        "RockSong": "_write_rock_section",
+        "ClassicalSong": "_write_classical_section",
+    }
+
+    def begin(self, system, stats: ReportStats) -> str:
+        return ("=" * 65 + "\n" + f"    {system.platform_name} - ანგარიში\n" + "=" * 65 + "\n"
+                + f"თარიღი: {datetime.now().strftime('%Y-%m-%d')}\n\n")
+
+    def order(self, stats: ReportStats) -> tuple:
+        """genres_title სტატიკურია: მისი ვერსია არასდროს იცვლება"""
+        return ReportSections.BASE + ("genres_title", "PopSong", "RockSong", "ClassicalSong")
+
+    def section(self, system, name: str, stats: ReportStats) -> str:
+        buffer = io.StringIO()
+        getattr(system, self.WRITERS[name])(buffer, stats.genres.get(name, stats))
+        return buffer.getvalue()
+
+    def end(self, system, stats: ReportStats) -> str:
+        return "=" * 65 + "\n" + "           ანგარიშის დასასრული\n" + "=" * 65 + "\n"
+
+
+def _song_row(song: Song) -> dict:
+    return {"song_id": song.song_id, "title": song.title, "artist": song.artist,
+            "duration": song.duration, "play_count": song.play_count,
+            "avg_rating": round(song.get_average_rating(), 3), "rating_count": song.rating_count}
+
+
+def section_data(name: str, stats: ReportStats):
+    """სექცია JSON-ისა და CSV-სთვის გამოსადეგ სტრუქტურად"""
+    if name == "songs":
+        return {"total": stats.total_songs, **stats.genre_counts}
+    if name == "users":
+        return {"total": stats.total_users, "premium": stats.premium_users, "free": stats.free_users}
+    if name == "finance":
+        return {"revenue": round(stats.revenue, 2), "most_popular_artist": stats.most_popular_artist}
+    if name in ("top_rated", "most_played"):
+        return [_song_row(song) for song in getattr(stats, name)]
+    if name == "top_listeners":
+        return [{"user_id": user.user_id, "username": user.username, "hours": hours,
+                 "premium": user.is_premium} for user, hours in stats.top_listeners]
+    genre_stats = stats.genres[name]
+    data = {"songs": len(genre_stats.songs), "total_plays": genre_stats.total_plays,
+            "avg_rating": round(genre_stats.avg_rating, 3)}
+    if isinstance(genre_stats, PopStats):
+        data["chart_toppers"] = genre_stats.chart_toppers
+    elif isinstance(genre_stats, RockStats):
+        data["avg_intensity"] = round(genre_stats.avg_intensity, 3)
+        data["guitar_solos"] = genre_stats.guitar_solos
+    elif isinstance(genre_stats, ClassicalStats):
+        data["eras"] = dict(genre_stats.era_counts)
+    data["tracks"] = [_song_row(song) for song in genre_stats.songs]
+    return data
+
+
+class JsonRenderer(ReportRenderer):
+    """{"platform", "date", "sections": {...}}, სექციები ცალ-ცალკე სერიალიზდება"""
+
+    name = "json"
+    separator = ",\n"
+
+    def begin(self, system, stats: ReportStats) -> str:
+        return (f'{{"platform": {json.dumps(system.platform_name, ensure_ascii=False)}, '
+                f'"date": "{datetime.now().strftime("%Y-%m-%d")}",\n"sections": {{\n')
+
+    def section(self, system, name: str, stats: ReportStats) -> str:
+        return f"{json.dumps(name)}: {json.dumps(section_data(name, stats), ensure_ascii=False)}"
+
+    def end(self, system, stats: ReportStats) -> str:
+        return "\n}}\n"
+
+
+class CsvRenderer(ReportRenderer):
+    """გრძელი ფორმატი: section,item,field,value (სიებისთვის item არის რიგი ან song_id)"""
+
+    name = "csv"
+
+    def begin(self, system, stats: ReportStats) -> str:
+        return "section,item,field,value\r\n"
+
+    def section(self, system, name: str, stats: ReportStats) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        data = section_data(name, stats)
+        if isinstance(data, list):
+            for rank, row in enumerate(data, 1):
+                writer.writerows((name, rank, field, value) for field, value in row.items())
+            return buffer.getvalue()
+        for field, value in data.items():
+            if field == "tracks":
+                for row in value:
+                    writer.writerows((name, row["song_id"], key, item) for key, item in row.items()
+                                     if key != "song_id")
+            elif isinstance(value, dict):
+                writer.writerows((name, field, key, item) for key, item in value.items())
+            else:
+                writer.writerow((name, "", field, value))
+        return buffer.getvalue()
+
+
+"""ფაილის გაფართოება -> ფორმატი, generate_report-ისთვის fmt-ის გარეშე"""
+REPORT_FORMATS = {".txt": "text", ".json": "json", ".csv": "csv"}
+RENDERERS = {renderer.name: renderer for renderer in (TextRenderer(), JsonRenderer(), CsvRenderer())}
+
+
+def register_renderer(renderer: ReportRenderer) -> None:
+    RENDERERS[renderer.name] = renderer
@@ -0,0 +1,187 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from math import isqrt
+
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """case-ის და დიაკრიტიკის გარეშე: "Beyoncé" -> "beyonce" """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN.findall(normalize(text)) if text else []
+
+
+class SearchIndex:
+    """საძიებო ინდექსი სათაურზე, არტისტსა და კომპოზიტორზე.
+
+    ინვერსიული ინდექსი: ტოკენი -> სიმღერის ინდექსების სიმრავლე, პრეფიქსისთვის
+    კი ტოკენების დალაგებული სია (ახალი ტოკენები გროვდება და მოთხოვნისას
+    ერთხელ ერწყმის). შედეგები რანჟირდება play_count-ით, თანაბრობისას
+    დამატების რიგით, ისევე როგორც get_most_played_songs.
+    """
+
+    FIELDS = ("title", "artist", "composer")
+    """ხშირი ტერმინის მინიმალური ზღვარი"""
+    DENSE_THRESHOLD = 256
+
+    def __init__(self, system):
+        self._system = system
+        self._postings = {}
+        self._vocabulary = []
+        self._new_tokens = set()
+        self._tokens = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, song) -> None:
+        song_idx = song._index
+        self.remove(song_idx)
+        tokens = set()
+        for field in self.FIELDS:
+            tokens.update(tokenize(getattr(song, field, None)))
+        """" a b c " სტრიქონი: ტერმინის შემოწმება ერთი substring ძიებაა"""
+        self._tokens[song_idx] = f" {' '.join(tokens)} "
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = set()
+                self._new_tokens.add(token)
+            posting.add(song_idx)
+
+    def remove(self, song_idx: int) -> None:
+        for token in self._tokens.pop(song_idx, "").split():
+            posting = self._postings[token]
+            posting.discard(song_idx)
+            if not posting:
+                """ტოკენი ლექსიკონში რჩება, ცარიელი posting-ი მოთხოვნისას გამოტოვდება"""
+                del self._postings[token]
+
+    def _sorted_vocabulary(self) -> list:
+        """ახალი ტოკენების შერწყმა, ცარიელი და განმეორებული ტოკენები იშლება"""
+        if self._new_tokens:
+            merged = []
+            for token in heapq.merge(self._vocabulary, sorted(self._new_tokens)):
+                if token in self._postings and (not merged or merged[-1] != token):
+                    merged.append(token)
+            self._vocabulary = merged
+            self._new_tokens = set()
+        return self._vocabulary
+
+    def _matching_tokens(self, term: str, prefix: bool):
+        if not prefix:
+            if term in self._postings:
+                yield term
+            return
+        vocabulary = self._sorted_vocabulary()
+        for i in range(bisect_left(vocabulary, term), len(vocabulary)):
+            token = vocabulary[i]
+            if not token.startswith(term):
+                return
+            if token in self._postings:
+                yield token
+
+    def _candidates(self, term: str, prefix: bool, threshold: int):
+        """ტერმინის სიმღერები, ან None თუ მათი რაოდენობა threshold-ს აჭარბებს"""
+        found = None
+        copied = False
+        for token in self._matching_tokens(term, prefix):
+            posting = self._postings[token]
+            if len(posting) > threshold:
+                return None
+            if found is None:
+                found = posting
+            elif copied:
+                found |= posting
+            else:
+                found = found | posting
+                copied = True
+            if len(found) > threshold:
+                return None
+        return found if found is not None else set()
+
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> list:
+        """ყველა ტერმინის შემცველი სიმღერები, prefix=True-ისას ტერმინი ტოკენის დასაწყისია.
+
+        იშვიათი ტერმინების სიმრავლეები იკვეთება, ხშირი ტერმინები მოწმდება
+        ტოკენების სტრიქონით. დიდი შედეგისას (√(limit·N)-ზე მეტი) ან როცა ყველა
+        ტერმინი ხშირია, სიმღერები იკითხება TOP სიის რიგით პირველ limit
+        დამთხვევამდე, ასე რომ ორივე გზა დაახლოებით √(limit·N) სიმღერას ამოწმებს.
+        ხშირი ტერმინების იშვიათი კომბინაციისას გავლა წყდება და სიმრავლე იგება სრულად.
+        """
+        terms = tokenize(query)
+        if not terms or limit <= 0:
+            return []
+        threshold = max(self.DENSE_THRESHOLD, isqrt(limit * len(self._tokens)))
+        found = None
+        frequent = []
+        """გრძელი ტერმინი, როგორც წესი, უფრო იშვიათია; მცირე სიმრავლის შემდეგ
+        დანარჩენი ტერმინები მხოლოდ მის ფარგლებში მოწმდება"""
+        for term in sorted(terms, key=len, reverse=True):
+            cap = threshold if found is None else len(found)
+            candidates = self._candidates(term, prefix, cap)
+            if candidates is None:
+                frequent.append(term)
+                continue
+            found = candidates if found is None else found & candidates
+            if not found:
+                return []
+
+        if found is None:
+            """ყველა ტერმინი ხშირია: TOP სიის რიგით გავლა ლიმიტირებული ბიუჯეტით"""
+            result = self._walk(self._needles(frequent, prefix), limit, threshold)
+            if result is not None:
+                return result
+            found = self._candidates(frequent[0], prefix, len(self._tokens))
+            frequent = frequent[1:]
+        tokens = self._tokens
+        for needle in self._needles(frequent, prefix):
+            found = {song_idx for song_idx in found if needle in tokens[song_idx]}
+        if len(found) > threshold:
+            return self._walk(found, limit)
+
+        songs = self._system._song_by_index
+        rank = self._system._song_rank
+        best = heapq.nsmallest(limit, found,
+                               key=lambda song_idx: (-songs[song_idx].play_count, rank[song_idx]))
+        return [songs[song_idx] for song_idx in best]
+
+    @staticmethod
+    def _needles(terms: list, prefix: bool) -> list:
+        """" a b c " ტოკენების სტრიქონში საძიებელი ქვესტრიქონები"""
+        return [f" {term}" if prefix else f" {term} " for term in terms]
+
+    def _walk(self, accept, limit: int, budget: int = None):
+        """სიმღერები პოპულარობის რიგით: accept არის სიმრავლე ან needles-ის სია.
+
+        აბრუნებს None-ს, თუ budget სიმღერის შემოწმების შემდეგ შედეგი ჯერ არ შევსებულა.
+        """
+        tokens = self._tokens
+        by_set = isinstance(accept, set)
+        result = []
+        checked = 0
+        for song in self._system._most_played.ranked():
+            song_idx = song._index
+            if by_set:
+                ok = song_idx in accept
+            else:
+                song_tokens = tokens[song_idx]
+                ok = True
+                for needle in accept:
+                    if needle not in song_tokens:
+                        ok = False
+                        break
+            if ok:
+                result.append(song)
+                if len(result) == limit:
+                    return result
+            checked += 1
+            if budget is not None and checked > budget:
+                return None
+        return result
@@ -0,0 +1,312 @@
+"""asyncio სერვისი: NDJSON მოვლენები TCP ან Unix სოკეტზე.
+
+ყოველი ხაზი ერთი JSON ობიექტია, პასუხიც ერთი ხაზია იმავე რიგით:
+    {"type": "listen", "user_id": "U001", "song_id": "S001", "date": "2025-01-10", "rating": 4.5}
+    {"type": "rate", "user_id": "U001", "song_id": "S001", "rating": 4.5}
+    {"type": "playlist", "action": "create" | "add" | "remove", "user_id": "U001",
+     "name": "Mix", "song_id": "S001"}
+    {"type": "query", "name": "top_rated" | "most_played" | "revenue" | "popular_artist", "limit": 5}
+
+listen-ის არასწორი რეიტინგი მოსმენას არ აუქმებს (როგორც ingest_events-ში):
+პასუხია {"ok": true, "warning": ...} და ჩაიწერება მხოლოდ მოსმენა.
+
+ყველა მოთხოვნა გადის ერთ შეზღუდულ რიგში და მას ამუშავებს ერთი ჩამწერი
+batch-ებად, ამიტომ მოთხოვნა ხედავს ყველა მანამდე გაგზავნილ მოვლენას.
+სავსე რიგისას კავშირის კითხვა ჩერდება და TCP უკან აწვება კლიენტს (backpressure).
+"""
+import asyncio
+import json
+
+from ingest import rating_error
+
+
+def _song_json(song) -> dict:
+    return {"song_id": song.song_id, "title": song.title, "artist": song.artist,
+            "play_count": song.play_count, "avg_rating": round(song.get_average_rating(), 3)}
+
+
+def _valid_rating(rating) -> bool:
+    return rating_error(rating) is None
+
+
+def _request_error(request) -> str:
+    """სტრუქტურის შემოწმება რიგში ჩაწერამდე: ID-ები და თარიღი სტრიქონებია (ან არ არის)"""
+    if not isinstance(request, dict):
+        return "მოთხოვნა უნდა იყოს JSON ობიექტი"
+    for field in ("type", "user_id", "song_id", "date", "name", "action"):
+        value = request.get(field)
+        if value is not None and not isinstance(value, str):
+            return f"ველი {field} უნდა იყოს სტრიქონი"
+    return None
+
+
+class IngestServer:
+    """ლოკალური ingest სერვერი StreamingSystem-ისთვის"""
+
+    def __init__(self, system, host: str = "127.0.0.1", port: int = 0, path: str = None,
+                 queue_size: int = 10_000, batch_size: int = 1_000):
+        self.system = system
+        self.host = host
+        self.port = port
+        self.path = path
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.batches = 0
+        self.max_queue_depth = 0
+        self._queue = None
+        self._server = None
+        self._writer_task = None
+        self._connections = set()
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(self.queue_size)
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+        self._writer_task = asyncio.create_task(self._write_loop())
+
+    async def close(self) -> None:
+        self._server.close()
+        for task in list(self._connections):
+            task.cancel()
+        await self._server.wait_closed()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+
+    async def __aenter__(self) -> "IngestServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _handle(self, reader, writer) -> None:
+        """ხაზების კითხვა რიგში, პასუხები ცალკე ამოცანით იმავე რიგით"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        responses = asyncio.Queue()
+        sender = asyncio.create_task(self._send_responses(responses, writer))
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                future = loop.create_future()
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    future.set_result({"ok": False, "error": f"არასწორი JSON: {e}"})
+                else:
+                    error = _request_error(request)
+                    if error is not None:
+                        future.set_result({"ok": False, "error": error})
+                    else:
+                        await self._queue.put((request, future))
+                        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+                await responses.put(future)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            await responses.put(None)
+            try:
+                await sender
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+            writer.close()
+            self._connections.discard(task)
+
+    async def _send_responses(self, responses: asyncio.Queue, writer) -> None:
+        while True:
+            future = await responses.get()
+            if future is None:
+                return
+            result = await future
+            writer.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+            if responses.empty():
+                await writer.drain()
+
+    async def _write_loop(self) -> None:
+        """ერთადერთი ჩამწერი: რიგიდან batch_size-მდე მოთხოვნა ერთ ჯერზე"""
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self.batches += 1
+            try:
+                self._apply(batch)
+            except Exception as e:
+                """ცუდი batch ჩამწერს არ აჩერებს: მის უპასუხო მოთხოვნებს შეცდომა უბრუნდება"""
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result({"ok": False, "error": str(e)})
+
+    def _apply(self, batch: list) -> None:
+        """მიმდევრობითი მოსმენები ერთ ingest_events-ად, დანარჩენი სათითაოდ, რიგის დაცვით"""
+        listens = []
+        for request, future in batch:
+            if request.get("type") == "listen":
+                listens.append((request, future))
+                continue
+            self._flush_listens(listens)
+            listens = []
+            try:
+                result = self._handle_request(request)
+            except Exception as e:
+                result = {"ok": False, "error": str(e)}
+            future.set_result(result)
+        self._flush_listens(listens)
+
+    def _flush_listens(self, listens: list) -> None:
+        if not listens:
+            return
+        system = self.system
+        events = []
+        accepted = []
+        for request, future in listens:
+            user_id = request.get("user_id")
+            song_id = request.get("song_id")
+            rating = request.get("rating")
+            if user_id not in system.users or song_id not in system.songs:
+                future.set_result({"ok": False, "error": "უცნობი მომხმარებელი ან სიმღერა"})
+                continue
+            """როგორც ingest_events-ში: არასწორი რეიტინგი იკარგება, მოსმენა კი ჩაიწერება"""
+            events.append((user_id, song_id, request.get("date", ""), rating))
+            if rating is not None and not _valid_rating(rating):
+                accepted.append((future, {"ok": True, "warning":
+                                          "რეიტინგი უნდა იყოს 1.0-დან 5.0-ის ჩათვლით, არ ჩაიწერა."}))
+            else:
+                accepted.append((future, {"ok": True}))
+        if events:
+            system.ingest_events(events, batch_size=len(events))
+        """პასუხი მხოლოდ ჩაწერის შემდეგ, რომ ჩავარდნილმა batch-მა "ok" არ დააბრუნოს"""
+        for future, result in accepted:
+            future.set_result(result)
+
+    def _handle_request(self, request: dict) -> dict:
+        kind = request.get("type")
+        system = self.system
+        if kind == "query":
+            return self._query(request)
+        user = system.users.get(request.get("user_id"))
+        if user is None:
+            return {"ok": False, "error": "უცნობი მომხმარებელი"}
+        if kind == "rate":
+            song = system.songs.get(request.get("song_id"))
+            rating = request.get("rating")
+            if song is None:
+                return {"ok": False, "error": "უცნობი სიმღერა"}
+            if not _valid_rating(rating):
+                return {"ok": False, "error": "რეიტინგი უნდა იყოს 1.0-დან 5.0-ის ჩათვლით."}
+            user.rate_song(song, rating)
+            return {"ok": True}
+        if kind == "playlist":
+            return self._playlist(user, request)
+        return {"ok": False, "error": f"უცნობი ტიპი: {kind}"}
+
+    def _playlist(self, user, request: dict) -> dict:
+        """წინასწარი შემოწმება, რომ User-ის მეთოდებმა შეცდომა არ დაბეჭდონ"""
+        action = request.get("action")
+        name = request.get("name")
+        playlist = user.playlists.get(name)
+        if action == "create":
+            if playlist is not None:
+                return {"ok": False, "error": f"ფლეილისტი {name} უკვე არსებობს"}
+            user.create_playlist(name)
+            return {"ok": True}
+        if playlist is None:
+            return {"ok": False, "error": f"ფლეილისტი '{name}' არ არსებობს!"}
+        song_id = request.get("song_id")
+        if action == "add":
+            song = self.system.songs.get(song_id)
+            if song is None:
+                return {"ok": False, "error": "უცნობი სიმღერა"}
+            if song_id in playlist:
+                return {"ok": False, "error": f"სიმღერა {song_id} უკვე არის ფლეილისტში '{name}'"}
+            user.add_to_playlist(name, song)
+        elif action == "remove":
+            if song_id not in playlist:
+                return {"ok": False, "error": f"სიმღერა {song_id} არ არის ფლეილისტში '{name}'"}
+            user.remove_from_playlist(name, song_id)
+        else:
+            return {"ok": False, "error": f"უცნობი მოქმედება: {action}"}
+        return {"ok": True, "songs": len(playlist), "duration": playlist.duration}
+
+    def _query(self, request: dict) -> dict:
+        system = self.system
+        name = request.get("name")
+        limit = request.get("limit", 10)
+        if name == "top_rated":
+            return {"ok": True, "songs": [_song_json(song) for song in system.get_top_rated_songs(limit)]}
+        if name == "most_played":
+            return {"ok": True, "songs": [_song_json(song) for song in system.get_most_played_songs(limit)]}
+        if name == "revenue":
+            return {"ok": True, "revenue": system.get_total_premium_revenue()}
+        if name == "popular_artist":
+            artist, plays = system.get_most_popular_artist_plays()
+            return {"ok": True, "artist": artist, "plays": plays,
+                    "summary": system.get_most_popular_artist()}
+        return {"ok": False, "error": f"უცნობი მოთხოვნა: {name}"}
+
+
+class IngestClient:
+    """NDJSON კლიენტი: მოთხოვნები იგზავნება pipeline-ით, პასუხები რიგით ბრუნდება"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._pending = asyncio.Queue()
+        self._closed = False
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = None, path: str = None) -> "IngestClient":
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _receive(self) -> None:
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                """EOF-ზე პასუხს აღარ ველით: ყველა მოლოდინში მყოფი მოთხოვნა შეცდომით სრულდება"""
+                self._closed = True
+                while not self._pending.empty():
+                    future = self._pending.get_nowait()
+                    if not future.done():
+                        future.set_exception(ConnectionError("სერვერმა კავშირი დახურა"))
+                return
+            future = await self._pending.get()
+            future.set_result(json.loads(line))
+
+    async def send(self, request: dict) -> asyncio.Future:
+        """აგზავნის მოთხოვნას და აბრუნებს future-ს პასუხისთვის (drain-ით backpressure)"""
+        if self._closed:
+            raise ConnectionError("სერვერმა კავშირი დახურა")
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put(future)
+        self._writer.write(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self._writer.drain()
+        return future
+
+    async def request(self, request: dict) -> dict:
+        return await (await self.send(request))
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+        try:
+            await self._receiver
+        except (asyncio.CancelledError, ConnectionError):
+            pass
@@ -0,0 +1,253 @@
+"""ფიქსირებული მეხსიერების სტრიმინგ-სკეჩები მოსმენებისთვის.
+
+ცდომილებები (N - მოვლენების რაოდენობა):
+- HyperLogLog, m = 2**precision რეგისტრი: სტანდარტული ცდომილება ≈ 1.04/√m
+  (precision=10 -> ~3.3%, precision=12 -> ~1.6%), მცირე რაოდენობებზე linear counting.
+- Count-Min, width w, depth d: შეფასება არასდროს ნაკლებია რეალურზე და
+  1 - (1/2)**d ალბათობით არ აჭარბებს მას 2N/w-ზე მეტით.
+- Space-Saving, k მთვლელი: ყოველი მთვლელი რეალურს აჭარბებს მაქსიმუმ N/k-ით
+  (ზუსტი ზედა ზღვარი ინახება error-ში), N/k-ზე ხშირი ელემენტი აუცილებლად სიაშია.
+
+ჰეში ითვლება სტრიქონი ID-დან (blake2b), ამიტომ სხვადასხვა შარდის სკეჩები
+ერთნაირი პარამეტრებით merge()-ით ერთიანდება.
+"""
+from array import array
+from hashlib import blake2b
+from math import log
+
+
+def hash64(key: str) -> int:
+    return int.from_bytes(blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = 10):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision უნდა იყოს 4-16 შუალედში")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add_hash(self, value: int) -> None:
+        precision = self.precision
+        index = value >> (64 - precision)
+        rest = value & ((1 << (64 - precision)) - 1)
+        rank = 64 - precision - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, key: str) -> None:
+        self.add_hash(hash64(key))
+
+    def count(self) -> int:
+        registers = self.registers
+        m = len(registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / sum(2.0 ** -r for r in registers)
+        zeros = registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            """linear counting მცირე რაოდენობებზე"""
+            estimate = m * log(m / zeros)
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog-ების precision განსხვავდება")
+        registers = self.registers
+        for i, value in enumerate(other.registers):
+            if value > registers[i]:
+                registers[i] = value
+
+    def nbytes(self) -> int:
+        return len(self.registers)
+
+
+class CountMinSketch:
+    """depth მწკრივი width მთვლელით, მწკრივის ინდექსი h1 + i*h2 (Kirsch-Mitzenmacher)"""
+    __slots__ = ("width", "depth", "table", "total")
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.table = array("Q", bytes(8 * width * depth))
+        self.total = 0
+
+    def _cells(self, value: int):
+        width = self.width
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        for row in range(self.depth):
+            yield row * width + (h1 + row * h2) % width
+
+    def add_hash(self, value: int, count: int = 1) -> None:
+        table = self.table
+        for cell in self._cells(value):
+            table[cell] += count
+        self.total += count
+
+    def add(self, key: str, count: int = 1) -> None:
+        self.add_hash(hash64(key), count)
+
+    def estimate_hash(self, value: int) -> int:
+        table = self.table
+        return min(table[cell] for cell in self._cells(value))
+
+    def estimate(self, key: str) -> int:
+        return self.estimate_hash(hash64(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Count-Min სკეჩების ზომები განსხვავდება")
+        table = self.table
+        for i, value in enumerate(other.table):
+            if value:
+                table[i] += value
+        self.total += other.total
+
+    def nbytes(self) -> int:
+        return self.table.itemsize * len(self.table)
+
+
+class SpaceSaving:
+    """TOP ელემენტები k მთვლელით (stream-summary).
+
+    მთვლელი ყოველთვის 1-ით იზრდება, ამიტომ ელემენტები ინახება ჯგუფებად
+    რაოდენობის მიხედვით და მინიმუმის პოვნა, ჩანაცვლება და ზრდა O(1)-ია.
+    """
+    __slots__ = ("capacity", "counts", "errors", "_groups", "_min")
+
+    def __init__(self, capacity: int = 256):
+        if capacity < 1:
+            raise ValueError("capacity უნდა იყოს დადებითი")
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self._groups = {}
+        self._min = 0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def add(self, key) -> None:
+        counts = self.counts
+        groups = self._groups
+        count = counts.get(key)
+        if count is None:
+            if len(counts) < self.capacity:
+                count = 0
+                self.errors[key] = 0
+            else:
+                """ყველაზე მცირე მთვლელის ჩანაცვლება, მისი მნიშვნელობა ხდება ცდომილება"""
+                count = self._min
+                victim = groups[count].pop()
+                del counts[victim]
+                del self.errors[victim]
+                self.errors[key] = count
+        else:
+            groups[count].discard(key)
+        counts[key] = count + 1
+        group = groups.get(count + 1)
+        if group is None:
+            group = groups[count + 1] = set()
+        group.add(key)
+        if count == 0:
+            self._min = 1
+        elif not groups[count]:
+            del groups[count]
+            if count == self._min:
+                """მთვლელი მხოლოდ 1-ით იზრდება, ამიტომ ახალი მინიმუმი count + 1-ია"""
+                self._min = count + 1
+
+    def top(self, limit: int = 10) -> list:
+        """[(key, count, error)] count-ის კლებით, count - error ზუსტი ქვედა ზღვარია"""
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """შარდების გაერთიანება: ელემენტს, რომელიც ერთ სკეჩში არ არის,
+        ემატება იმ სკეჩის მინიმუმი (თუ სკეჩი სავსეა), შემდეგ რჩება TOP capacity"""
+        own_min = self._min if len(self.counts) >= self.capacity else 0
+        other_min = other._min if len(other.counts) >= other.capacity else 0
+        merged = {}
+        for key in self.counts.keys() | other.counts.keys():
+            count = self.counts.get(key, own_min) + other.counts.get(key, other_min)
+            error = (self.errors.get(key, own_min) + other.errors.get(key, other_min))
+            merged[key] = (count, error)
+        kept = sorted(merged.items(), key=lambda item: item[1][0], reverse=True)[:self.capacity]
+        self.counts = {key: count for key, (count, _) in kept}
+        self.errors = {key: error for key, (_, error) in kept}
+        self._groups = {}
+        for key, count in self.counts.items():
+            self._groups.setdefault(count, set()).add(key)
+        self._min = min(self._groups) if self._groups else 0
+
+    def nbytes(self) -> int:
+        """მიახლოებითი: სამი dict/set ჩანაწერი მთვლელზე"""
+        return 3 * 100 * self.capacity
+
+
+class ListenSketches:
+    """მოსმენების სკეჩები: უნიკალური მსმენელები სიმღერასა და არტისტზე (HLL),
+    მოსმენები Count-Min-ით და TOP სიები Space-Saving-ით.
+
+    HLL იქმნება სიმღერის/არტისტის პირველ მოსმენაზე, ამიტომ მეხსიერება
+    დამოკიდებულია კატალოგის ზომაზე და არა მოვლენების რაოდენობაზე.
+    """
+
+    def __init__(self, precision: int = 10, width: int = 2048, depth: int = 4, top_k: int = 256):
+        self.precision = precision
+        self.song_listeners = {}
+        self.artist_listeners = {}
+        self.song_plays = CountMinSketch(width, depth)
+        self.artist_plays = CountMinSketch(width, depth)
+        self.top_songs = SpaceSaving(top_k)
+        self.top_artists = SpaceSaving(top_k)
+        self._hashes = {}
+
+    def _hash(self, key: str) -> int:
+        """სიმღერისა და არტისტის ჰეშების ქეში (კატალოგის ზომისაა)"""
+        value = self._hashes.get(key)
+        if value is None:
+            value = self._hashes[key] = hash64(key)
+        return value
+
+    def add(self, user_id: str, song_id: str, artist: str) -> None:
+        """მომხმარებლის ჰეში არ ინახება, რომ მეხსიერება მომხმარებლებზე არ გაიზარდოს"""
+        user_hash = hash64(user_id)
+        for sketches, key in ((self.song_listeners, song_id), (self.artist_listeners, artist)):
+            hll = sketches.get(key)
+            if hll is None:
+                hll = sketches[key] = HyperLogLog(self.precision)
+            hll.add_hash(user_hash)
+        self.song_plays.add_hash(self._hash(song_id))
+        self.artist_plays.add_hash(self._hash(artist))
+        self.top_songs.add(song_id)
+        self.top_artists.add(artist)
+
+    def unique_listeners(self, song_id: str) -> int:
+        hll = self.song_listeners.get(song_id)
+        return hll.count() if hll is not None else 0
+
+    def unique_artist_listeners(self, artist: str) -> int:
+        hll = self.artist_listeners.get(artist)
+        return hll.count() if hll is not None else 0
+
+    def merge(self, other: "ListenSketches") -> None:
+        for own, theirs in ((self.song_listeners, other.song_listeners),
+                            (self.artist_listeners, other.artist_listeners)):
+            for key, hll in theirs.items():
+                mine = own.get(key)
+                if mine is None:
+                    mine = own[key] = HyperLogLog(self.precision)
+                mine.merge(hll)
+        self.song_plays.merge(other.song_plays)
+        self.artist_plays.merge(other.artist_plays)
+        self.top_songs.merge(other.top_songs)
+        self.top_artists.merge(other.top_artists)
+
+    def nbytes(self) -> int:
+        hll_bytes = sum(hll.nbytes() for sketches in (self.song_listeners, self.artist_listeners)
+                        for hll in sketches.values())
+        return (hll_bytes + self.song_plays.nbytes() + self.artist_plays.nbytes()
+                + self.top_songs.nbytes() + self.top_artists.nbytes())
@@ -0,0 +1,247 @@
+"""ვერსიიანი ბინარული snapshot.
+
+ფაილი: MAGIC | ვერსია | JSON სათაურის სიგრძე | JSON სათაური | სვეტები (8 ბაიტზე გასწორებული).
+სათაური ინახავს კატალოგს, მომხმარებლებს, ფლეილისტებს (song_id-ების სიებად),
+რეიტინგებს, ID მთვლელებს და ინდექსების მდგომარეობას, სვეტები კი მოსმენების
+ჟურნალს, რომელიც mmap-ით იხსნება, და მომხმარებლების შეფასებების ცხრილს.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from songs import Song, shared_instruments
+from user import User
+from playlist import Playlist
+from event_log import EventLog, ListeningHistoryView
+from ids import IdMap
+from ratings import RatingStore
+
+MAGIC = b"MSWSNAP\0"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<8sIQ")
+_ALIGN = 8
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _typecode(column) -> str:
+    return column.format if isinstance(column, memoryview) else column.typecode
+
+
+def _counter_classes() -> list:
+    return [Song, *Song._genres.values(), User]
+
+
+def _collect_counters() -> dict:
+    counters = {}
+    for cls in _counter_classes():
+        for name, value in vars(cls).items():
+            if name.endswith("_counter") and isinstance(value, int):
+                counters[f"{cls.__name__}.{name}"] = value
+    return counters
+
+
+def _restore_counters(counters: dict) -> None:
+    """მთვლელი არასდროს მცირდება, რომ ამ პროცესში შექმნილ ID-ებს არ დაემთხვეს"""
+    classes = {cls.__name__: cls for cls in _counter_classes()}
+    for key, value in counters.items():
+        class_name, name = key.split(".", 1)
+        cls = classes.get(class_name)
+        if cls is not None:
+            setattr(cls, name, max(getattr(cls, name, 0), value))
+
+
+def _fields(obj, skip: tuple) -> dict:
+    """__slots__-ის (და არსებობის შემთხვევაში __dict__-ის) ველები"""
+    fields = {}
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get("__slots__", ()):
+            if name not in skip and hasattr(obj, name):
+                fields[name] = getattr(obj, name)
+    fields.update((name, value) for name, value in getattr(obj, "__dict__", {}).items()
+                  if name not in skip)
+    return fields
+
+
+def _song_fields(song: Song) -> dict:
+    return _fields(song, ("_system",))
+
+
+def _user_fields(user: User) -> dict:
+    fields = _fields(user, ("_history", "_system", "_system_index"))
+    fields["playlists"] = {name: list(playlist) for name, playlist in user.playlists.items()}
+    return fields
+
+
+def _set_fields(obj, fields: dict) -> None:
+    for name, value in fields.items():
+        setattr(obj, name, value)
+
+
+def save_snapshot(system, path: str) -> None:
+    log = system.events
+    by_user = log._by_user
+    offsets = array("Q", [0])
+    for positions in by_user:
+        offsets.append(offsets[-1] + len(positions))
+    columns = [
+        ("song_index", log.song_index),
+        ("user_index", log.user_index),
+        ("timestamp", log.timestamp),
+        ("user_offsets", offsets),
+        ("user_positions", None),
+        ("time_sorted", log.time_index().sorted_positions()),
+        ("rating_keys", system._ratings.table()[0]),
+        ("rating_values", system._ratings.table()[1]),
+    ]
+
+    sections = {}
+    offset = 0
+    for name, column in columns:
+        if column is None:
+            count, typecode = offsets[-1], "I"
+        else:
+            count, typecode = len(column), _typecode(column)
+        offset = _aligned(offset)
+        sections[name] = [offset, count, typecode]
+        offset += count * array(typecode).itemsize
+
+    header = {
+        "platform_name": system.platform_name,
+        "byteorder": sys.byteorder,
+        "itemsizes": {code: array(code).itemsize for code in "IqQd"},
+        "counters": _collect_counters(),
+        "songs": [{"type": type(song).__name__, "fields": _song_fields(song)}
+                  for song in system.songs.values()],
+        "users": [{"index": user._system_index, "fields": _user_fields(user)}
+                  for user in system.users.values()],
+        "song_ids": list(system._song_ids),
+        "user_ids": list(system._user_ids),
+        "artist_counts": system._artist_counts,
+        "artist_first_seen": system._artist_first_seen,
+        "most_popular_artist": system._most_popular_artist,
+        "pending_listens": {song_idx: [[user._system_index, position] for user, position in pending]
+                            for song_idx, pending in system._pending_listens.items()},
+        "ratings": len(system._ratings),
+        "rating_prior": [system._top_rated.prior, system._top_rated.min_votes],
+        "sections": sections,
+    }
+    encoded = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = _aligned(_PREFIX.size + len(encoded))
+
+    """სვეტები შეიძლება იმავე ფაილის mmap-ს ეკუთვნოდეს (load_snapshot-ის შემდეგ),
+    ამიტომ ვწერთ დროებით ფაილში და მერე ვანაცვლებთ, არა path-ის გადაწერით"""
+    fd, temp_path = tempfile.mkstemp(prefix=".snapshot-", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+            f.write(encoded)
+            f.write(b"\0" * (data_start - _PREFIX.size - len(encoded)))
+            written = 0
+            for name, column in columns:
+                start = sections[name][0]
+                f.write(b"\0" * (start - written))
+                written = start
+                parts = by_user if column is None else [column]
+                for part in parts:
+                    f.write(part)
+                    written += len(part) * part.itemsize
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def load_snapshot(path: str, system_cls):
+    """სათაური იკითხება მაშინვე, ჟურნალის სვეტები კი mmap-ით, გვერდები ზარმაცად"""
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, header_length = _PREFIX.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} არ არის snapshot ფაილი")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"snapshot-ის ვერსია {version} არ არის მხარდაჭერილი")
+    header = json.loads(mapping[_PREFIX.size:_PREFIX.size + header_length].decode("utf-8"))
+    itemsizes = {code: array(code).itemsize for code in "IqQd"}
+    if header["byteorder"] != sys.byteorder or any(header["itemsizes"].get(code, size) != size
+                                                   for code, size in itemsizes.items()):
+        raise ValueError("snapshot სხვა პლატფორმაზეა შექმნილი")
+
+    data_start = _aligned(_PREFIX.size + header_length)
+    view = memoryview(mapping)
+
+    def column(name: str):
+        offset, count, typecode = header["sections"][name]
+        start = data_start + offset
+        return view[start:start + count * itemsizes[typecode]].cast(typecode)
+
+    offsets = column("user_offsets")
+    flat = column("user_positions")
+    by_user = [flat[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+    log = EventLog.from_columns(column("song_index"), column("user_index"), column("timestamp"),
+                                by_user, column("time_sorted"), mapping)
+
+    _restore_counters(header["counters"])
+    system = system_cls(header["platform_name"])
+    system.events = log
+
+    for song_id in header["song_ids"]:
+        system._song_idx(song_id)
+    """მომხმარებლების შეფასებები ძველ snapshot-ებში არ არის"""
+    if "rating_keys" in header["sections"]:
+        system._ratings = RatingStore.from_table(column("rating_keys"), column("rating_values"),
+                                                 header["ratings"])
+        system._top_rated.configure(*header["rating_prior"])
+
+    for rank, record in enumerate(header["songs"]):
+        song_type = Song._genres.get(record["type"], Song)
+        song = song_type.__new__(song_type)
+        _set_fields(song, record["fields"])
+        for name in ("artist", "composer", "era"):
+            if hasattr(song, name):
+                setattr(song, name, sys.intern(getattr(song, name)))
+        if hasattr(song, "instruments"):
+            song.instruments = shared_instruments(song.instruments)
+        song._system = system
+        song._index = system._song_ids.get(song.song_id)
+        system.songs[song.song_id] = song
+        system._song_by_index[song._index] = song
+        system._durations[song._index] = song.duration
+        system._song_rank[song._index] = rank
+        system._place_in_genres(song, None, rank)
+        system._most_played.add(song, rank)
+        system._top_rated.add(song, rank)
+        system._add_to_score_boards(song, rank)
+        system._search.add(song)
+
+    system._ranked_songs = len(system.songs)
+    system._user_ids = IdMap(header["user_ids"])
+    system._user_by_index = [None] * len(system._user_ids)
+
+    for record in header["users"]:
+        user = User.__new__(User)
+        _set_fields(user, record["fields"])
+        user._history = []
+        user._system = None
+        user._system_index = None
+        user._attach(system, record["index"], ListeningHistoryView(log, record["index"], system._song_ids))
+        user.playlists = {name: Playlist(name, song_ids) for name, song_ids in user.playlists.items()}
+        for playlist in user.playlists.values():
+            system._track_playlist(playlist)
+        system.users[user.user_id] = user
+        system._user_by_index[record["index"]] = user
+
+    system._artist_counts = header["artist_counts"]
+    system._artist_first_seen = {artist: tuple(order)
+                                 for artist, order in header["artist_first_seen"].items()}
+    system._most_popular_artist = header["most_popular_artist"]
+    system._pending_listens = {int(song_idx): [(system._user_by_index[user_idx], position)
+                                               for user_idx, position in pending]
+                               for song_idx, pending in header["pending_listens"].items()}
+    return system
@@ -1,26 +1,102 @@
+import sys
+import threading
+
+_instrument_sets = {}
+_id_lock = threading.Lock()
+"""მთვლელების (play_count, რეიტინგი) ზოლოვანი ბლოკები სისტემის გარეთ მყოფი სიმღერებისთვის"""
+_counter_locks = tuple(threading.Lock() for _ in range(64))
+
+
+def counter_lock(song) -> threading.Lock:
+    return _counter_locks[hash(song.song_id) % len(_counter_locks)]
+
+
+def shared_instruments(instruments) -> tuple:
+    """ერთნაირი ინსტრუმენტების ნაკრები ყველა სიმღერაში ერთი უცვლელი tuple-ია"""
+    key = tuple(sys.intern(instrument) for instrument in instruments)
+    return _instrument_sets.setdefault(key, key)
+
+
 class Song:
+    __slots__ = ("song_id", "title", "artist", "_duration", "play_count",
+                 "total_rating", "rating_count", "_system", "_index")
     _song_counter = 0
+    _id_prefix = "S"
+    _id_counter = "_song_counter"
+    _genres = {}
+    _genre_classes = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """ყოველი ქვეკლასი ავტომატურად რეგისტრირდება ჟანრად"""
+        super().__init_subclass__(**kwargs)
+        Song._genres[cls.__name__] = cls
+
+    @classmethod
+    def genre_classes(cls) -> tuple:
+        """ამ კლასის MRO-ში რეგისტრირებული ჟანრები (ქეშირებული)"""
+        genres = Song._genre_classes.get(cls)
+        if genres is None:
+            genres = tuple(klass for klass in cls.__mro__
+                           if Song._genres.get(klass.__name__) is klass)
+            Song._genre_classes[cls] = genres
+        return genres
 
     def __init__(self, title:str, artist:str, duration:int):
-        Song._song_counter += 1
-        self.song_id = f"S{Song._song_counter:03d}"
+        self._system = None
+        self._index = None
+        self.song_id = type(self)._next_song_id()
         self.title = title
-        self.artist = artist
+        self.artist = sys.intern(artist)
         self.duration = duration
         self.play_count = 0
         self.total_rating = 0.0
         self.rating_count = 0
 
+    @classmethod
+    def _next_song_id(cls) -> str:
+        """ID-ს იძლევა კლასი, რომელსაც საკუთარი პრეფიქსი აქვს (KPop(PopSong) -> "P")"""
+        owner = next(klass for klass in cls.__mro__ if "_id_prefix" in vars(klass))
+        with _id_lock:
+            counter = getattr(owner, owner._id_counter) + 1
+            setattr(owner, owner._id_counter, counter)
+        return f"{owner._id_prefix}{counter:03d}"
+
+    @property
+    def duration(self) -> int:
+        return self._duration
+
+    @duration.setter
+    def duration(self, value: int) -> None:
+        with self._lock():
+            self._duration = value
+            if self._system is not None:
+                self._system._on_song_duration_changed(self)
+
+    def _lock(self):
+        """სისტემაში მყოფი სიმღერის ცვლილებებს სისტემა იცავს, დანარჩენს ზოლოვანი ბლოკი"""
+        if self._system is not None:
+            return self._system._song_lock(self)
+        return counter_lock(self)
+
     def play(self) -> None:
-        self.play_count += 1 # სიმღერის დაკვრა
+        with self._lock():
+            self.play_count += 1 # სიმღერის დაკვრა
+            if self._system is not None:
+                self._system._on_song_played(self)
 
-    def add_rating(self, rating:float) -> None:
-        """რეიტინგის ვალიდაცია"""
+    def add_rating(self, rating:float, user=None) -> None:
+        """რეიტინგის ვალიდაცია; იმავე სისტემის user-ის ხელახალი შეფასება წინას ცვლის"""
         try:
             if not(1.0 <= rating <= 5.0):
                 raise ValueError("რეიტინგი უნდა იყოს 1.0-დან 5.0-ის ჩათვლით.")
-            self.total_rating += rating
-            self.rating_count += 1
+            with self._lock():
+                if self._system is not None and user is not None and user._system is self._system:
+                    self._system._rate(user, self, rating)
+                    return
+                self.total_rating += rating
+                self.rating_count += 1
+                if self._system is not None:
+                    self._system._on_song_rated(self)
         except ValueError as e:
             print(f"მოხდა შეცდომა: {e}")
         except TypeError:
@@ -49,11 +125,12 @@ class Song:
         return f"{self.title} - {self.artist}"
 
 class PopSong(Song):
+    __slots__ = ("is_chart_topper",)
     _pop_counter = 0
+    _id_prefix = "P"
+    _id_counter = "_pop_counter"
     def __init__(self, title:str, artist:str, duration: int, is_chart_topper: bool):
         super().__init__(title, artist, duration)
-        PopSong._pop_counter += 1
-        self.song_id = f"P{PopSong._pop_counter:03d}"
         self.is_chart_topper = is_chart_topper
 
     def calculate_popularity(self) -> float:
@@ -63,11 +140,12 @@ class PopSong(Song):
         return "Chart Topper" if self.is_chart_topper else "Popular Track"
 
 class RockSong(Song):
+    __slots__ = ("intensity_level", "has_guitar_solo")
     _rock_counter = 0
+    _id_prefix = "R"
+    _id_counter = "_rock_counter"
     def __init__(self, title:str, artist:str, duration:int, intensity_level:int, has_guitar_solo: bool):
         super().__init__(title, artist, duration)
-        RockSong._rock_counter += 1
-        self.song_id = f"R{RockSong._rock_counter:03d}"
         self.intensity_level = intensity_level
         self.has_guitar_solo = has_guitar_solo
 
@@ -79,14 +157,15 @@ class RockSong(Song):
         return f"High Intensity ({self.intensity_level}/10 | Guitar Solo: {solo})"
 
 class ClassicalSong(Song):
+    __slots__ = ("composer", "era", "instruments")
     _classical_counter = 0
-    def __init__(self, title:str, artist:str, duration:int, composer:str, era:str, instruments: list):
+    _id_prefix = "C"
+    _id_counter = "_classical_counter"
+    def __init__(self, title:str, artist:str, duration:int, composer:str, era:str, instruments):
         super().__init__(title, artist, duration)
-        ClassicalSong._classical_counter +=1
-        self.song_id = f"C{ClassicalSong._classical_counter:03d}"
-        self.composer = composer
-        self.era = era
-        self.instruments = instruments
+        self.composer = sys.intern(composer)
+        self.era = sys.intern(era)
+        self.instruments = shared_instruments(instruments)
 
     def calculate_complexity_score(self) -> float:
         return (self.duration/ 60) * 5 +len(self.instruments) * 10
@@ -1,57 +1,717 @@
-from datetime import datetime
-from songs import Song, PopSong, RockSong, ClassicalSong
+import os
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import nullcontext
+from operator import methodcaller
+from songs import Song, PopSong, RockSong, ClassicalSong, counter_lock
 from user import User
+from leaderboard import PlayCountLeaderboard, RatingLeaderboard, ScoreLeaderboard
+from ingest import (IngestReport, iter_batches, validate_events, validate_ratings,
+                    validate_playlist_adds)
+from ids import IdMap
+from event_log import (EventLog, ListeningHistoryView, month_windows,
+                       to_timestamp, wrapped_window)
+from wrapped import WrappedBatchResult, WrappedCatalog, run_sharded, shard_of
+from snapshot import save_snapshot, load_snapshot
+from analytics import NumpyAnalytics
+from search import SearchIndex
+from sketches import ListenSketches
+from metrics import Metrics
+from recommend import CoListenRecommender
+from ratings import RatingStore
+from report import (ReportStats, ReportSections, PopStats, RockStats, ClassicalStats,
+                    RENDERERS, REPORT_FORMATS)
+
+"""ჟანრის ქულების TOP სიები: სახელი -> (ჟანრი, ქულის მეთოდი, მეორადი ინდექსის ველი, მოსმენით იცვლება).
+methodcaller, რომ ქვეკლასის გადატვირთული მეთოდიც გამოიძახოს"""
+GENRE_SCORES = {
+    "popularity": (PopSong, methodcaller("calculate_popularity"), None, True),
+    "energy": (RockSong, methodcaller("calculate_energy_score"), "intensity_level", False),
+    "complexity": (ClassicalSong, methodcaller("calculate_complexity_score"), "era", False),
+}
+
 
 class StreamingSystem:
     def __init__(self, platform_name: str):
         self.platform_name = platform_name
         self.songs = {}
         self.users = {}
+        """არტისტების ინდექსი მთელი პლატფორმისთვის"""
+        self._artist_counts = {}
+        self._artist_first_seen = {}
+        self._most_popular_artist = None
+        self._pending_listens = {}
+        """მკვრივი ინდექსები: სიმღერები და მომხმარებლები მასივებში, სტრიქონი ID მხოლოდ საზღვარზე"""
+        self.events = EventLog()
+        self._song_ids = IdMap()
+        self._song_by_index = []
+        self._durations = array("q")
+        self._song_rank = array("q")
+        self._user_ids = IdMap()
+        self._user_by_index = []
+        """TOP სიები, რომლებიც ყოველი მოსმენისა და შეფასებისას ახლდება"""
+        self._ranked_songs = 0
+        self._most_played = PlayCountLeaderboard()
+        self._top_rated = RatingLeaderboard()
+        self._score_boards = {name: ScoreLeaderboard(score, by)
+                              for name, (_, score, by, _) in GENRE_SCORES.items()}
+        """ტიპი -> (ყველა ქულის TOP სია, მოსმენით ცვლადი TOP სიები)"""
+        self._boards_by_type = {}
+        """მომხმარებლების შეფასებები (user_idx, song_idx) -> რეიტინგი, ხელახალი შეფასება წინას ცვლის"""
+        self._ratings = RatingStore()
+        """ჟანრების კალათები, გასაღები კლასია"""
+        self._genre_buckets = {}
+        """ფლეილისტები, რომლებშიც სიმღერაა (song_idx -> set), ჯამების განახლებისთვის"""
+        self._song_playlists = {}
+        self._search = SearchIndex(self)
+        """არასავალდებულო სკეჩები (enable_sketches), გამორთულისას None"""
+        self._sketches = None
+        """არასავალდებულო რეკომენდაციები (enable_recommendations), გამორთულისას None"""
+        self._recommender = None
+        """არასავალდებულო მეტრიკები (enable_metrics), გამორთულისას None"""
+        self._metrics = None
+        """ანგარიშის სექციების ქეში ვერსიებით (იხ. report.ReportSections)"""
+        self._report = ReportSections()
 
     def add_song(self, song: Song) -> None:
+        """სიმღერას ერთი მფლობელი სისტემა ჰყავს (song._system), მას მოსმენები ატყობინებს"""
+        if song._system is not None and song._system is not self:
+            raise ValueError(f"სიმღერა {song.song_id} უკვე სხვა სისტემაშია, "
+                             f"ჯერ იქიდან უნდა წაიშალოს (remove_song)")
+        song_idx = self._song_idx(song.song_id)
+        rank = self._song_rank[song_idx]
+        if rank < 0:
+            rank = self._song_rank[song_idx] = self._ranked_songs
+            self._ranked_songs += 1
+        previous = self.songs.get(song.song_id)
+        if previous is not None and previous._system is self:
+            previous._system = None
+            self._report.song_changed(previous)
+        self._report.song_changed(song)
         self.songs[song.song_id] = song
+        song._system = self
+        song._index = song_idx
+        self._song_by_index[song_idx] = song
+        self._durations[song_idx] = song.duration
+        self._place_in_genres(song, previous, rank)
+        self._most_played.remove(rank)
+        self._top_rated.remove(rank)
+        self._most_played.add(song, rank)
+        self._top_rated.add(song, rank)
+        for board in self._score_boards.values():
+            board.remove(rank)
+        self._add_to_score_boards(song, rank)
+        self._search.add(song)
+        if previous is not None and previous is not song and previous.artist != song.artist:
+            """იგივე ID, სხვა არტისტი: მოსმენები ახალ არტისტზე გადადის"""
+            for user, position in self._uncount_song(song_idx, previous.artist):
+                self._count_artist(user, song.artist, position)
+        pending = self._pending_listens.pop(song_idx, None)
+        if pending:
+            sketches = self._sketches
+            for user, position in pending:
+                self._count_artist(user, song.artist, position)
+                if sketches is not None:
+                    sketches.add(user.user_id, song.song_id, song.artist)
+        for playlist in self._song_playlists.get(song_idx, ()):
+            playlist._set_song(song.song_id, song)
+
+    def remove_song(self, song_id: str) -> None:
+        """სიმღერის ამოღება კატალოგიდან; მისი მოსმენები ჟურნალში რჩება და
+        ხელახლა დამატებისას კვლავ ჩაითვლება"""
+        song = self.find_song(song_id)
+        song_idx = song._index
+        rank = self._song_rank[song_idx]
+        del self.songs[song_id]
+        song._system = None
+        self._song_by_index[song_idx] = None
+        self._durations[song_idx] = 0
+        for cls in type(song).genre_classes():
+            self._genre_buckets[cls].remove(song)
+        self._most_played.remove(rank)
+        self._top_rated.remove(rank)
+        for board in self._boards_of(type(song))[0]:
+            board.remove(rank)
+        self._search.remove(song_idx)
+        for playlist in self._song_playlists.get(song_idx, ()):
+            playlist._set_song(song_id, None)
+        self._report.song_changed(song)
+        """ხელახლა დამატებისას ახალი რანგი, რომ თანაბრობის რიგი ჟანრის კალათას ემთხვეოდეს"""
+        self._song_rank[song_idx] = -1
+        listens = self._uncount_song(song_idx, song.artist)
+        if listens:
+            self._pending_listens[song_idx] = listens
+
+    def _uncount_song(self, song_idx: int, artist: str) -> list:
+        """song_idx-ის მოსმენების გამოკლება artist-ის მთვლელებიდან ჟურნალის სრული
+        სკანირების გარეშე; აბრუნებს [(მომხმარებელი, პოზიცია ისტორიაში)]"""
+        log = self.events
+        users = self._user_by_index
+        listens = []
+        by_user = {}
+        for position in log.song_positions(song_idx):
+            user_idx = log.user_index[position]
+            user_position = bisect_left(log.user_positions(user_idx), position)
+            listens.append((users[user_idx], user_position))
+            by_user.setdefault(user_idx, []).append(user_position)
+        if not listens:
+            return listens
+        songs = self._song_by_index
+        for user_idx, positions in by_user.items():
+            user = users[user_idx]
+            first_seen = user._artist_first_seen[artist]
+            if first_seen == positions[0]:
+                """პირველი მოსმენა ამ სიმღერისა იყო: მომდევნო ამავე არტისტის ისტორიაში"""
+                first_seen = None
+                for user_position, other in enumerate(log.user_song_indexes(user_idx)):
+                    song = songs[other]
+                    if other != song_idx and song is not None and song.artist == artist:
+                        first_seen = user_position
+                        break
+            user._uncount_artist(artist, len(positions), first_seen)
+
+        counts = self._artist_counts
+        first = self._artist_first_seen
+        remaining = counts[artist] - len(listens)
+        if remaining:
+            counts[artist] = remaining
+            if first[artist][0] in by_user:
+                first[artist] = min((user._system_index, user._artist_first_seen[artist])
+                                    for user in users
+                                    if user._artist_counts and artist in user._artist_counts)
+        else:
+            del counts[artist]
+            del first[artist]
+        if self._most_popular_artist == artist:
+            self._most_popular_artist = min(counts, key=lambda name: (-counts[name], first[name]),
+                                            default=None)
+        return listens
 
     def add_user(self, user: User) -> None:
+        """მომხმარებელს, როგორც სიმღერას, ერთი მფლობელი სისტემა ჰყავს: მისი ისტორია მის ჟურნალშია"""
+        if user._system is not None and user._system is not self:
+            raise ValueError(f"მომხმარებელი {user.user_id} უკვე სხვა სისტემაშია")
         self.users[user.user_id] = user
+        self._report.user_changed()
+        if user._system is self:
+            return
+        user_idx = self.events.add_user()
+        self._user_ids.add(user.user_id)
+        self._user_by_index.append(user)
+        local_history = user._attach(self, user_idx,
+                                     ListeningHistoryView(self.events, user_idx, self._song_ids))
+        for song_id, clock, day in local_history:
+            self._record_listen(user, song_id, to_timestamp(f"{day}T{clock}"))
+        for playlist in user.playlists.values():
+            self._track_playlist(playlist)
+
+    def _track_playlist(self, playlist) -> None:
+        """ფლეილისტის ჩანაწერები კატალოგის სიმღერებზე გადადის"""
+        playlist._reset()
+        for song_id in playlist:
+            self._on_playlist_add(playlist, song_id)
+
+    def _on_playlist_add(self, playlist, song_id: str) -> None:
+        song_idx = self._song_idx(song_id)
+        self._song_playlists.setdefault(song_idx, set()).add(playlist)
+        playlist._set_song(song_id, self._song_by_index[song_idx])
+        if self._recommender is not None:
+            self._pair_in_playlist(playlist, song_idx)
+
+    def _pair_in_playlist(self, playlist, song_idx: int) -> None:
+        """ფლეილისტში song_idx-მდე მყოფი ბოლო window სიმღერა"""
+        window = []
+        for song_id in playlist:
+            other = self._song_idx(song_id)
+            if other == song_idx:
+                break
+            window.append(other)
+        self._recommender.add_to_playlist(song_idx, window)
+
+    def _on_playlist_remove(self, playlist, song_id: str) -> None:
+        playlists = self._song_playlists.get(self._song_ids.get(song_id))
+        if playlists is not None:
+            playlists.discard(playlist)
+
+    def save_snapshot(self, path: str) -> None:
+        """მთელი სისტემის ბინარული snapshot (იხ. snapshot.py)"""
+        save_snapshot(self, path)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "StreamingSystem":
+        """snapshot-ის გახსნა, მოსმენების ჟურნალი mmap-ით იკითხება"""
+        return load_snapshot(path, cls)
+
+    def _song_idx(self, song_id: str) -> int:
+        """მკვრივი ინდექსი song_id-სთვის, კატალოგში ჯერ არმყოფი სიმღერისთვისაც"""
+        song_idx = self._song_ids.get(song_id)
+        if song_idx is None:
+            song_idx = self._song_ids.add(song_id)
+            self._song_by_index.append(None)
+            self._durations.append(0)
+            self._song_rank.append(-1)
+        return song_idx
+
+    def _listen(self, user: User, song: Song, timestamp: int) -> None:
+        self._record_listen(user, song.song_id, timestamp)
+        song.play()
+
+    def _song_lock(self, song: Song):
+        """ბლოკი, რომლის ქვეშაც სიმღერის მთვლელები და ინდექსები ახლდება"""
+        return counter_lock(song)
+
+    def _user_lock(self, user: User):
+        """ბლოკი მომხმარებლის ცვლილებებისთვის (პრემიუმი, ფლეილისტები); აქ ნაკადები არ არის"""
+        return nullcontext()
+
+    def _record_listen(self, user: User, song_id: str, timestamp: int) -> None:
+        song_idx = self._song_idx(song_id)
+        position = self.events.append(user._system_index, song_idx, timestamp)
+        self._index_listen(user, song_idx, position)
+        self._report.user_listened(user._system_index)
+        if self._recommender is not None:
+            self._recommender.add_listen(user._system_index, song_idx)
+
+    def _user_listening_time(self, user: User) -> int:
+        """კატალოგის გარეთ მყოფი სიმღერის ხანგრძლივობა მასივში 0-ია"""
+        return self._seconds_at(self.events.user_positions(user._system_index))
+
+    def _index_listen(self, user: User, song_idx: int, position: int) -> None:
+        """მოსმენის დარეგისტრირება ინდექსებში O(1)-ში"""
+        song = self._song_by_index[song_idx]
+        if song is None:
+            self._pending_listens.setdefault(song_idx, []).append((user, position))
+            return
+        self._count_artist(user, song.artist, position)
+        if self._sketches is not None:
+            self._sketches.add(user.user_id, song.song_id, song.artist)
+
+    def _place_in_genres(self, song: Song, previous, rank: int) -> None:
+        genres = type(song).genre_classes()
+        if previous is None:
+            for cls in genres:
+                self._genre_buckets.setdefault(cls, []).append(song)
+            return
+        """იგივე ID-ით ჩანაცვლებისას სიმღერა რჩება თავის ადგილას"""
+        for cls, bucket in self._genre_buckets.items():
+            if previous in bucket and cls in genres:
+                bucket[bucket.index(previous)] = song
+            elif previous in bucket:
+                bucket.remove(previous)
+        for cls in genres:
+            bucket = self._genre_buckets.setdefault(cls, [])
+            if song in bucket:
+                continue
+            position = len(bucket)
+            for i, other in enumerate(bucket):
+                if self._song_rank[other._index] > rank:
+                    position = i
+                    break
+            bucket.insert(position, song)
+
+    def ingest_events(self, events, batch_size: int = 10_000) -> IngestReport:
+        """მოვლენების (user_id, song_id, date, rating) მასობრივი ჩატვირთვა.
+
+        ყოველი მოვლენა მოსმენაა, rating=None ნიშნავს შეფასების გარეშე.
+        ყოველი batch ჯერ ვალიდაციას გადის (ingest.validate_events): უცნობი
+        მომხმარებლის ან სიმღერის, ან არასწორი ტიპის თარიღის მოვლენა
+        გამოტოვებულია, არასწორი რეიტინგი უარყოფილია. მიზეზები report.errors-შია, არაფერი იბეჭდება.
+        """
+        report = IngestReport()
+        start = time.perf_counter()
+        for batch in iter_batches(events, batch_size):
+            self._apply_batch(batch, report)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _apply_batch(self, batch: list, report: IngestReport) -> None:
+        """მოსმენის დრო ვალიდაციისას ერთხელ ითვლება, TOP სიები კი სიმღერაზე ერთხელ ახლდება"""
+        report.events += len(batch)
+        valid = validate_events(batch, self.users, self.songs, report.errors)
+        append_event = self.events.append
+        count_artist = self._count_artist
+        sketches = self._sketches
+        recommender = self._recommender
+        user_listened = self._report.user_listened
+        store_rating = self._store_rating
+        played = {}
+        rated = {}
+        for user, song, timestamp, rating in valid:
+            user_idx = user._system_index
+            position = append_event(user_idx, song._index, timestamp)
+            count_artist(user, song.artist, position)
+            user_listened(user_idx)
+            if sketches is not None:
+                sketches.add(user.user_id, song.song_id, song.artist)
+            if recommender is not None:
+                recommender.add_listen(user_idx, song._index)
+            played[song] = played.get(song, 0) + 1
+            if rating is not None:
+                if store_rating(user_idx, song, rating):
+                    rated[song] = True
+                report.ratings += 1
+        for song, plays in played.items():
+            song.play_count += plays
+            self._on_song_played(song)
+            report.listens += plays
+        for song in rated:
+            self._on_song_rated(song)
+
+    def _on_song_played(self, song: Song) -> None:
+        rank = self._song_rank[song._index]
+        self._most_played.update(rank)
+        for board in self._boards_of(type(song))[1]:
+            board.update(rank)
+        self._report.song_played(song)
+
+    def _boards_of(self, song_type) -> tuple:
+        boards = self._boards_by_type.get(song_type)
+        if boards is None:
+            genres = song_type.genre_classes()
+            scored = [(self._score_boards[name], on_play) for name, (genre, _, _, on_play)
+                      in GENRE_SCORES.items() if genre in genres]
+            boards = self._boards_by_type[song_type] = (tuple(board for board, _ in scored),
+                                                        tuple(board for board, on_play in scored if on_play))
+        return boards
+
+    def _add_to_score_boards(self, song: Song, rank: int) -> None:
+        """ენერგია და სირთულე ერთხელ ითვლება აქ, პოპულარობა კი ყოველ მოსმენაზე ახლდება"""
+        for board in self._boards_of(type(song))[0]:
+            board.add(song, rank)
+
+    def ingest_ratings(self, ratings, batch_size: int = 10_000) -> IngestReport:
+        """შეფასებების (user_id, song_id, rating) მასობრივი ჩატვირთვა მოსმენების გარეშე.
+
+        TOP რეიტინგი batch-ში სიმღერაზე ერთხელ ახლდება. უარყოფილი
+        ჩანაწერები (ingest.validate_ratings) report.errors-შია.
+        """
+        report = IngestReport()
+        start = time.perf_counter()
+        for batch in iter_batches(ratings, batch_size):
+            self._apply_ratings(batch, report)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _apply_ratings(self, batch: list, report: IngestReport) -> None:
+        report.events += len(batch)
+        store_rating = self._store_rating
+        rated = {}
+        for user, song, rating in validate_ratings(batch, self.users, self.songs, report.errors):
+            if store_rating(user._system_index, song, rating):
+                rated[song] = True
+            report.ratings += 1
+        for song in rated:
+            self._on_song_rated(song)
+
+    def ingest_playlist_adds(self, rows, batch_size: int = 10_000) -> IngestReport:
+        """ფლეილისტებში (user_id, playlist_name, song_id) მასობრივი დამატება.
+        უცნობი მომხმარებელი/სიმღერა, არარსებული ფლეილისტი და დუბლიკატი
+        (ingest.validate_playlist_adds) report.errors-შია, არაფერი იბეჭდება."""
+        report = IngestReport()
+        start = time.perf_counter()
+        for batch in iter_batches(rows, batch_size):
+            self._apply_playlist_adds(batch, report)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def _apply_playlist_adds(self, batch: list, report: IngestReport) -> None:
+        report.events += len(batch)
+        for playlist, song in validate_playlist_adds(batch, self.users, self.songs, report.errors):
+            playlist.add(song)
+            self._on_playlist_add(playlist, song.song_id)
+            report.playlist_adds += 1
+
+    def _rate(self, user: User, song: Song, rating: float) -> None:
+        """მომხმარებლის შეფასება (ვალიდაცია Song.add_rating-შია)"""
+        if self._store_rating(user._system_index, song, rating):
+            self._on_song_rated(song)
+
+    def _store_rating(self, user_idx: int, song: Song, rating: float) -> bool:
+        """ხელახალი შეფასება ჯამში წინას ცვლის O(1)-ში და რაოდენობას არ ზრდის;
+        აბრუნებს True-ს, თუ სიმღერის ჯამი შეიცვალა"""
+        old = self._ratings.set(user_idx, song._index, rating)
+        if old is None:
+            song.total_rating += rating
+            song.rating_count += 1
+        elif old != rating:
+            song.total_rating += rating - old
+        else:
+            return False
+        return True
+
+    def _on_song_rated(self, song: Song) -> None:
+        self._top_rated.update(self._song_rank[song._index])
+        self._report.song_rated(song)
+
+    def _on_user_changed(self, user: User) -> None:
+        """პრემიუმის ან გადასახადის ცვლილება"""
+        self._report.user_changed()
+
+    def _on_song_duration_changed(self, song: Song) -> None:
+        """სირთულე ხანგრძლივობაზეა დამოკიდებული"""
+        self._report.song_changed(song)
+        rank = self._song_rank[song._index]
+        for board in self._boards_of(type(song))[0]:
+            board.update(rank)
+        delta = song.duration - self._durations[song._index]
+        self._durations[song._index] = song.duration
+        for playlist in self._song_playlists.get(song._index, ()):
+            playlist._duration_changed(song, delta)
+
+    def _count_artist(self, user: User, artist: str, position: int) -> None:
+        user._count_artist(artist, position)
+        count = self._artist_counts.get(artist, 0) + 1
+        self._artist_counts[artist] = count
+        """თანაბრობისას max(...) ირჩევს არტისტს, რომელიც სკანირებისას პირველი შეხვდა"""
+        order = (user._system_index, position)
+        first_seen = self._artist_first_seen.get(artist)
+        if first_seen is None or order < first_seen:
+            self._artist_first_seen[artist] = order
+        best = self._most_popular_artist
+        if best is None or best == artist:
+            self._most_popular_artist = artist
+            return
+        best_count = self._artist_counts[best]
+        if count > best_count or (count == best_count and
+                                  self._artist_first_seen[artist] < self._artist_first_seen[best]):
+            self._most_popular_artist = artist
+
+    def enable_sketches(self, precision: int = 10, width: int = 2048, depth: int = 4,
+                        top_k: int = 256) -> ListenSketches:
+        """ფიქსირებული მეხსიერების სკეჩების ჩართვა (იხ. sketches.py), არსებული ჟურნალით.
+
+        კატალოგიდან წაშლა სკეჩებზე არ აისახება, ისინი მხოლოდ ემატება.
+        """
+        sketches = ListenSketches(precision, width, depth, top_k)
+        song_index = self.events.song_index
+        for position, user_idx in enumerate(self.events.user_index):
+            song = self._song_by_index[song_index[position]]
+            if song is not None:
+                sketches.add(self._user_by_index[user_idx].user_id, song.song_id, song.artist)
+        self._sketches = sketches
+        return sketches
+
+    def enable_recommendations(self, window: int = 20, max_neighbors: int = 100,
+                               cache_size: int = 20, stale_after: int = 10_000) -> CoListenRecommender:
+        """თანამოსმენის რეკომენდაციების ჩართვა (იხ. recommend.py), არსებული ისტორიითა და ფლეილისტებით"""
+        recommender = CoListenRecommender(window, max_neighbors, cache_size, stale_after)
+        for user in self._user_by_index:
+            user_idx = user._system_index
+            for song_idx in self.events.user_song_indexes(user_idx):
+                recommender.add_listen(user_idx, song_idx)
+        for user in self._user_by_index:
+            for playlist in user.playlists.values():
+                previous = []
+                for song_id in playlist:
+                    song_idx = self._song_idx(song_id)
+                    recommender.add_to_playlist(song_idx, previous)
+                    previous.append(song_idx)
+        self._recommender = recommender
+        return recommender
+
+    def _require_recommender(self) -> CoListenRecommender:
+        if self._recommender is None:
+            raise RuntimeError("რეკომენდაციები გამორთულია, გამოიძახეთ enable_recommendations()")
+        return self._recommender
+
+    def similar_songs(self, song_id: str, limit: int = 10) -> list:
+        """სიმღერები, რომლებსაც song_id-ის მსმენელები ყველაზე ხშირად უსმენენ"""
+        recommender = self._require_recommender()
+        song = self.find_song(song_id)
+        ranked = recommender.neighbors(song._index, max(limit, recommender.cache_size))
+        return self._catalog_songs(ranked, limit)
+
+    def recommend_songs(self, user_id: str, limit: int = 10) -> list:
+        """მომხმარებლისთვის ჯერ მოუსმენელი სიმღერები მისი ბოლო მოსმენების მეზობლებიდან"""
+        recommender = self._require_recommender()
+        user_idx = self.find_user(user_id)._system_index
+        ranked = recommender.recommend(user_idx, lambda: self.events.user_song_indexes(user_idx),
+                                       max(limit, recommender.cache_size))
+        return self._catalog_songs(ranked, limit)
+
+    def _catalog_songs(self, ranked: list, limit: int) -> list:
+        """კატალოგიდან წაშლილი სიმღერები გამოტოვდება"""
+        songs = []
+        for _, song_idx in ranked:
+            song = self._song_by_index[song_idx]
+            if song is not None:
+                songs.append(song)
+                if len(songs) == limit:
+                    break
+        return songs
+
+    @property
+    def sketches(self):
+        return self._sketches
 
     def find_song(self, song_id:str):
         if song_id not in self.songs:
             raise KeyError(f"სიმღერა {song_id} არ მოიძებნა")
         return self.songs.get(song_id)
 
+    def search_songs(self, query: str, limit: int = 10, prefix: bool = True) -> list:
+        """ძიება სათაურით, არტისტით ან კომპოზიტორით, პოპულარობის მიხედვით დალაგებული"""
+        return self._search.search(query, limit, prefix)
+
     def find_user(self, user_id:str):
         if user_id not in self.users:
             raise KeyError(f"მომხმარებელი ID-ით {user_id} არ მოიძებნა")
         return self.users.get(user_id)
 
     def get_songs_by_genre(self, genre:str) -> list:
-        genres = {
-            "PopSong": PopSong,
-            "RockSong": RockSong,
-            "ClassicalSong": ClassicalSong,
-        }
-        if genre not in genres:
+        """აბრუნებს კალათას კოპირების გარეშე, არ შეცვალოთ"""
+        genre_type = Song._genres.get(genre)
+        if genre_type is None:
             return []
+        return self._genre_buckets.get(genre_type, [])
 
-        genre_type = genres[genre]
-        return [song for song in self.songs.values() if isinstance(song, genre_type)]
+    def get_genre_count(self, genre:str) -> int:
+        return len(self.get_songs_by_genre(genre))
 
     def get_top_rated_songs(self, limit: int=10) -> list:
-        songs = []
-        for song in self.songs.values():
-            if song.rating_count >0:
-                songs.append(song)
-
-        songs.sort(key=lambda song: song.get_average_rating(), reverse=True)
-        return songs[:limit]
+        return self._top_rated.top(limit)
+
+    def get_user_rating(self, user_id: str, song_id: str):
+        """მომხმარებლის ბოლო შეფასება ან None"""
+        user = self.find_user(user_id)
+        return self._ratings.get(user._system_index, self.find_song(song_id)._index)
+
+    def set_rating_prior(self, prior: float = 3.0, min_votes: int = 5) -> None:
+        """TOP რეიტინგის ბაიესური ქულა: min_votes ვირტუალური შეფასება prior მნიშვნელობით.
+        min_votes=0 ალაგებს უბრალო საშუალოთი."""
+        self._top_rated.configure(prior, min_votes)
+        self._report.mark(("top_rated",))
+
+    def get_top_scored_songs(self, score: str, limit: int = 10, value=None, min_value=None,
+                             max_value=None) -> list:
+        """ჟანრის ქულით TOP (GENRE_SCORES: "popularity", "energy", "complexity"), O(K).
+        value/min_value/max_value ფილტრავს მეორადი ინდექსით (intensity_level, era)."""
+        board = self._score_boards.get(score)
+        if board is None:
+            raise KeyError(f"უცნობი ქულა: {score}")
+        return board.top(limit, value, min_value, max_value)
+
+    def get_top_pop_songs(self, limit: int = 10) -> list:
+        return self.get_top_scored_songs("popularity", limit)
+
+    def get_top_energy_rock(self, limit: int = 10, min_intensity: int = None) -> list:
+        return self.get_top_scored_songs("energy", limit, min_value=min_intensity)
+
+    def get_most_complex_classical(self, limit: int = 10, era: str = None) -> list:
+        return self.get_top_scored_songs("complexity", limit, value=era)
+
+    def rescore_song(self, song_id: str) -> None:
+        """ქულების ხელახლა დათვლა ველების (is_chart_topper, intensity_level, era, ...)
+        პირდაპირი ცვლილების შემდეგ; ისინი ავტომატურად არ აღირიცხება"""
+        song = self.find_song(song_id)
+        rank = self._song_rank[song._index]
+        for board in self._boards_of(type(song))[0]:
+            board.update(rank)
+        self._report.song_changed(song)
 
     def get_most_played_songs(self, limit: int=10) -> list:
-        songs = []
-        for song in self.songs.values():
-            songs.append(song)
+        return self._most_played.top(limit)
+
+    def _window_positions(self, start, end, user_id: str = None):
+        user_idx = None if user_id is None else self.find_user(user_id)._system_index
+        return self.events.between(to_timestamp(start), to_timestamp(end), user_idx)
+
+    def get_top_artists(self, start, end, limit: int = 5, user_id: str = None) -> list:
+        """[(არტისტი, მოსმენები)] [start, end) შუალედში, მთელი პლატფორმის ან ერთი მომხმარებლის"""
+        songs = self._song_by_index
+        song_index = self.events.song_index
+        counts = {}
+        for position in self._window_positions(start, end, user_id):
+            song = songs[song_index[position]]
+            if song is not None:
+                counts[song.artist] = counts.get(song.artist, 0) + 1
+        return sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def get_top_songs(self, start, end, limit: int = 5, user_id: str = None) -> list:
+        """[(სიმღერა, მოსმენები)] [start, end) შუალედში"""
+        songs = self._song_by_index
+        song_index = self.events.song_index
+        counts = {}
+        for position in self._window_positions(start, end, user_id):
+            song_idx = song_index[position]
+            counts[song_idx] = counts.get(song_idx, 0) + 1
+        ranked = sorted(((songs[song_idx], count) for song_idx, count in counts.items()
+                         if songs[song_idx] is not None), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def get_listening_time(self, start, end, user_id: str = None) -> int:
+        """მოსმენილი წამები [start, end) შუალედში"""
+        return self._seconds_at(self._window_positions(start, end, user_id))
+
+    def _seconds_at(self, positions) -> int:
+        durations = self._durations
+        song_index = self.events.song_index
+        total = 0
+        for position in positions:
+            total += durations[song_index[position]]
+        return total
+
+    def get_monthly_rollup(self, start, end, user_id: str = None) -> dict:
+        """{"YYYY-MM": {"listens": ..., "seconds": ...}} თვეების მიხედვით"""
+        rollup = {}
+        for month, month_start, month_end in month_windows(to_timestamp(start), to_timestamp(end)):
+            positions = self._window_positions(month_start, month_end, user_id)
+            rollup[month] = {"listens": len(positions), "seconds": self._seconds_at(positions)}
+        return rollup
+
+    def get_wrapped(self, year: int, user_id: str = None, limit: int = 5) -> dict:
+        """წლის შეჯამება (Wrapped) მომხმარებლისთვის ან მთელი პლატფორმისთვის"""
+        start, end = wrapped_window(year)
+        return {
+            "year": year,
+            "top_artists": self.get_top_artists(start, end, limit, user_id),
+            "top_songs": self.get_top_songs(start, end, limit, user_id),
+            "seconds": self.get_listening_time(start, end, user_id),
+            "months": self.get_monthly_rollup(start, end, user_id),
+        }
 
-        songs.sort(key=lambda song: song.play_count, reverse=True)
-        return songs[:limit]
+    def generate_wrapped_batch(self, output_dir: str, year: int = None,
+                               workers: int = None, shards: int = None) -> WrappedBatchResult:
+        """ყველა მომხმარებლის Wrapped პროცესების პულში, შარდებად user_id-ის მიხედვით.
+
+        worker-ები იღებენ მხოლოდ ხანგრძლივობებს და არტისტებს სიმღერის ინდექსით,
+        თითოეული მომხმარებლისთვის წერენ wrapped_<user_id>.json-ს, ჯამები კი
+        პლატფორმის შედეგად ერთიანდება.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        workers = workers or os.cpu_count() or 1
+        buckets, catalog = self._wrapped_buckets(year, shards or workers * 4)
+        return run_sharded([bucket for bucket in buckets if bucket], output_dir, catalog, workers)
+
+    def _wrapped_buckets(self, year: int, shard_count: int) -> tuple:
+        """worker-ების შარდები და კატალოგი; ამატებს ფლეილისტების უცნობ song_id-ებს IdMap-ში"""
+        buckets = [[] for _ in range(shard_count)]
+        song_index = self.events.song_index
+        window = wrapped_window(year) if year is not None else None
+        for user in self.users.values():
+            if window is None:
+                positions = self.events.user_positions(user._system_index)
+            else:
+                positions = self.events.between(window[0], window[1], user._system_index)
+            playlists = {name: array("I", (self._song_idx(song_id) for song_id in song_ids))
+                         for name, song_ids in user.playlists.items()}
+            buckets[shard_of(user.user_id, shard_count)].append({
+                "user_id": user.user_id,
+                "username": user.username,
+                "songs": array("I", (song_index[position] for position in positions)),
+                "playlists": playlists,
+            })
+        catalog = WrappedCatalog(
+            list(self._song_ids),
+            self._durations,
+            [song.artist if song is not None else None for song in self._song_by_index],
+        )
+        return buckets, catalog
+
+    def numpy_analytics(self) -> NumpyAnalytics:
+        """ვექტორული ანალიტიკა მიმდინარე მდგომარეობის ასლზე (საჭიროა numpy)"""
+        return NumpyAnalytics(self)
 
     def get_total_premium_revenue(self) -> float:
         total_premium_revenue = 0
@@ -61,119 +721,130 @@ class StreamingSystem:
         return total_premium_revenue
 
     def get_most_popular_artist(self) -> str:
+        most_popular, plays = self.get_most_popular_artist_plays()
+        if most_popular is None:
+            return "მონაცემები არ არის ხელმისაწვდომი"
+        return (f"{most_popular} ({plays} მოსმენა)")
+
+    def get_most_popular_artist_plays(self) -> tuple:
+        """(არტისტი, მოსმენები) ან (None, 0), თუ მოსმენები ჯერ არ არის"""
+        most_popular = self._most_popular_artist
+        if most_popular is None:
+            return None, 0
+        return most_popular, self._artist_counts[most_popular]
+
+    def enable_metrics(self, sample_size: int = 1024, profile_report=None) -> Metrics:
+        """ოპერაციების გაზომვის ჩართვა (იხ. metrics.py).
+
+        profile_report=True ან ფაილის გზა generate_report-ს cProfile-ით ზომავს.
+        """
+        if self._metrics is None:
+            self._metrics = Metrics(sample_size)
+            self._metrics.instrument(self)
+        self._metrics.profile_report = profile_report
+        return self._metrics
+
+    def disable_metrics(self) -> None:
+        """მეთოდები უბრუნდება კლასისას, ასე რომ გამორთულისას დამატებითი ხარჯი არ არის"""
+        if self._metrics is not None:
+            self._metrics.uninstrument(self)
+            self._metrics = None
+
+    def metrics(self) -> dict:
+        """ოპერაცია -> {calls, total_s, mean_us, p50_us, p90_us, p99_us, max_us, items}"""
+        return self._metrics.snapshot() if self._metrics is not None else {}
+
+    def read(self, func):
+        """func(self)-ის შესრულება თანმიმდევრულ მდგომარეობაზე (იხ. ConcurrentStreamingSystem)"""
+        return func(self)
+
+    def generate_report(self, filename:str, fmt: str = None) -> None:
+        """ფინალური ანგარიშის დაბეჭდვა; fmt - "text", "json", "csv" ან რეგისტრირებული
+        რენდერერი (ნაგულისხმევად ფაილის გაფართოებით, სხვა შემთხვევაში text)"""
         try:
-            artist_counts = {}
-            for user in self.users.values():
-                for item in user.listening_history:
-                    if len(item) >= 3:
-                        song_id, _, _, = item
-                    elif len(item) >= 1:
-                        song_id = item[0]
-                    else:
-                        continue
-
-                    if song_id in self.songs:
-                        artist = self.songs[song_id].artist
-                        artist_counts[artist] = artist_counts.get(artist, 0) + 1
-
-            if not artist_counts:
-                return "მონაცემები არ არის ხელმისაწვდომი"
-
-            most_popular = max(artist_counts, key=artist_counts.get)
-            return (f"{most_popular} ({artist_counts[most_popular]} მოსმენა)")
-        except Exception as e:
-            print(f"შეცდომა: {e}")
-
-    def generate_report(self, filename:str) -> None:
-        """ფინალური ანგარიშის დაბეჭდვა"""
-        try:
-            with open(filename, "w", encoding = "utf-8") as f:
-                f.write("="*65 +"\n")
-                f.write(f"    {self.platform_name} - ანგარიში\n")
-                f.write("="*65 +"\n")
-                f.write(f"თარიღი: {datetime.now().strftime('%Y-%m-%d')}\n\n")
-
-                """სიმღერების სტატისტიკა"""
-                pop_songs = self.get_songs_by_genre("PopSong")
-                rock_songs = self.get_songs_by_genre("RockSong")
-                classic_songs = self.get_songs_by_genre("ClassicalSong")
-
-                f.write("სიმღერების სტატისტიკა:\n")
-                f.write("-"*24 +"\n")
-                f.write(f"ჯამური სიმღერები: {len(self.songs)}\n")
-                f.write(f"  -პოპ: {len(pop_songs)}\n")
-                f.write(f"  -როკ: {len(rock_songs)}\n")
-                f.write(f"  -კლასიკური: {len(classic_songs)}\n")
-
-                """მომხმარებლების სტატისტიკა"""
-                premium_users = [user for user in self.users.values() if user.is_premium]
-                free_users = [user for user in self.users.values() if not user.is_premium]
-
-                f.write("მომხმარებლების სტატისტიკა:\n")
-                f.write("-"*27 +"\n")
-                f.write(f"რეგისტრირებული მომხმარებლები: {len(self.users)}\n")
-                f.write(f"  -პრემიუმ აბონენტები: {len(premium_users)}\n")
-                f.write(f"  -უფასო მომხმარებლები: {len(free_users)}\n")
-
-                """ფინანსური ანგარიში"""
-                revenue = self.get_total_premium_revenue()
-                f.write("ფინანსური ანგარიში:\n")
-                f.write("-"*19+"'\n")
-                f.write(f"ყოველთვიური შემოსავალი პრემიუმებიდან: {revenue:.2f} ლარი\n")
-                f.write(f"ყველაზე პოპულარული არტისტი: {self.get_most_popular_artist()}\n\n")
-
-                """TOP 10 სიმღერა რეიტინგით"""
-                f.write("TOP 10 სიმღერა (რეიტინგით):\n")
-                f.write("-"*29+"\n")
-                top_rated = self.get_top_rated_songs(10)
-                for idx, song in enumerate(top_rated, 1):
-                    avg = song.get_average_rating()
-                    f.write(f"{idx}. {song.title} - {song.artist} ⭐ {avg:.1f}/5.0" 
-                            f"({song.rating_count} რეიტინგი)\n")
-                f.write("\n")
-
-                """TOP 10 სიმღერა მოსმენებით"""
-                f.write("TOP 10 სიმღერა (მოსმენებით):\n")
-                f.write("-"*30+"\n")
-                most_played = self.get_most_played_songs(10)
-                for idx, song in enumerate(most_played, 1):
-                    f.write(f"{idx}. {song.title} - {song.artist} 🎵 {song.play_count:,} მოსმენა\n")
-                f.write("\n")
-
-                """TOP 5 მომხმარებელი"""
-                f.write("TOP 5 მომხმარებელი (მოსმენილი დრო):\n")
-                f.write("-"*36+"\n")
-                users_with_time = []
-                for user in self.users.values():
-                    total_seconds = user.get_total_listening_time(self.songs)
-                    hours = total_seconds // 3600
-                    users_with_time.append((user, hours))
-
-                users_with_time.sort(key=lambda x: x[1], reverse=True)
-                for i, (user, hours) in enumerate(users_with_time[:5], 1):
-                    status = "Premium" if user.is_premium else "Free"
-                    f.write(f"{i}. {user.username} - {hours:.1f} საათი ({status})\n")
-                f.write("\n")
-
-                """სტატისტიკა ჟანრების მიხედვით"""
-                f.write("დეტალური სტატისტიკა ჟანრების მიხედვით:\n")
-                f.write("-"*41+"\n")
-
-                self._write_pop_section(f, pop_songs)
-                self._write_rock_section(f, rock_songs)
-                self._write_classical_section(f, classic_songs)
-
-                f.write("="*65 +"\n")
-                f.write("           ანგარიშის დასასრული\n")
-                f.write("="*65 +"\n")
+            renderer = RENDERERS[fmt or REPORT_FORMATS.get(os.path.splitext(filename)[1].lower(), "text")]
+            stats = self._refresh_report()
+            with open(filename, "w", encoding = "utf-8", buffering = 1 << 16) as f:
+                self._render_report(f, stats, renderer)
             print(f"ანგარიში წარმატებით შეიქმნა: {filename}")
         except PermissionError as e:
             print(f"შეცდომა, თქვენ არ გაქვთ წვდომა ამ ფაილზე, {e}")
         except Exception as e:
             print(f" შეცდომა, {e}")
 
-    def _write_pop_section(self, f, pop_songs):
+    def invalidate_report(self) -> None:
+        """ანგარიშის ყველა სექციის ხელახლა გამოთვლა, მაგ. სიმღერის ან მომხმარებლის
+        ველების პირდაპირი ცვლილების შემდეგ (ისინი dirty-აღრიცხვაში არ ხვდება)"""
+        self._report.invalidate()
+
+    def _refresh_report(self) -> ReportStats:
+        """მხოლოდ ძველი სექციები ითვლება, თანმიმდევრულ მდგომარეობაზე (read)"""
+        computed = self.read(self._report.compute)
+        self._report.commit(computed)
+        return self._report.model()
+
+    def _render_report(self, f, stats: ReportStats, renderer=None) -> None:
+        self._report.write(self, renderer or RENDERERS["text"], f, stats)
+
+    def _write_song_stats_section(self, f, stats: ReportStats):
+        """სიმღერების სტატისტიკა"""
+        f.write("სიმღერების სტატისტიკა:\n")
+        f.write("-"*24 +"\n")
+        f.write(f"ჯამური სიმღერები: {stats.total_songs}\n")
+        f.write(f"  -პოპ: {stats.genre_counts['PopSong']}\n")
+        f.write(f"  -როკ: {stats.genre_counts['RockSong']}\n")
+        f.write(f"  -კლასიკური: {stats.genre_counts['ClassicalSong']}\n")
+
+    def _write_user_stats_section(self, f, stats: ReportStats):
+        """მომხმარებლების სტატისტიკა"""
+        f.write("მომხმარებლების სტატისტიკა:\n")
+        f.write("-"*27 +"\n")
+        f.write(f"რეგისტრირებული მომხმარებლები: {stats.total_users}\n")
+        f.write(f"  -პრემიუმ აბონენტები: {stats.premium_users}\n")
+        f.write(f"  -უფასო მომხმარებლები: {stats.free_users}\n")
+
+    def _write_finance_section(self, f, stats: ReportStats):
+        """ფინანსური ანგარიში"""
+        f.write("ფინანსური ანგარიში:\n")
+        f.write("-"*19+"'\n")
+        f.write(f"ყოველთვიური შემოსავალი პრემიუმებიდან: {stats.revenue:.2f} ლარი\n")
+        f.write(f"ყველაზე პოპულარული არტისტი: {stats.most_popular_artist}\n\n")
+
+    def _write_top_rated_section(self, f, stats: ReportStats):
+        """TOP 10 სიმღერა რეიტინგით"""
+        f.write("TOP 10 სიმღერა (რეიტინგით):\n")
+        f.write("-"*29+"\n")
+        for idx, song in enumerate(stats.top_rated, 1):
+            avg = song.get_average_rating()
+            f.write(f"{idx}. {song.title} - {song.artist} ⭐ {avg:.1f}/5.0" 
+                    f"({song.rating_count} რეიტინგი)\n")
+        f.write("\n")
+
+    def _write_most_played_section(self, f, stats: ReportStats):
+        """TOP 10 სიმღერა მოსმენებით"""
+        f.write("TOP 10 სიმღერა (მოსმენებით):\n")
+        f.write("-"*30+"\n")
+        for idx, song in enumerate(stats.most_played, 1):
+            f.write(f"{idx}. {song.title} - {song.artist} 🎵 {song.play_count:,} მოსმენა\n")
+        f.write("\n")
+
+    def _write_top_listeners_section(self, f, stats: ReportStats):
+        """TOP 5 მომხმარებელი"""
+        f.write("TOP 5 მომხმარებელი (მოსმენილი დრო):\n")
+        f.write("-"*36+"\n")
+        for i, (user, hours) in enumerate(stats.top_listeners, 1):
+            status = "Premium" if user.is_premium else "Free"
+            f.write(f"{i}. {user.username} - {hours:.1f} საათი ({status})\n")
+        f.write("\n")
+
+    def _write_genres_title(self, f, stats: ReportStats):
+        """სტატისტიკა ჟანრების მიხედვით"""
+        f.write("დეტალური სტატისტიკა ჟანრების მიხედვით:\n")
+        f.write("-"*41+"\n")
+
+    def _write_pop_section(self, f, pop_stats: PopStats):
         """Pop სექცია"""
+        pop_songs = pop_stats.songs
         f.write("🎵 POP ᲛᲣᲡᲘᲙᲐ (PopSong):\n")
         f.write(f"   ჯამური სიმღერები: {len(pop_songs)}\n\n")
         f.write("   სიმღერების სია:\n")
@@ -185,16 +856,13 @@ class StreamingSystem:
             f.write(f"     მოსმენები: {song.play_count:,} | რეიტინგი: "
                     f"{song.get_average_rating():.1f}/5.0\n")
 
-        total_plays = sum(s.play_count for s in pop_songs)
-        avg_rating = sum(s.get_average_rating() for s in pop_songs) / len(pop_songs) if pop_songs else 0
-        chart_toppers = sum(1 for s in pop_songs if s.is_chart_topper)
+        f.write(f"\n   ჯამური მოსმენები: {pop_stats.total_plays:,}\n")
+        f.write(f"   საშუალო რეიტინგი: {pop_stats.avg_rating:.1f}/5.0\n")
+        f.write(f"   Chart Toppers: {pop_stats.chart_toppers}\n\n")
 
-        f.write(f"\n   ჯამური მოსმენები: {total_plays:,}\n")
-        f.write(f"   საშუალო რეიტინგი: {avg_rating:.1f}/5.0\n")
-        f.write(f"   Chart Toppers: {chart_toppers}\n\n")
-
-    def _write_rock_section(self, f, rock_songs):
+    def _write_rock_section(self, f, rock_stats: RockStats):
         """როკ სექცია"""
+        rock_songs = rock_stats.songs
         f.write("🎸 როკ ᲛᲣᲡᲘᲙᲐ (RockSong):\n")
         f.write(f"   ჯამური სიმღერები: {len(rock_songs)}\n\n")
         f.write("   სიმღერების სია:\n")
@@ -206,18 +874,14 @@ class StreamingSystem:
             f.write(f"     მოსმენები: {song.play_count:,} | რეიტინგი: "
                     f"{song.get_average_rating():.1f}/5.0\n")
 
-        total_plays = sum(s.play_count for s in rock_songs)
-        avg_rating = sum(s.get_average_rating() for s in rock_songs) / len(rock_songs) if rock_songs else 0
-        avg_intensity = sum(s.intensity_level for s in rock_songs) / len(rock_songs) if rock_songs else 0
-        guitar_solos = sum(1 for s in rock_songs if s.has_guitar_solo)
-
-        f.write(f"\n   ჯამური მოსმენები: {total_plays:,}\n")
-        f.write(f"   საშუალო რეიტინგი: {avg_rating:.1f}/5.0\n")
-        f.write(f"   საშუალო ინტენსივობა: {avg_intensity:.1f}/10\n")
-        f.write(f"   Guitar Solos: {guitar_solos}\n\n")
+        f.write(f"\n   ჯამური მოსმენები: {rock_stats.total_plays:,}\n")
+        f.write(f"   საშუალო რეიტინგი: {rock_stats.avg_rating:.1f}/5.0\n")
+        f.write(f"   საშუალო ინტენსივობა: {rock_stats.avg_intensity:.1f}/10\n")
+        f.write(f"   Guitar Solos: {rock_stats.guitar_solos}\n\n")
 
-    def _write_classical_section(self, f, classical_songs):
+    def _write_classical_section(self, f, classical_stats: ClassicalStats):
         """კლასიკური სექცია"""
+        classical_songs = classical_stats.songs
         f.write("🎻 ᲙᲚᲐᲡᲘᲙᲣᲠᲘ ᲛᲣᲡᲘᲙᲐ (ClassicalSong):\n")
         f.write(f"   ჯამური სიმღერები: {len(classical_songs)}\n\n")
         f.write("   სიმღერების სია:\n")
@@ -230,18 +894,9 @@ class StreamingSystem:
             f.write(f"     მოსმენები: {song.play_count:,} | რეიტინგი: "
                     f"{song.get_average_rating():.1f}/5.0\n")
 
-        total_plays = sum(s.play_count for s in classical_songs)
-        avg_rating = sum(s.get_average_rating() for s in classical_songs) / len(
-            classical_songs) if classical_songs else 0
-
-        """ეპოქების მიხედვით"""
-        era_counts = {}
-        for song in classical_songs:
-            era_counts[song.era] = era_counts.get(song.era, 0) + 1
-
-        f.write(f"\n   ჯამური მოსმენები: {total_plays:,}\n")
-        f.write(f"   საშუალო რეიტინგი: {avg_rating:.1f}/5.0\n")
+        f.write(f"\n   ჯამური მოსმენები: {classical_stats.total_plays:,}\n")
+        f.write(f"   საშუალო რეიტინგი: {classical_stats.avg_rating:.1f}/5.0\n")
         f.write("   ეპოქების განაწილება:\n")
-        for era, count in era_counts.items():
+        for era, count in classical_stats.era_counts.items():
             f.write(f"     - {era}: {count} სიმღერა\n")
-        f.write("\n")
\ No newline at end of file
+        f.write("\n")
@@ -0,0 +1,133 @@
+"""სინთეზური მონაცემები: კატალოგი სამ ჟანრში, მომხმარებლები, ფლეილისტები,
+მოსმენები და შეფასებები. ერთი და იგივე seed ყოველთვის ერთსა და იმავე მონაცემს იძლევა.
+
+სიმღერების პოპულარობა და მომხმარებლების აქტივობა Zipf-ის განაწილებით:
+k-ური ადგილის წონა 1/k**s.
+"""
+import random
+from datetime import date, timedelta
+from itertools import accumulate
+
+from songs import PopSong, RockSong, ClassicalSong
+from user import User
+
+_ERAS = ("Baroque", "Classical", "Romantic", "Impressionist", "Modern")
+_INSTRUMENTS = (("Piano",), ("Violin", "Orchestra"), ("Orchestra",), ("Cello", "Piano"))
+_WORDS = ("love", "night", "fire", "dream", "heart", "storm", "light", "river", "city", "ghost",
+          "gold", "echo", "wild", "blue", "summer", "shadow", "moon", "road", "home", "rain")
+
+
+class SyntheticConfig:
+    """მონაცემების ზომები და განაწილებები"""
+
+    def __init__(self, songs: int = 1_000, users: int = 200, events: int = 10_000,
+                 artists: int = None, playlists_per_user: float = 2.0, playlist_size: int = 20,
+                 rating_rate: float = 0.05, premium_share: float = 0.3, song_skew: float = 1.1,
+                 user_skew: float = 0.8, start: date = date(2025, 1, 1), days: int = 365,
+                 seed: int = 42):
+        self.songs = songs
+        self.users = users
+        self.events = events
+        self.artists = artists or max(1, songs // 10)
+        self.playlists_per_user = playlists_per_user
+        self.playlist_size = playlist_size
+        self.rating_rate = rating_rate
+        self.premium_share = premium_share
+        self.song_skew = song_skew
+        self.user_skew = user_skew
+        self.start = start
+        self.days = days
+        self.seed = seed
+
+    @classmethod
+    def for_events(cls, events: int, **overrides) -> "SyntheticConfig":
+        """კატალოგი და მომხმარებლები მოვლენების რაოდენობის პროპორციულად (1k-დან 10M-მდე)"""
+        sizes = {"songs": max(100, events // 50), "users": max(50, events // 100), "events": events}
+        sizes.update(overrides)
+        return cls(**sizes)
+
+
+def zipf_weights(count: int, skew: float) -> list:
+    """კუმულაციური წონები random.choices(cum_weights=...)-ისთვის"""
+    return list(accumulate(1.0 / rank ** skew for rank in range(1, count + 1)))
+
+
+def generate_songs(config: SyntheticConfig, rng: random.Random) -> list:
+    artists = [f"Artist {i}" for i in range(config.artists)]
+    artist_weights = zipf_weights(len(artists), 1.0)
+    songs = []
+    for i in range(config.songs):
+        artist = rng.choices(artists, cum_weights=artist_weights)[0]
+        title = f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS).title()} {i}"
+        duration = int(rng.gauss(210, 45))
+        kind = rng.random()
+        if kind < 0.5:
+            song = PopSong(title, artist, max(60, duration), rng.random() < 0.1)
+        elif kind < 0.8:
+            song = RockSong(title, artist, max(60, duration + 30), rng.randint(1, 10), rng.random() < 0.4)
+        else:
+            song = ClassicalSong(title, artist, max(120, duration * 2), f"Composer {rng.randrange(200)}",
+                                 rng.choice(_ERAS), list(rng.choice(_INSTRUMENTS)))
+        songs.append(song)
+    """პოპულარობის რიგი კატალოგის რიგისგან დამოუკიდებელია"""
+    rng.shuffle(songs)
+    return songs
+
+
+def generate_users(config: SyntheticConfig, rng: random.Random) -> list:
+    users = []
+    for i in range(config.users):
+        premium = rng.random() < config.premium_share
+        users.append(User(f"listener{i}", f"listener{i}@example.com", premium,
+                          rng.choice((4.99, 9.99, 14.99)) if premium else 0.0))
+    return users
+
+
+def generate_events(config: SyntheticConfig, songs: list, users: list, rng: random.Random):
+    """(user_id, song_id, date, rating) გენერატორი ingest_events-ისთვის, სიის გარეშე"""
+    song_weights = zipf_weights(len(songs), config.song_skew)
+    user_weights = zipf_weights(len(users), config.user_skew)
+    dates = [(config.start + timedelta(days=day)).isoformat() for day in range(config.days)]
+    song_ids = [song.song_id for song in songs]
+    user_ids = [user.user_id for user in users]
+    ratings = (1.0, 2.0, 3.0, 3.5, 4.0, 4.5, 5.0)
+    remaining = config.events
+    while remaining:
+        chunk = min(remaining, 10_000)
+        remaining -= chunk
+        chosen_songs = rng.choices(song_ids, cum_weights=song_weights, k=chunk)
+        chosen_users = rng.choices(user_ids, cum_weights=user_weights, k=chunk)
+        for song_id, user_id in zip(chosen_songs, chosen_users):
+            rating = rng.choice(ratings) if rng.random() < config.rating_rate else None
+            yield user_id, song_id, rng.choice(dates), rating
+
+
+def generate_playlists(config: SyntheticConfig, songs: list, users: list, rng: random.Random) -> None:
+    weights = zipf_weights(len(songs), config.song_skew)
+    for user in users:
+        count = int(config.playlists_per_user) + (rng.random() < config.playlists_per_user % 1)
+        for p in range(count):
+            name = f"{rng.choice(_WORDS).title()} Mix {p}"
+            user.create_playlist(name)
+            playlist = user.playlists[name]
+            for song in rng.choices(songs, cum_weights=weights, k=config.playlist_size):
+                if song.song_id not in playlist:
+                    user.add_to_playlist(name, song)
+
+
+def generate_system(config: SyntheticConfig, system_cls=None):
+    """სრული სისტემა: კატალოგი, მომხმარებლები, ფლეილისტები და მოსმენები ingest_events-ით"""
+    if system_cls is None:
+        from streaming_system import StreamingSystem
+        system_cls = StreamingSystem
+    rng = random.Random(config.seed)
+    system = system_cls("Synthetic")
+    songs = generate_songs(config, rng)
+    for song in songs:
+        system.add_song(song)
+    users = generate_users(config, rng)
+    for user in users:
+        system.add_user(user)
+    generate_playlists(config, songs, users, rng)
+    system.ingest_events(generate_events(config, songs, users, rng))
+    return system
@@ -1,37 +1,130 @@
+import threading
+from contextlib import nullcontext
 from datetime import datetime
 from songs import Song
+from playlist import Playlist
+from catalog import SongCatalog
+from event_log import listen_timestamp
+
+_id_lock = threading.Lock()
+
+
+def _prefetched(songs_dict, song_ids):
+    """დისკზე შენახული კატალოგიდან ციკლის სიმღერები წინასწარ, batch-ებად"""
+    if isinstance(songs_dict, SongCatalog):
+        return songs_dict.prefetch(set(song_ids))
+    return songs_dict
+
+
 class User:
+    __slots__ = ("user_id", "username", "email", "is_premium", "monthly_fee", "playlists",
+                 "_history", "_system", "_system_index",
+                 "_artist_counts", "_artist_first_seen", "_favorite_artist")
     _user_counter = 0
     def __init__(self, username:str, email:str, is_premium: bool, monthly_fee:float = 0.0):
-        User._user_counter +=1
-        self.user_id = f"U{User._user_counter:03d}"
+        with _id_lock:
+            User._user_counter +=1
+            self.user_id = f"U{User._user_counter:03d}"
         self.username = username
         self.email = email
         self.is_premium = is_premium
         self.monthly_fee = monthly_fee
-        self.listening_history = []
         self.playlists = {}
+        """სისტემაში დამატებამდე ისტორია ლოკალურ სიაშია, მერე სისტემის ჟურნალში"""
+        self._history = []
+        self._system = None
+        self._system_index = None
+        """არტისტების ინდექსი: მოსმენები და პირველი მოსმენის პოზიცია (პირველ მოსმენაზე იქმნება)"""
+        self._artist_counts = None
+        self._artist_first_seen = None
+        self._favorite_artist = None
+
+    @property
+    def listening_history(self):
+        return self._history
+
+    def _attach(self, system, system_index: int, history_view) -> list:
+        """აბრუნებს ლოკალურ ისტორიას, რომელიც სისტემამ ჟურნალში უნდა გადაიტანოს"""
+        local_history = self._history
+        self._system = system
+        self._system_index = system_index
+        self._history = history_view
+        return local_history
+
+    def _history_song_ids(self):
+        if self._system is None:
+            return (item[0] for item in self._history)
+        return self._history.song_ids()
+
+    def _lock(self):
+        """სისტემაში მყოფი მომხმარებლის ცვლილებებს სისტემის ბლოკი იცავს"""
+        if self._system is not None:
+            return self._system._user_lock(self)
+        return nullcontext()
 
     def upgrade_to_premium(self, monthly_fee: float) -> None:
-        self.is_premium = True
-        self.monthly_fee = monthly_fee
+        with self._lock():
+            self.is_premium = True
+            self.monthly_fee = monthly_fee
+            if self._system is not None:
+                self._system._on_user_changed(self)
         print(f"{self.username}-მა იყიდა პრემიუმი, თვიური გადასახადი: {self.monthly_fee} GEL")
 
     def listen_to_song(self, song: Song, date:str):
-        time = datetime.now().strftime("%H:%M:%S")
-        self.listening_history.append((song.song_id, time))
+        timestamp = listen_timestamp(date)
+        if self._system is not None:
+            self._system._listen(self, song, timestamp)
+            return
+        moment = datetime.fromtimestamp(timestamp)
+        self._history.append((song.song_id, moment.strftime("%H:%M:%S"),
+                              moment.strftime("%Y-%m-%d")))
         song.play()
 
+    def _count_artist(self, artist: str, position: int) -> None:
+        """O(1) განახლება, თანაბარი რაოდენობისას პირველი მოსმენილი არტისტი რჩება"""
+        if self._artist_counts is None:
+            self._artist_counts = {}
+            self._artist_first_seen = {}
+        count = self._artist_counts.get(artist, 0) + 1
+        self._artist_counts[artist] = count
+        first_seen = self._artist_first_seen.get(artist)
+        if first_seen is None or position < first_seen:
+            self._artist_first_seen[artist] = position
+        best = self._favorite_artist
+        if best is None or best == artist:
+            self._favorite_artist = artist
+            return
+        best_count = self._artist_counts[best]
+        if count > best_count or (count == best_count and
+                                  self._artist_first_seen[artist] < self._artist_first_seen[best]):
+            self._favorite_artist = artist
+
+    def _uncount_artist(self, artist: str, count: int, first_seen) -> None:
+        """count მოსმენის გამოკლება; first_seen - არტისტის დარჩენილი პირველი მოსმენა"""
+        counts = self._artist_counts
+        remaining = counts[artist] - count
+        if remaining:
+            counts[artist] = remaining
+            self._artist_first_seen[artist] = first_seen
+        else:
+            del counts[artist]
+            del self._artist_first_seen[artist]
+        if self._favorite_artist == artist:
+            first = self._artist_first_seen
+            self._favorite_artist = min(counts, key=lambda name: (-counts[name], first[name]),
+                                        default=None)
+
     def rate_song(self, song: Song, rating:float) -> None:
-        song.add_rating(rating)
+        song.add_rating(rating, self)
 
     def create_playlist(self, playlist_name:str) -> None:
         try:
-            if playlist_name in self.playlists:
-                print(f"ფლეილისტი {playlist_name} უკვე არსებობს")
-                return False
-            self.playlists[playlist_name] = []
-            return True
+            with self._lock():
+                if playlist_name in self.playlists:
+                    print(f"ფლეილისტი {playlist_name} უკვე არსებობს")
+                    return False
+                self.playlists[playlist_name] = Playlist(playlist_name)
+                return True
         except ValueError as e:
             print(f"დაფიქისრდა შეცდომა: {e}")
 
@@ -41,81 +134,92 @@ class User:
             if playlist_name not in self.playlists:
                 print(f"ფლეილისტი '{playlist_name}' არ არსებობს!")
                 return False
-            self.playlists[playlist_name].append(song.song_id)
+            playlist = self.playlists[playlist_name]
+            with self._lock():
+                if not playlist.add(song):
+                    print(f"სიმღერა {song.song_id} უკვე არის ფლეილისტში '{playlist_name}'")
+                    return False
+                if self._system is not None:
+                    self._system._on_playlist_add(playlist, song.song_id)
             return True
         except (KeyError, ValueError) as e:
             print(f"შეცდომა: {e}")
 
+    def remove_from_playlist(self, playlist_name: str, song_id: str) -> bool:
+        playlist = self.playlists.get(playlist_name)
+        if playlist is None:
+            print(f"ფლეილისტი '{playlist_name}' არ არსებობს!")
+            return False
+        with self._lock():
+            if not playlist.remove(song_id):
+                print(f"სიმღერა {song_id} არ არის ფლეილისტში '{playlist_name}'")
+                return False
+            if self._system is not None:
+                self._system._on_playlist_remove(playlist, song_id)
+        return True
+
     def get_playlist_duration(self, playlist_name:str, songs_dict:dict)-> int:
         if playlist_name not in self.playlists:
             return 0
+        playlist = self.playlists[playlist_name]
+        if self._system is not None and songs_dict is self._system.songs:
+            return playlist.duration
         total = 0
-        for song_id in self.playlists[playlist_name]:
+        songs_dict = _prefetched(songs_dict, playlist)
+        for song_id in playlist:
             if song_id in songs_dict:
                 total +=songs_dict[song_id].duration
         return total
 
+    def get_playlist_stats(self, playlist_name: str) -> dict:
+        """ხანგრძლივობა, სიმღერების რაოდენობა, ჟანრებისა და არტისტების განაწილება, O(1)"""
+        playlist = self.playlists.get(playlist_name)
+        if playlist is None:
+            return {}
+        return {
+            "songs": len(playlist),
+            "duration": playlist.duration,
+            "genres": playlist.genre_mix,
+            "artists": playlist.artist_mix,
+        }
+
     def get_listening_history(self) ->str:
         try:
             if not self.listening_history:
                 return "ისტორია ცარიელია"
-            result = f"\n{self.username}-ის მოსმენების ისტორია:\n"
-            result += "=" * 60 + "\n"
-            for item in self.listening_history:
-                try:
-                    if isinstance(item, tuple) and len(item) >= 3:
-                        song_id, timestamp, date = item
-                        result += f"{date} {timestamp} - Song ID: {song_id}\n"
-                    elif isinstance(item, (tuple, list)) and len(item) >= 1:
-                        song_id = item[0]
-                        result += f"Song ID: {song_id}\n"
-                except (ValueError, IndexError):
-                    continue
-
-            return result
+            lines = [f"\n{self.username}-ის მოსმენების ისტორია:\n", "=" * 60 + "\n"]
+            for song_id, timestamp, date in self.listening_history:
+                lines.append(f"{date} {timestamp} - Song ID: {song_id}\n")
+            return "".join(lines)
         except Exception as e:
             print(f"შეცდომა get_listening_history-ში: {e}")
             return "შეცდომა ისტორიის ჩატვირთვისას"
 
     def get_total_listening_time(self, songs_dict: dict) -> int:
+        if self._system is not None and songs_dict is self._system.songs:
+            return self._system._user_listening_time(self)
         try:
             total = 0
-            for item in self.listening_history:
-                try:
-                    if isinstance(item, tuple) and len(item) >= 3:
-                        song_id = item[0]
-                    elif isinstance(item, (tuple, list)) and len(item) >= 1:
-                        song_id = item[0]
-                    else:
-                        continue
-
-                    if song_id in songs_dict:
-                        total += songs_dict[song_id].duration
-                except (ValueError, IndexError, TypeError):
-                    continue
+            songs_dict = _prefetched(songs_dict, self._history_song_ids())
+            for song_id in self._history_song_ids():
+                song = songs_dict.get(song_id)
+                if song is not None:
+                    total += song.duration
             return total
         except Exception as e:
             print(f"შეცდომა get_total_listening_time-ში: {e}")
             return 0
 
     def get_favorite_artist(self, songs_dict: dict) -> str:
+        if self._system is not None and songs_dict is self._system.songs:
+            return self._favorite_artist or "არ არის ისტორია"
         try:
-            if not self.listening_history:
-                return "არ არის ისტორია"
             artist_counts = {}
-            for item in self.listening_history:
-                try:
-                    if isinstance(item, tuple) and len(item) >= 3:
-                        song_id = item[0]
-                    elif isinstance(item, (tuple, list)) and len(item) >= 1:
-                        song_id = item[0]
-                    else:
-                        continue
-                    if song_id in songs_dict:
-                        artist = songs_dict[song_id].artist
-                        artist_counts[artist] = artist_counts.get(artist, 0) + 1
-                except (ValueError, IndexError, KeyError, AttributeError):
-                    continue
+            songs_dict = _prefetched(songs_dict, self._history_song_ids())
+            for song_id in self._history_song_ids():
+                song = songs_dict.get(song_id)
+                if song is not None:
+                    artist_counts[song.artist] = artist_counts.get(song.artist, 0) + 1
 
             if not artist_counts:
                 return "არ არის ისტორია"
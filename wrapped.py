@@ -0,0 +1,117 @@
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+_catalog = None
+
+
+class WrappedCatalog:
+    """worker-ისთვის საჭირო კატალოგი: მხოლოდ ID, ხანგრძლივობა და არტისტი ინდექსით"""
+
+    def __init__(self, song_ids: list, durations, artists: list):
+        self.song_ids = song_ids
+        self.durations = durations
+        self.artists = artists
+
+
+class WrappedBatchResult:
+    """ყველა მომხმარებლის Wrapped-ის გაერთიანებული შედეგი"""
+
+    def __init__(self):
+        self.users = 0
+        self.listens = 0
+        self.seconds = 0
+        self.artist_counts = {}
+        self.files = []
+        self.elapsed = 0.0
+
+    def top_artists(self, limit: int = 5) -> list:
+        return sorted(self.artist_counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def merge(self, shard: dict) -> None:
+        self.users += shard["users"]
+        self.listens += shard["listens"]
+        self.seconds += shard["seconds"]
+        for artist, count in shard["artist_counts"].items():
+            self.artist_counts[artist] = self.artist_counts.get(artist, 0) + count
+        self.files.extend(shard["files"])
+
+
+def shard_of(user_id: str, shards: int) -> int:
+    """მუდმივი შარდი user_id-დან (hash() პროცესებს შორის იცვლება)"""
+    return zlib.crc32(user_id.encode("utf-8")) % shards
+
+
+def _init_worker(catalog: WrappedCatalog) -> None:
+    global _catalog
+    _catalog = catalog
+
+
+def build_user_wrapped(user: dict, catalog: WrappedCatalog, top_songs: int = 5) -> dict:
+    """ერთი მომხმარებლის Wrapped, user["songs"] მოსმენების სიმღერის ინდექსებია"""
+    durations = catalog.durations
+    artists = catalog.artists
+    seconds = 0
+    artist_counts = {}
+    song_counts = {}
+    for song_idx in user["songs"]:
+        artist = artists[song_idx]
+        if artist is None:
+            continue
+        seconds += durations[song_idx]
+        artist_counts[artist] = artist_counts.get(artist, 0) + 1
+        song_counts[song_idx] = song_counts.get(song_idx, 0) + 1
+
+    favorite = max(artist_counts, key=artist_counts.get) if artist_counts else None
+    ranked = sorted(song_counts.items(), key=lambda item: item[1], reverse=True)[:top_songs]
+    playlists = {}
+    for name, song_indexes in user["playlists"].items():
+        duration = sum(durations[i] for i in song_indexes)
+        playlists[name] = {"songs": len(song_indexes), "seconds": duration}
+    return {
+        "user_id": user["user_id"],
+        "username": user["username"],
+        "favorite_artist": favorite,
+        "listens": sum(song_counts.values()),
+        "seconds": seconds,
+        "top_songs": [{"song_id": catalog.song_ids[i], "plays": count} for i, count in ranked],
+        "playlists": playlists,
+        "artist_counts": artist_counts,
+    }
+
+
+def run_shard(users: list, output_dir: str, catalog: WrappedCatalog = None) -> dict:
+    """შარდის ყველა მომხმარებლის Wrapped ფაილების ჩაწერა და შარდის ჯამები"""
+    catalog = catalog or _catalog
+    totals = {"users": 0, "listens": 0, "seconds": 0, "artist_counts": {}, "files": []}
+    artist_totals = totals["artist_counts"]
+    for user in users:
+        wrapped = build_user_wrapped(user, catalog)
+        artist_counts = wrapped.pop("artist_counts")
+        path = os.path.join(output_dir, f"wrapped_{user['user_id']}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(wrapped, f, ensure_ascii=False)
+        totals["users"] += 1
+        totals["listens"] += wrapped["listens"]
+        totals["seconds"] += wrapped["seconds"]
+        for artist, count in artist_counts.items():
+            artist_totals[artist] = artist_totals.get(artist, 0) + count
+        totals["files"].append(path)
+    return totals
+
+
+def run_sharded(shards: list, output_dir: str, catalog: WrappedCatalog, workers: int) -> WrappedBatchResult:
+    result = WrappedBatchResult()
+    start = time.perf_counter()
+    if workers <= 1:
+        for users in shards:
+            result.merge(run_shard(users, output_dir, catalog))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(catalog,)) as pool:
+            for shard in pool.map(run_shard, shards, [output_dir] * len(shards)):
+                result.merge(shard)
+    result.elapsed = time.perf_counter() - start
+    return result